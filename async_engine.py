@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Asyncio HTTP client engine for the Tribe AI test harness
+Multiplexes every request on one event loop and one pooled httpx.AsyncClient
+"""
+
+import asyncio
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, Any, Optional, Coroutine
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+# Exceptions a timed-out engine request raises, for callers that classify failures
+TIMEOUT_ERRORS = (httpx.TimeoutException,) if httpx is not None else ()
+
+DEFAULT_MAX_CONNECTIONS = 1000
+DEFAULT_MAX_KEEPALIVE = 200
+# Request extension carrying the jar of the user a request belongs to
+COOKIE_EXTENSION = "tribe_cookies"
+
+class AsyncClientEngine:
+    """Pooled asyncio HTTP client usable from both coroutines and synchronous code.
+
+    Coroutines ``await engine.arequest(...)`` directly; the load generator runs its
+    virtual users that way, as tasks on the engine loop (``submit``), so thousands of
+    users in flight cost no threads. Synchronous callers such as
+    ``TribeAITester.make_request`` use ``engine.request(...)``, which hands the request
+    to the loop and blocks only the calling thread. Either way all in-flight requests
+    share one connection pool. Responses are ``httpx.Response`` objects, which expose the
+    same ``status_code``/``json()``/``text``/``content``/``headers``/``cookies`` surface
+    the tests already use on ``requests.Response``.
+
+    The pooled client keeps no cookies of its own: each request carries its user's jar
+    (``cookies=``, e.g. that user's ``requests.Session().cookies``), which is read and
+    updated on every redirect hop. Redirects are followed, as requests does.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive: int = DEFAULT_MAX_KEEPALIVE, timeout: Optional[float] = None):
+        if httpx is None:
+            raise RuntimeError("The async engine requires httpx (pip install httpx)")
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive)
+        # requests has no default timeout; keep the same semantics unless asked otherwise
+        self.timeout = httpx.Timeout(timeout)
+        self._client = None
+        self._client_loop = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Return the pooled client, creating it on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, follow_redirects=True,
+                # A jar that accepts nothing, so no user's session leaks into another's requests
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+                event_hooks={"request": [self._send_cookies], "response": [self._keep_cookies]})
+            self._client_loop = loop
+        elif self._client_loop is not loop:
+            raise RuntimeError("AsyncClientEngine is bound to a different event loop")
+        return self._client
+
+    @staticmethod
+    async def _send_cookies(request: "httpx.Request"):
+        jar = request.extensions.get(COOKIE_EXTENSION)
+        if jar is not None:
+            httpx.Cookies(jar).set_cookie_header(request)
+
+    @staticmethod
+    async def _keep_cookies(response: "httpx.Response"):
+        jar = response.request.extensions.get(COOKIE_EXTENSION)
+        if jar is not None:
+            httpx.Cookies(jar).extract_cookies(response)
+
+    async def arequest(self, method: str, url: str, headers: Dict = None, json: Any = None,
+                       data: Dict = None, files: Dict = None, timeout: Optional[float] = None,
+                       extensions: Optional[Dict] = None, cookies: Optional[CookieJar] = None) -> "httpx.Response":
+        """Send one request on the pooled client; ``timeout`` overrides the engine default,
+        ``extensions`` (e.g. an httpcore ``trace`` callback) is passed through to httpx and
+        ``cookies`` is the jar of the user making the request"""
+        client = self._get_client()
+        extra = {"timeout": timeout} if timeout is not None else {}
+        extensions = dict(extensions or {})
+        if cookies is not None:
+            extensions[COOKIE_EXTENSION] = cookies
+        if extensions:
+            extra["extensions"] = extensions
+        return await client.request(method, url, headers=headers, json=json, data=data, files=files, **extra)
+
+    # ============= Background Loop =============
+
+    def start(self) -> "AsyncClientEngine":
+        """Start the background event loop used by synchronous callers"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="tribe-async-engine", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the background loop and wait for its result; coroutines that
+        drive many requests at once (e.g. a whole load run) go here too"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """Synchronous counterpart of arequest, mirroring requests.Session.request"""
+        return self.submit(self.arequest(method, url, **kwargs))
+
+    async def aclose(self):
+        """Close the pooled client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    def close(self):
+        """Close the client and stop the background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
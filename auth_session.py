@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Shared authentication and pooled sessions for the Tribe AI test scripts
+Logs in once, caches the session token until it expires and refreshes it on 401
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+import requests
+
+from request_phases import PhaseTimingAdapter
+
+# Used when the server does not say when session_token expires
+DEFAULT_TOKEN_TTL = 3600.0
+# Refresh this many seconds before the token's expiry
+REFRESH_MARGIN = 30.0
+# Seconds to wait for the login and register calls (connect and each read)
+DEFAULT_AUTH_TIMEOUT = 60.0
+DEFAULT_POOL_SIZE = 32
+
+class AuthError(Exception):
+    """Raised when a user cannot be logged in or registered"""
+
+class AuthSession:
+    """One user's keep-alive ``requests.Session`` plus a cached bearer token.
+
+    ``token`` logs in lazily and again shortly before expiry. Concurrent callers
+    that hit a 401 call ``refresh(stale_token)``; only the first one logs in again,
+    the rest pick up the new token.
+    """
+
+    def __init__(self, base_url: str, email: str, password: str, name: Optional[str] = None,
+                 ttl: float = DEFAULT_TOKEN_TTL, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: Optional[float] = DEFAULT_AUTH_TIMEOUT):
+        self.base_url = base_url
+        self.email = email
+        self.password = password
+        # With a name, an unknown user is registered instead of failing
+        self.name = name
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = PhaseTimingAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.user: Optional[Dict[str, Any]] = None
+        self.logins = 0
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def token(self) -> Optional[str]:
+        """Current session token, logging in first if it is missing or about to expire"""
+        with self._lock:
+            if self._token is None or time.time() >= self._expires_at - REFRESH_MARGIN:
+                self._login()
+            return self._token
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def refresh(self, stale_token: Optional[str] = None) -> Optional[str]:
+        """Log in again unless another caller already replaced ``stale_token``"""
+        with self._lock:
+            if stale_token is None or self._token == stale_token:
+                self._login()
+            return self._token
+
+    def invalidate(self):
+        with self._lock:
+            self._token = None
+
+    def _login(self):
+        """POST /auth/login, registering first when allowed; caller holds the lock"""
+        response = self.session.post(f"{self.base_url}/auth/login",
+                                     json={"email": self.email, "password": self.password}, timeout=self.timeout)
+        if response.status_code in (400, 401, 404) and self.name is not None:
+            response = self.session.post(f"{self.base_url}/auth/register",
+                                         json={"email": self.email, "password": self.password,
+                                               "name": self.name}, timeout=self.timeout)
+        if response.status_code != 200 or "session_token" not in response.cookies:
+            raise AuthError(f"Login failed for {self.email}: HTTP {response.status_code}: {response.text[:200]}")
+        self._token, self._expires_at = self._token_from(response)
+        self.user = response.json().get("user")
+        self.logins += 1
+
+    def _token_from(self, response: requests.Response) -> Tuple[str, float]:
+        """Token value and absolute expiry, from the cookie when the server sets one"""
+        for cookie in response.cookies:
+            if cookie.name == "session_token":
+                expires = cookie.expires if cookie.expires else time.time() + self.ttl
+                return cookie.value, float(expires)
+        return response.cookies["session_token"], time.time() + self.ttl
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Authenticated request that refreshes the token once on 401"""
+        headers = dict(kwargs.pop("headers", None) or {})
+        token = self.token
+        headers["Authorization"] = f"Bearer {token}"
+        response = self.session.request(method, f"{self.base_url}{endpoint}", headers=headers, **kwargs)
+        if response.status_code == 401:
+            headers["Authorization"] = f"Bearer {self.refresh(token)}"
+            response = self.session.request(method, f"{self.base_url}{endpoint}", headers=headers, **kwargs)
+        return response
+
+    def close(self):
+        self.session.close()
+
+_sessions: Dict[Tuple[str, str], AuthSession] = {}
+_sessions_lock = threading.Lock()
+
+def get_auth_session(base_url: str, email: str, password: str, name: Optional[str] = None,
+                     timeout: Optional[float] = DEFAULT_AUTH_TIMEOUT) -> AuthSession:
+    """Process-wide AuthSession for a user, so scripts and tests share one login;
+    ``timeout`` applies when this call creates it"""
+    with _sessions_lock:
+        key = (base_url, email)
+        if key not in _sessions:
+            _sessions[key] = AuthSession(base_url, email, password, name=name, timeout=timeout)
+        return _sessions[key]
+
+class AuthPool:
+    """Many pre-authenticated users for load runs, handed out round-robin"""
+
+    def __init__(self, base_url: str, size: int, password: str,
+                 email_template: str = "loadtest.user{index}@tribeai.com", name_template: str = "Load User {index}",
+                 pool_size: int = 4):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.users: List[AuthSession] = [
+            AuthSession(base_url, email_template.format(index=i), password,
+                        name=name_template.format(index=i), pool_size=pool_size)
+            for i in range(size)
+        ]
+        self._cycle = itertools.cycle(self.users)
+        self._lock = threading.Lock()
+
+    def prepare(self, concurrency: int = 16) -> "AuthPool":
+        """Log every user in up front so the timed run starts warm"""
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda user: user.token, self.users))
+        return self
+
+    def next(self) -> AuthSession:
+        with self._lock:
+            return next(self._cycle)
+
+    def close(self):
+        for user in self.users:
+            user.close()
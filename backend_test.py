@@ -4,40 +4,190 @@ Comprehensive Backend API Testing for Tribe AI Platform
 Tests all API endpoints for production deployment readiness
 """
 
+import os
 import requests
 import json
 import base64
 import time
-from typing import Dict, Any, Optional
+import argparse
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Optional, List, Tuple, Callable, Set, Coroutine, Awaitable
 import uuid
+from datetime import datetime, timezone
+
+from async_engine import TIMEOUT_ERRORS, AsyncClientEngine
+from auth_session import AuthSession
+from cassette import CassetteRecorder, replay_server
+from image_payload import scan_image_response
+from latency_histogram import LatencyRecorder, format_summary_header, format_summary_row
+from multipart_stream import FilePart, MultipartEncoder
+from rate_governor import RateGovernor, add_governor_args, governor_from_args, print_governor_report
+from request_phases import (PhaseRecorder, PhaseTimingAdapter, PhaseTrace, print_phase_report, start_trace,
+                            stop_trace)
+from run_results import add_threshold_args, build_run_record, gate, save_run, thresholds_from_args
 
 # Configuration
-BASE_URL = "https://tribe-multiverse.preview.emergentagent.com/api"
+BASE_URL = os.environ.get("TRIBE_BASE_URL", "https://tribe-multiverse.preview.emergentagent.com/api")
 TEST_USER_EMAIL = "test.user@tribeai.com"
 TEST_USER_PASSWORD = "SecurePassword123!"
 TEST_USER_NAME = "Test User"
+DEFAULT_MAX_WORKERS = 8
+# Seconds to wait for a response (connect and each read); video generation is the slowest call
+DEFAULT_REQUEST_TIMEOUT = 180.0
+# Seconds a whole test may take; requests inside a test never wait past its deadline
+DEFAULT_TEST_TIMEOUT = 300.0
+TEST_TIMEOUTS = {"Tribe Studio - Video Generation": 600.0}
+# Seconds past a test's deadline before the scheduler stops waiting for its thread
+DEADLINE_GRACE = 1.0
+# Response bodies at least this large are parsed off the engine's event loop
+OFFLOAD_BYTES = 64 * 1024
+
+# Group of each test, by test name prefix, for --tag selection
+TEST_GROUPS = {
+    "Health Check": "health",
+    "Authentication": "auth",
+    "Alpha Chat": "chat",
+    "Translation": "chat",
+    "Export Chat History": "chat",
+    "User Statistics": "stats",
+    "Image Generation": "image",
+    "Code Assistant": "code",
+    "Law Library": "law",
+    "Tribe Office": "office",
+    "Tribe Studio": "studio",
+}
+# Tags across groups
+TEST_TAGS = {
+    "smoke": ["Health Check", "Authentication - Login", "Alpha Chat - GPT-5", "Law Library - Search"],
+    "slow": ["Image Generation", "Tribe Studio - Video Generation"],
+}
+
+class DeadlineExceeded(requests.Timeout):
+    """A test's deadline or the run's time budget ran out before a request could be sent"""
+
+class RunCancelled(requests.RequestException):
+    """The run was cancelled (fail-fast) while this test was still in flight"""
+
+def tags_of(name: str) -> Set[str]:
+    """Group and tags of a test in the plan"""
+    tags = {group for prefix, group in TEST_GROUPS.items() if name.startswith(prefix)}
+    return tags | {tag for tag, names in TEST_TAGS.items() if name in names}
+
+def all_tags() -> List[str]:
+    return sorted(set(TEST_GROUPS.values()) | set(TEST_TAGS))
+
+def select_tests(tests: List[Tuple[str, Callable[[], bool], List[str]]],
+                 tags: List[str]) -> List[Tuple[str, Callable[[], bool], List[str]]]:
+    """Tests carrying any of ``tags``, plus everything they depend on, in plan order"""
+    by_name = {name: deps for name, _, deps in tests}
+    wanted = [name for name, _, _ in tests if tags_of(name) & set(tags)]
+    if not wanted:
+        raise ValueError(f"No tests tagged {tags}; tags are {all_tags()}")
+    selected = set()
+    while wanted:
+        name = wanted.pop()
+        if name not in selected:
+            selected.add(name)
+            wanted.extend(by_name[name])
+    return [test for test in tests if test[0] in selected]
+
+def on_event_loop() -> bool:
+    """Whether the calling thread is running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def run_blocking(coroutine: Coroutine) -> Any:
+    """Result of a coroutine that finishes without suspending, as test flows do off the event loop"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError("A test flow suspended outside the engine's event loop")
+
+def flow(test: Callable[..., Awaitable]) -> Callable[..., Any]:
+    """A test written once as a coroutine over ``amake_request``.
+
+    Calling the method runs it to completion in the calling thread, as before.
+    ``method.flow`` is the coroutine function, which load drivers await on the
+    engine's event loop so that a virtual user costs a task instead of a thread.
+    """
+    @functools.wraps(test)
+    def run(self, *args, **kwargs):
+        return run_blocking(test(self, *args, **kwargs))
+
+    run.flow = test
+    return run
 
 class TribeAITester:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, engine: Optional[AsyncClientEngine] = None, verbose: bool = True,
+                 base_url: Optional[str] = None, auth: Optional[AuthSession] = None,
+                 governor: Optional[RateGovernor] = None, timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+                 recorder: Optional[CassetteRecorder] = None):
+        self.base_url = base_url or BASE_URL
+        # With a shared AuthSession, reuse its pooled session and cached token
+        self.auth = auth
+        if auth is not None:
+            self.session = auth.session
+        else:
+            self.session = requests.Session()
+            self.session.mount("https://", PhaseTimingAdapter())
+            self.session.mount("http://", PhaseTimingAdapter())
+        self.engine = engine
+        self.verbose = verbose
+        # Optional rate limiting and retries; see rate_governor.RateGovernor
+        self.governor = governor
+        self.timeout = timeout
+        # Optional cassette capturing every final response; see cassette.CassetteRecorder
+        self.recorder = recorder
+        # Callables invoked as observer(method, endpoint, status_code, elapsed_seconds)
+        # after every make_request; status_code is None when the request raised
+        self.request_observers: List[Callable[[str, str, Optional[int], float], None]] = []
+        # Per-endpoint latency histograms for every make_request call
+        self.latency = LatencyRecorder()
+        self.request_observers.append(self._record_latency)
+        # Per-endpoint DNS/connect/TLS/send/TTFB/transfer histograms and connection reuse
+        self.phases = PhaseRecorder()
+        # Per-endpoint request/error counts and payload bytes, for saved run results
+        self.traffic: Dict[str, Dict[str, int]] = {}
+        self._traffic_lock = threading.Lock()
+        self.wall_clock: Optional[float] = None
         self.auth_token = None
         self.user_id = None
         self.session_id = str(uuid.uuid4())
         self.test_results = {}
+        # Per-thread result buffer used by the scheduler to keep test_results ordered
+        self._local = threading.local()
+        # Set to make every further request of the run fail fast with RunCancelled
+        self.cancelled = threading.Event()
         
     def log_result(self, test_name: str, success: bool, message: str, response_data: Any = None):
         """Log test results"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {message}")
-        self.test_results[test_name] = {
+        if self.verbose:
+            status = "✅ PASS" if success else "❌ FAIL"
+            print(f"{status} {test_name}: {message}")
+        entry = {
             "success": success,
             "message": message,
             "response_data": response_data
         }
+        buffer = getattr(self._local, "results", None)
+        if buffer is not None:
+            buffer.append((test_name, entry))
+        else:
+            self.test_results[test_name] = entry
     
-    def make_request(self, method: str, endpoint: str, data: Dict = None, files: Dict = None, headers: Dict = None) -> requests.Response:
-        """Make HTTP request with proper headers"""
-        url = f"{BASE_URL}{endpoint}"
+    def _prepare(self, method: str, endpoint: str, data: Optional[Dict], files: Optional[Dict],
+                 headers: Optional[Dict], form: bool, stream: bool,
+                 shared_token: Optional[str]) -> Tuple[str, str, Dict, bool]:
+        """URL, method and send kwargs of a request, and whether its body is a streamed upload"""
+        url = f"{self.base_url}{endpoint}"
         request_headers = {"Content-Type": "application/json"}
         
         if headers:
@@ -45,32 +195,243 @@ class TribeAITester:
             
         if self.auth_token:
             request_headers["Authorization"] = f"Bearer {self.auth_token}"
+        elif shared_token is not None:
+            request_headers["Authorization"] = f"Bearer {shared_token}"
         
-        try:
-            if method.upper() == "GET":
-                response = self.session.get(url, headers=request_headers)
-            elif method.upper() == "POST":
-                if files:
-                    # Remove Content-Type for file uploads
-                    request_headers.pop("Content-Type", None)
-                    response = self.session.post(url, data=data, files=files, headers=request_headers)
-                else:
-                    response = self.session.post(url, json=data, headers=request_headers)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, json=data, headers=request_headers)
-            elif method.upper() == "DELETE":
-                response = self.session.delete(url, headers=request_headers)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
+        method = method.upper()
+        kwargs = {"headers": request_headers}
+        streamed = method == "POST" and any(isinstance(value, FilePart) for value in (files or {}).values())
+        if streamed:
+            encoder = MultipartEncoder(data, files)
+            request_headers["Content-Type"] = encoder.content_type
+            kwargs["data"] = encoder
+        elif method == "POST" and (files or form):
+            # Remove Content-Type for file uploads and form posts
+            request_headers.pop("Content-Type", None)
+            kwargs.update(data=data, files=files)
+        elif method in ("POST", "PUT"):
+            kwargs["json"] = data
+        elif method not in ("GET", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        
+        if stream:
+            kwargs["stream"] = True
+        return url, method, kwargs, streamed
+
+    def make_request(self, method: str, endpoint: str, data: Dict = None, files: Dict = None,
+                     headers: Dict = None, form: bool = False, stream: bool = False) -> requests.Response:
+        """Make HTTP request with proper headers
+
+        Requests go through ``self.engine`` when an async engine is attached,
+        otherwise through the shared ``requests.Session``. ``form`` sends ``data``
+        as form fields instead of JSON. ``stream`` returns as soon as the response
+        headers arrive and leaves the body to be read incrementally; it always
+        uses the session, and observers then see time to first byte. A ``files``
+        value that is a ``FilePart`` streams the whole multipart body from its
+        source in chunks (also through the session), so large uploads never sit in
+        memory; the send phase is then the upload and ttfb the server's processing.
+        """
+        shared_token = self.auth.token if not self.auth_token and self.auth is not None else None
+        url, method, kwargs, streamed = self._prepare(method, endpoint, data, files, headers, form, stream,
+                                                      shared_token)
+        client = self.engine if self.engine is not None and not stream and not streamed else self.session
+        response = self._send(client, method, endpoint, url, kwargs)
+        if response.status_code == 401 and shared_token is not None:
+            # The shared token expired server-side; refresh it once and retry
+            kwargs["headers"]["Authorization"] = f"Bearer {self.auth.refresh(shared_token)}"
+            response = self._send(client, method, endpoint, url, kwargs)
+        return response
+
+    async def amake_request(self, method: str, endpoint: str, data: Dict = None, files: Dict = None,
+                            headers: Dict = None, form: bool = False, stream: bool = False):
+        """make_request for test flows. On the engine's event loop the request is awaited
+        there; anywhere else this is make_request and the coroutine never suspends.
+
+        On the loop, ``stream`` responses arrive fully read (observers see the whole
+        response time) and streamed uploads, which need requests, run on a worker thread.
+        """
+        if self.engine is None or not on_event_loop():
+            return self.make_request(method, endpoint, data, files, headers, form, stream)
+        if any(isinstance(value, FilePart) for value in (files or {}).values()):
+            return await asyncio.to_thread(self.make_request, method, endpoint, data, files, headers, form, stream)
+        # Pooled users are logged in up front (AuthPool.prepare), so this is the cached token
+        shared_token = self.auth.token if not self.auth_token and self.auth is not None else None
+        url, method, kwargs, _ = self._prepare(method, endpoint, data, files, headers, form, False, shared_token)
+        response = await self._asend(method, endpoint, url, kwargs)
+        if response.status_code == 401 and shared_token is not None:
+            # Logging in again is blocking; keep it off the loop
+            token = await asyncio.to_thread(self.auth.refresh, shared_token)
+            kwargs["headers"]["Authorization"] = f"Bearer {token}"
+            response = await self._asend(method, endpoint, url, kwargs)
+        return response
+
+    async def aparse(self, response, parse: Optional[Callable] = None):
+        """parse(response) for test flows, response.json() by default. On the engine's event
+        loop large bodies (and anything passed as ``parse``) are handled on a worker thread,
+        so one user's decoding does not stall every other user on the loop."""
+        offload = self.engine is not None and on_event_loop()
+        if parse is None:
+            if not offload or len(response.content) < OFFLOAD_BYTES:
+                return response.json()
+            return await asyncio.to_thread(response.json)
+        return await asyncio.to_thread(parse, response) if offload else parse(response)
+
+    def _interrupt(self, status: str):
+        """Note why the current scheduled test stopped early (the first reason wins)"""
+        if getattr(self._local, "interrupted", False) is None:
+            self._local.interrupted = status
+
+    def _time_left(self, method: str, endpoint: str) -> Optional[float]:
+        """Seconds left before the current test's deadline (None without one); raises
+        once the run is cancelled or the deadline has passed"""
+        if self.cancelled.is_set():
+            self._interrupt("cancelled")
+            raise RunCancelled(f"Run cancelled before {method} {endpoint}")
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._interrupt("timeout")
+            raise DeadlineExceeded(f"Deadline passed before {method} {endpoint}")
+        return remaining
+
+    def _request_timeout(self, method: str, endpoint: str) -> Optional[float]:
+        """The request timeout, cut down to what is left of the current test's deadline"""
+        remaining = self._time_left(method, endpoint)
+        if remaining is None:
+            return self.timeout
+        return remaining if self.timeout is None else min(self.timeout, remaining)
+
+    def _attempt(self, method: str, endpoint: str, kwargs: Dict, trace: PhaseTrace, engine: bool) -> Dict:
+        """Send kwargs for one attempt: the time left, and for the engine its trace hook and
+        this user's cookie jar"""
+        attempt = dict(kwargs)
+        timeout = self._request_timeout(method, endpoint)
+        if timeout is not None:
+            attempt["timeout"] = timeout
+        if engine:
+            attempt["extensions"] = {"trace": trace.httpcore_event}
+            attempt["cookies"] = self.session.cookies
+        return attempt
+
+    def _send(self, client, method: str, endpoint: str, url: str, kwargs: Dict) -> requests.Response:
+        """Send one request and report its timing to the observers.
+
+        With a governor, throttled and failed attempts may be retried; observers only
+        see the final attempt and its own service time. Every attempt re-checks the
+        cancel flag and the test deadline and gets only the time that is left.
+        """
+        traces = []
+        # Nothing is sent, counted or observed once the run is cancelled or the deadline has passed
+        self._time_left(method, endpoint)
+
+        def send():
+            # A fresh trace per attempt, so retried attempts don't blur the final one's phases
+            trace = start_trace()
+            traces.append(trace)
+            try:
+                response = client.request(method, url, **self._attempt(method, endpoint, kwargs, trace,
+                                                                       client is self.engine))
+            finally:
+                stop_trace()
+            if not kwargs.get("stream"):
+                trace.marks.setdefault("body", time.perf_counter())
             return response
-        except Exception as e:
-            print(f"Request failed: {e}")
-            raise
+
+        if self.governor is not None:
+            response, error, elapsed = self.governor.execute(f"{method} {endpoint}", send,
+                                                             lambda: self._time_left(method, endpoint))
+        else:
+            started = time.perf_counter()
+            response, error = None, None
+            try:
+                response = send()
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - started
+        return self._report(method, endpoint, kwargs, traces, response, error, elapsed)
+
+    async def _asend(self, method: str, endpoint: str, url: str, kwargs: Dict):
+        """_send for the engine's event loop: the same retries, deadlines and reporting, awaited"""
+        traces = []
+        self._time_left(method, endpoint)
+
+        async def send():
+            trace = PhaseTrace()
+            traces.append(trace)
+            response = await self.engine.arequest(method, url, **self._attempt(method, endpoint, kwargs, trace, True))
+            trace.marks.setdefault("body", time.perf_counter())
+            return response
+
+        if self.governor is not None:
+            response, error, elapsed = await self.governor.aexecute(f"{method} {endpoint}", send,
+                                                                    lambda: self._time_left(method, endpoint))
+        else:
+            started = time.perf_counter()
+            response, error = None, None
+            try:
+                response = await send()
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - started
+        return self._report(method, endpoint, kwargs, traces, response, error, elapsed)
+
+    def _report(self, method: str, endpoint: str, kwargs: Dict, traces: List[PhaseTrace], response,
+                error: Optional[BaseException], elapsed: float):
+        """Record the final attempt's phases, cassette entry, observers and traffic; re-raise its error"""
+        if response is not None:
+            self.phases.record(f"{method} {endpoint}", traces[-1])
+        if self.recorder is not None and response is not None:
+            self.recorder.record(method, endpoint, kwargs, response, elapsed)
+        self._notify_observers(method, endpoint, response.status_code if response is not None else None, elapsed)
+        self._record_traffic(method, endpoint, response, kwargs.get("stream", False))
+        if error is not None:
+            if isinstance(error, (requests.Timeout,) + TIMEOUT_ERRORS):
+                self._interrupt("timeout")
+            if self.verbose:
+                print(f"Request failed: {error}")
+            raise error
+        return response
+
+    def _record_traffic(self, method: str, endpoint: str, response, stream: bool):
+        """Count the request and its payload sizes; streamed bodies without a
+        Content-Length are not read here, so their size is not counted"""
+        request_bytes = response_bytes = 0
+        if response is not None:
+            request_bytes = int(response.request.headers.get("Content-Length") or 0)
+            length = response.headers.get("Content-Length")
+            if length is not None:
+                response_bytes = int(length)
+            elif not stream:
+                response_bytes = len(response.content)
+        with self._traffic_lock:
+            traffic = self.traffic.setdefault(f"{method} {endpoint}", {
+                "requests": 0, "errors": 0, "request_bytes": 0, "response_bytes": 0, "max_response_bytes": 0})
+            traffic["requests"] += 1
+            if response is None or response.status_code >= 400:
+                traffic["errors"] += 1
+            traffic["request_bytes"] += request_bytes
+            traffic["response_bytes"] += response_bytes
+            traffic["max_response_bytes"] = max(traffic["max_response_bytes"], response_bytes)
+
+    def _record_latency(self, method: str, endpoint: str, status_code: Optional[int], elapsed: float):
+        """Default observer: feed the endpoint histogram and note which endpoints a test hit"""
+        key = f"{method} {endpoint}"
+        self.latency.record(key, elapsed)
+        touched = getattr(self._local, "endpoints", None)
+        if touched is not None and key not in touched:
+            touched.append(key)
+
+    def _notify_observers(self, method: str, endpoint: str, status_code: Optional[int], elapsed: float):
+        """Report a finished request to every registered observer"""
+        for observer in self.request_observers:
+            observer(method, endpoint, status_code, elapsed)
 
     # ============= Authentication Tests =============
     
-    def test_auth_register(self):
+    @flow
+    async def test_auth_register(self):
         """Test user registration"""
         try:
             data = {
@@ -79,10 +440,10 @@ class TribeAITester:
                 "name": TEST_USER_NAME
             }
             
-            response = self.make_request("POST", "/auth/register", data)
+            response = await self.amake_request("POST", "/auth/register", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("user"):
                     self.user_id = result["user"]["id"]
                     # Extract token from cookies if available
@@ -96,7 +457,7 @@ class TribeAITester:
             elif response.status_code == 400:
                 # User might already exist, try login instead
                 self.log_result("Auth Register", True, "User already exists (expected for repeated tests)")
-                return self.test_auth_login()
+                return await self.test_auth_login.flow(self)
             else:
                 self.log_result("Auth Register", False, f"HTTP {response.status_code}: {response.text}")
                 return False
@@ -105,7 +466,8 @@ class TribeAITester:
             self.log_result("Auth Register", False, f"Exception: {str(e)}")
             return False
     
-    def test_auth_login(self):
+    @flow
+    async def test_auth_login(self):
         """Test user login"""
         try:
             data = {
@@ -113,10 +475,10 @@ class TribeAITester:
                 "password": TEST_USER_PASSWORD
             }
             
-            response = self.make_request("POST", "/auth/login", data)
+            response = await self.amake_request("POST", "/auth/login", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("user"):
                     self.user_id = result["user"]["id"]
                     # Extract token from cookies if available
@@ -135,13 +497,14 @@ class TribeAITester:
             self.log_result("Auth Login", False, f"Exception: {str(e)}")
             return False
     
-    def test_auth_session(self):
+    @flow
+    async def test_auth_session(self):
         """Test getting current session"""
         try:
-            response = self.make_request("GET", "/auth/session")
+            response = await self.amake_request("GET", "/auth/session")
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("authenticated"):
                     self.log_result("Auth Session", True, f"Session valid for user: {result['user']['email']}")
                     return True
@@ -158,7 +521,8 @@ class TribeAITester:
 
     # ============= Alpha Chat Tests =============
     
-    def test_chat_gpt5(self):
+    @flow
+    async def test_chat_gpt5(self):
         """Test chat with GPT-5"""
         try:
             data = {
@@ -167,10 +531,10 @@ class TribeAITester:
                 "session_id": self.session_id
             }
             
-            response = self.make_request("POST", "/chat", data)
+            response = await self.amake_request("POST", "/chat", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     self.log_result("Chat GPT-5", True, f"Chat response received (length: {len(result['response'])})")
                     return True
@@ -185,7 +549,8 @@ class TribeAITester:
             self.log_result("Chat GPT-5", False, f"Exception: {str(e)}")
             return False
     
-    def test_chat_claude(self):
+    @flow
+    async def test_chat_claude(self):
         """Test chat with Claude"""
         try:
             data = {
@@ -194,10 +559,10 @@ class TribeAITester:
                 "session_id": self.session_id
             }
             
-            response = self.make_request("POST", "/chat", data)
+            response = await self.amake_request("POST", "/chat", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     self.log_result("Chat Claude", True, f"Claude response received (length: {len(result['response'])})")
                     return True
@@ -212,7 +577,8 @@ class TribeAITester:
             self.log_result("Chat Claude", False, f"Exception: {str(e)}")
             return False
     
-    def test_chat_gemini(self):
+    @flow
+    async def test_chat_gemini(self):
         """Test chat with Gemini"""
         try:
             data = {
@@ -221,10 +587,10 @@ class TribeAITester:
                 "session_id": self.session_id
             }
             
-            response = self.make_request("POST", "/chat", data)
+            response = await self.amake_request("POST", "/chat", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     self.log_result("Chat Gemini", True, f"Gemini response received (length: {len(result['response'])})")
                     return True
@@ -241,7 +607,8 @@ class TribeAITester:
 
     # ============= Image Generation Tests =============
     
-    def test_image_generation(self):
+    @flow
+    async def test_image_generation(self):
         """Test image generation"""
         try:
             data = {
@@ -249,21 +616,25 @@ class TribeAITester:
                 "number_of_images": 1
             }
             
-            response = self.make_request("POST", "/image/generate", data)
+            # Decode images as they stream in; only digests and header facts are kept
+            response = await self.amake_request("POST", "/image/generate", data, stream=True)
             
             if response.status_code == 200:
-                result = response.json()
-                if result.get("success") and result.get("images"):
-                    # Verify base64 image
-                    image_data = result["images"][0]
-                    if image_data and len(image_data) > 100:  # Basic validation
-                        self.log_result("Image Generation", True, f"Image generated successfully (size: {len(image_data)} chars)")
+                result = await self.aparse(response, scan_image_response)
+                if result["fields"].get("success") and result["images"]:
+                    # Verify base64 image from its decoded header bytes
+                    image = result["images"][0]
+                    if image["encoded_chars"] > 100 and image["format"]:
+                        self.log_result("Image Generation", True,
+                                        f"Image generated successfully ({image['format']} {image['width']}x{image['height']}, "
+                                        f"size: {image['encoded_chars']} chars)",
+                                        response_data={"images": result["images"], "wire_bytes": result["wire_bytes"]})
                         return True
                     else:
-                        self.log_result("Image Generation", False, "Invalid image data received")
+                        self.log_result("Image Generation", False, f"Invalid image data received: {image}")
                         return False
                 else:
-                    self.log_result("Image Generation", False, f"No image generated: {result}")
+                    self.log_result("Image Generation", False, f"No image generated: {result['fields']}")
                     return False
             else:
                 self.log_result("Image Generation", False, f"HTTP {response.status_code}: {response.text}")
@@ -275,7 +646,8 @@ class TribeAITester:
 
     # ============= Code Assistant Tests =============
     
-    def test_code_assistant_python(self):
+    @flow
+    async def test_code_assistant_python(self):
         """Test code assistant with Python"""
         try:
             data = {
@@ -283,10 +655,10 @@ class TribeAITester:
                 "language": "python"
             }
             
-            response = self.make_request("POST", "/code/assist", data)
+            response = await self.amake_request("POST", "/code/assist", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     self.log_result("Code Assistant Python", True, f"Code assistance provided (length: {len(result['response'])})")
                     return True
@@ -301,7 +673,8 @@ class TribeAITester:
             self.log_result("Code Assistant Python", False, f"Exception: {str(e)}")
             return False
     
-    def test_code_assistant_javascript(self):
+    @flow
+    async def test_code_assistant_javascript(self):
         """Test code assistant with JavaScript"""
         try:
             data = {
@@ -309,10 +682,10 @@ class TribeAITester:
                 "language": "javascript"
             }
             
-            response = self.make_request("POST", "/code/assist", data)
+            response = await self.amake_request("POST", "/code/assist", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     self.log_result("Code Assistant JavaScript", True, f"JavaScript code assistance provided")
                     return True
@@ -329,7 +702,8 @@ class TribeAITester:
 
     # ============= Law Library Tests =============
     
-    def test_law_search(self):
+    @flow
+    async def test_law_search(self):
         """Test legal information search"""
         try:
             data = {
@@ -337,10 +711,10 @@ class TribeAITester:
                 "category": "Landlord-Tenant"
             }
             
-            response = self.make_request("POST", "/law/search", data)
+            response = await self.amake_request("POST", "/law/search", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("information") and result.get("resources"):
                     self.log_result("Law Search", True, f"Legal information provided with {len(result['resources'])} resources")
                     return True
@@ -355,7 +729,8 @@ class TribeAITester:
             self.log_result("Law Search", False, f"Exception: {str(e)}")
             return False
     
-    def test_law_assist(self):
+    @flow
+    async def test_law_assist(self):
         """Test AI-guided form filling"""
         try:
             data = {
@@ -366,10 +741,10 @@ class TribeAITester:
                 "current_data": {}
             }
             
-            response = self.make_request("POST", "/law/assist", data)
+            response = await self.amake_request("POST", "/law/assist", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("message"):
                     self.log_result("Law Assist", True, f"AI assistance provided: {result['message'][:100]}...")
                     return True
@@ -384,7 +759,8 @@ class TribeAITester:
             self.log_result("Law Assist", False, f"Exception: {str(e)}")
             return False
     
-    def test_law_download(self):
+    @flow
+    async def test_law_download(self):
         """Test PDF form download"""
         try:
             data = {
@@ -399,7 +775,7 @@ class TribeAITester:
                 "jurisdiction": "California"
             }
             
-            response = self.make_request("POST", "/law/download", data)
+            response = await self.amake_request("POST", "/law/download", data)
             
             if response.status_code == 200:
                 # Check if it's a PDF response
@@ -420,7 +796,8 @@ class TribeAITester:
 
     # ============= Tribe Office Tests =============
     
-    def test_office_word_create(self):
+    @flow
+    async def test_office_word_create(self):
         """Test Word document creation"""
         try:
             data = {
@@ -433,7 +810,7 @@ class TribeAITester:
                 ]
             }
             
-            response = self.make_request("POST", "/office/word/create", data)
+            response = await self.amake_request("POST", "/office/word/create", data)
             
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
@@ -451,7 +828,8 @@ class TribeAITester:
             self.log_result("Office Word Create", False, f"Exception: {str(e)}")
             return False
     
-    def test_office_excel_create(self):
+    @flow
+    async def test_office_excel_create(self):
         """Test Excel spreadsheet creation"""
         try:
             data = {
@@ -465,7 +843,7 @@ class TribeAITester:
                 ]
             }
             
-            response = self.make_request("POST", "/office/excel/create", data)
+            response = await self.amake_request("POST", "/office/excel/create", data)
             
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
@@ -483,7 +861,8 @@ class TribeAITester:
             self.log_result("Office Excel Create", False, f"Exception: {str(e)}")
             return False
     
-    def test_office_powerpoint_create(self):
+    @flow
+    async def test_office_powerpoint_create(self):
         """Test PowerPoint presentation creation"""
         try:
             data = {
@@ -515,7 +894,7 @@ class TribeAITester:
                 ]
             }
             
-            response = self.make_request("POST", "/office/powerpoint/create", data)
+            response = await self.amake_request("POST", "/office/powerpoint/create", data)
             
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
@@ -533,13 +912,14 @@ class TribeAITester:
             self.log_result("Office PowerPoint Create", False, f"Exception: {str(e)}")
             return False
     
-    def test_office_integrations_status(self):
+    @flow
+    async def test_office_integrations_status(self):
         """Test office integrations status"""
         try:
-            response = self.make_request("GET", "/office/integrations/status")
+            response = await self.amake_request("GET", "/office/integrations/status")
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if "microsoft" in result and "google" in result:
                     self.log_result("Office Integrations Status", True, "Integration status retrieved successfully")
                     return True
@@ -556,7 +936,8 @@ class TribeAITester:
 
     # ============= Tribe Studio Tests =============
     
-    def test_studio_generate_video(self):
+    @flow
+    async def test_studio_generate_video(self):
         """Test AI video generation"""
         try:
             # Using form data as the endpoint expects
@@ -567,15 +948,10 @@ class TribeAITester:
             }
             
             # Send as form data, not JSON
-            url = f"{BASE_URL}/studio/generate-video"
-            headers = {}
-            if self.auth_token:
-                headers["Authorization"] = f"Bearer {self.auth_token}"
-            
-            response = self.session.post(url, data=data, headers=headers)
+            response = await self.amake_request("POST", "/studio/generate-video", data, form=True)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("status") and result.get("service"):
                     self.log_result("Studio Video Generation", True, f"Video generation info received: {result['message']}")
                     return True
@@ -592,7 +968,8 @@ class TribeAITester:
 
     # ============= Translation Tests =============
     
-    def test_translation_spanish(self):
+    @flow
+    async def test_translation_spanish(self):
         """Test translation feature - English to Spanish"""
         try:
             data = {
@@ -602,10 +979,10 @@ class TribeAITester:
                 "language": "es"  # Spanish
             }
             
-            response = self.make_request("POST", "/chat", data)
+            response = await self.amake_request("POST", "/chat", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     # Check if response is in Spanish (basic validation)
                     spanish_response = result["response"]
@@ -626,7 +1003,8 @@ class TribeAITester:
             self.log_result("Translation Spanish", False, f"Exception: {str(e)}")
             return False
     
-    def test_translation_french(self):
+    @flow
+    async def test_translation_french(self):
         """Test translation feature - English to French"""
         try:
             data = {
@@ -636,10 +1014,10 @@ class TribeAITester:
                 "language": "fr"  # French
             }
             
-            response = self.make_request("POST", "/chat", data)
+            response = await self.amake_request("POST", "/chat", data)
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("response"):
                     # Check if response is in French (basic validation)
                     french_response = result["response"]
@@ -662,7 +1040,8 @@ class TribeAITester:
 
     # ============= Export Chat History Tests =============
     
-    def test_export_chat_history_pdf(self):
+    @flow
+    async def test_export_chat_history_pdf(self):
         """Test export chat history as PDF"""
         try:
             # First, ensure we have a conversation in the session
@@ -673,7 +1052,7 @@ class TribeAITester:
             }
             
             # Send a message to create conversation history
-            chat_response = self.make_request("POST", "/chat", chat_data)
+            chat_response = await self.amake_request("POST", "/chat", chat_data)
             if chat_response.status_code != 200:
                 self.log_result("Export Chat History PDF", False, "Failed to create conversation for export test")
                 return False
@@ -684,7 +1063,7 @@ class TribeAITester:
                 "session_id": self.session_id
             }
             
-            response = self.make_request("POST", "/chat/export", export_data)
+            response = await self.amake_request("POST", "/chat/export", export_data)
             
             if response.status_code == 200:
                 # Check if it's a PDF response
@@ -708,7 +1087,8 @@ class TribeAITester:
             self.log_result("Export Chat History PDF", False, f"Exception: {str(e)}")
             return False
     
-    def test_export_chat_history_txt(self):
+    @flow
+    async def test_export_chat_history_txt(self):
         """Test export chat history as TXT"""
         try:
             export_data = {
@@ -716,7 +1096,7 @@ class TribeAITester:
                 "session_id": self.session_id
             }
             
-            response = self.make_request("POST", "/chat/export", export_data)
+            response = await self.amake_request("POST", "/chat/export", export_data)
             
             if response.status_code == 200:
                 # Check if it's a TXT response
@@ -742,13 +1122,14 @@ class TribeAITester:
 
     # ============= User Statistics Tests =============
     
-    def test_user_statistics(self):
+    @flow
+    async def test_user_statistics(self):
         """Test user statistics endpoint"""
         try:
-            response = self.make_request("GET", "/user/stats")
+            response = await self.amake_request("GET", "/user/stats")
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("success") and result.get("stats"):
                     stats = result["stats"]
                     
@@ -795,13 +1176,14 @@ class TribeAITester:
 
     # ============= Health Check =============
     
-    def test_health_check(self):
+    @flow
+    async def test_health_check(self):
         """Test health endpoint"""
         try:
-            response = self.make_request("GET", "/health")
+            response = await self.amake_request("GET", "/health")
             
             if response.status_code == 200:
-                result = response.json()
+                result = await self.aparse(response)
                 if result.get("status") == "healthy":
                     self.log_result("Health Check", True, "API is healthy")
                     return True
@@ -818,100 +1200,337 @@ class TribeAITester:
 
     # ============= Main Test Runner =============
     
-    def run_all_tests(self):
-        """Run all backend API tests"""
-        print("🚀 Starting Comprehensive Backend API Testing for Tribe AI Platform")
-        print("=" * 80)
+    def _run_captured(self, test_func: Callable[[], bool], timeout: Optional[float] = None,
+                      run_deadline: Optional[float] = None,
+                      slot: Optional[Dict[str, float]] = None) -> Tuple[str, List[Tuple[str, Dict]], List[str], float]:
+        """Run a single test on the current thread, capturing its status, its log_result
+        entries, the endpoints it requested and its duration.
+
+        The test's deadline is ``timeout`` seconds from now, capped by ``run_deadline``
+        (time.monotonic()); it is published in ``slot`` for the scheduler. The status is
+        ``passed``, ``failed``, ``timeout`` (a request timed out or the deadline passed)
+        or ``cancelled``.
+        """
+        limits = ([time.monotonic() + timeout] if timeout else []) + ([run_deadline] if run_deadline else [])
+        deadline = min(limits, default=None)
+        if slot is not None:
+            slot.update(deadline=deadline, started=time.perf_counter())
+        self._local.results = []
+        self._local.endpoints = []
+        self._local.deadline = deadline
+        self._local.interrupted = None
+        started = time.perf_counter()
+        try:
+            try:
+                success = bool(test_func())
+            except (DeadlineExceeded, RunCancelled):
+                success = False
+            status = "passed" if success else self._local.interrupted or (
+                "timeout" if deadline is not None and time.monotonic() >= deadline else "failed")
+        finally:
+            captured, endpoints = self._local.results, self._local.endpoints
+            self._local.results = self._local.endpoints = self._local.deadline = None
+            self._local.interrupted = False
+        return status, captured, endpoints, time.perf_counter() - started
+
+    def run_scheduled(self, tests: List[Tuple[str, Callable[[], bool], List[str]]],
+                      max_workers: int = DEFAULT_MAX_WORKERS, deadlines: Optional[Dict[str, float]] = None,
+                      budget: Optional[float] = None, fail_fast: bool = False) -> Dict[str, str]:
+        """Run tests on a bounded worker pool, starting each one once its dependencies finished.
+
+        ``tests`` is a list of ``(name, test_func, depends_on)`` tuples. Dependencies only
+        constrain ordering: a dependent still runs if its dependency failed, matching the
+        sequential runner. Results are merged into ``test_results`` in declaration order
+        regardless of completion order.
+
+        ``deadlines`` gives seconds per test and ``budget`` seconds for the whole run;
+        requests never wait past either. A test still running ``DEADLINE_GRACE`` after
+        its deadline is reported as timed out and no longer waited for. Once the budget
+        is spent (or, with ``fail_fast``, a test did not pass) nothing new starts and
+        in-flight tests fail at their next request. Returns each test's status:
+        ``passed``, ``failed``, ``timeout``, ``cancelled`` or ``skipped``.
+        """
+        names = [name for name, _, _ in tests]
+        for name, _, deps in tests:
+            unknown = [dep for dep in deps if dep not in names]
+            if unknown:
+                raise ValueError(f"Test '{name}' depends on unknown tests: {unknown}")
+
+        pending = {name: (func, set(deps)) for name, func, deps in tests}
+        done = set()
+        outcomes: Dict[str, Tuple[str, List[Tuple[str, Dict]], List[str], float]] = {}
+        deadlines = deadlines or {}
+        run_deadline = time.monotonic() + budget if budget else None
+        self.cancelled.clear()
+
+        # The shared session must hold one pooled connection per worker; the
+        # async engine pools its own connections
+        adapter = PhaseTimingAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tribe-test")
+        abandoned = False
+        try:
+            running = {}
+            while pending or running:
+                out_of_time = run_deadline is not None and time.monotonic() >= run_deadline
+                if out_of_time or self.cancelled.is_set():
+                    # Tests still queued behind busy workers are skipped along with unstarted ones
+                    queued = [future for future in running if future.cancel()]
+                    skipped = list(pending) + [running.pop(future)[0] for future in queued]
+                    if skipped:
+                        print(f"\n⏭️  Skipping {len(skipped)} tests: "
+                              f"{'time budget spent' if out_of_time else 'run cancelled'}")
+                    for name in skipped:
+                        outcomes[name] = ("skipped", [], [], 0.0)
+                        done.add(name)
+                    pending.clear()
+                    self.cancelled.set()
+
+                for name in [n for n in names if n in pending and pending[n][1] <= done]:
+                    func, _ = pending.pop(name)
+                    print(f"\n🧪 Running: {name}")
+                    slot: Dict[str, Any] = {}
+                    running[pool.submit(self._run_captured, func, deadlines.get(name), run_deadline, slot)] = \
+                        (name, slot)
+
+                if not running:
+                    if pending:
+                        raise RuntimeError(f"Dependency cycle between tests: {sorted(pending)}")
+                    break
+
+                # Wake up in time to give up on the first test that overruns its deadline;
+                # queued tests get theirs when a worker picks them up, so check back soon
+                limits = [slot["deadline"] for _, slot in running.values() if slot.get("deadline") is not None]
+                if any("started" not in slot for _, slot in running.values()) and (deadlines or run_deadline):
+                    limits.append(time.monotonic())
+                timeout = max(0.0, min(limits) + DEADLINE_GRACE - time.monotonic()) if limits else None
+                finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)[0]
+                    try:
+                        outcomes[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ FAIL {name}: Unexpected error - {str(e)}")
+                        outcomes[name] = ("failed", [], [], 0.0)
+                    done.add(name)
+                    if fail_fast and outcomes[name][0] != "passed" and not self.cancelled.is_set():
+                        print(f"🛑 {name} {outcomes[name][0]}; cancelling the run")
+                        self.cancelled.set()
+
+                for future, (name, slot) in list(running.items()):
+                    deadline = slot.get("deadline")
+                    if deadline is not None and time.monotonic() >= deadline + DEADLINE_GRACE:
+                        print(f"⏱️  TIMEOUT {name}: still running past its deadline, no longer waiting")
+                        outcomes[name] = ("timeout", [], [], time.perf_counter() - slot["started"])
+                        running.pop(future)
+                        done.add(name)
+                        abandoned = True
+        finally:
+            # A thread stuck in a request is left behind; its requests time out by the deadline
+            pool.shutdown(wait=not abandoned, cancel_futures=True)
+
+        # Merge in declaration order so the report is deterministic, attaching the
+        # test's status, duration and the run-wide percentiles of every endpoint it called
+        latency = self.latency.summary()
+        messages = {"timeout": "Timed out", "cancelled": "Cancelled (fail-fast)",
+                    "skipped": "Skipped: not started before the run stopped"}
+        for name in names:
+            status, entries, endpoints, duration = outcomes[name]
+            if status in messages and not entries:
+                entries = [(name, {"success": False, "message": messages[status], "response_data": None})]
+            for result_name, entry in entries:
+                entry["status"] = status if status != "passed" or entry["success"] else "failed"
+                if status in messages:
+                    entry["success"] = False
+                entry["duration_s"] = duration
+                entry["latency"] = {key: latency[key] for key in endpoints if key in latency}
+                self.test_results[result_name] = entry
+
+        return {name: outcomes[name][0] for name in names}
+
+    def test_plan(self) -> List[Tuple[str, Callable[[], bool], List[str]]]:
+        """The full regression workload as ``(name, test, depends_on)`` tuples"""
+        auth = ["Authentication - Session"]
         
-        # Test order: Authentication first, then other features
+        # (name, test, depends_on): health first, then the auth chain, and a chat
+        # message must exist in the session before it can be exported. Everything
+        # else only needs an authenticated user and runs concurrently.
         tests = [
             # Health check first
-            ("Health Check", self.test_health_check),
+            ("Health Check", self.test_health_check, []),
             
             # Authentication tests
-            ("Authentication - Register", self.test_auth_register),
-            ("Authentication - Login", self.test_auth_login),
-            ("Authentication - Session", self.test_auth_session),
+            ("Authentication - Register", self.test_auth_register, ["Health Check"]),
+            ("Authentication - Login", self.test_auth_login, ["Authentication - Register"]),
+            ("Authentication - Session", self.test_auth_session, ["Authentication - Login"]),
             
             # Alpha Chat tests (Existing Features Regression Testing)
-            ("Alpha Chat - GPT-5", self.test_chat_gpt5),
-            ("Alpha Chat - Claude", self.test_chat_claude),
-            ("Alpha Chat - Gemini", self.test_chat_gemini),
+            ("Alpha Chat - GPT-5", self.test_chat_gpt5, auth),
+            ("Alpha Chat - Claude", self.test_chat_claude, auth),
+            ("Alpha Chat - Gemini", self.test_chat_gemini, auth),
             
             # Translation Feature Tests
-            ("Translation - English to Spanish", self.test_translation_spanish),
-            ("Translation - English to French", self.test_translation_french),
+            ("Translation - English to Spanish", self.test_translation_spanish, auth),
+            ("Translation - English to French", self.test_translation_french, auth),
             
             # Export Chat History Tests
-            ("Export Chat History - PDF", self.test_export_chat_history_pdf),
-            ("Export Chat History - TXT", self.test_export_chat_history_txt),
+            ("Export Chat History - PDF", self.test_export_chat_history_pdf, ["Alpha Chat - GPT-5"]),
+            ("Export Chat History - TXT", self.test_export_chat_history_txt, ["Export Chat History - PDF"]),
             
             # User Statistics Tests
-            ("User Statistics Dashboard", self.test_user_statistics),
+            ("User Statistics Dashboard", self.test_user_statistics, auth),
             
             # Image Generation (Existing Features Regression Testing)
-            ("Image Generation", self.test_image_generation),
+            ("Image Generation", self.test_image_generation, auth),
             
             # Code Assistant (Existing Features Regression Testing)
-            ("Code Assistant - Python", self.test_code_assistant_python),
-            ("Code Assistant - JavaScript", self.test_code_assistant_javascript),
+            ("Code Assistant - Python", self.test_code_assistant_python, auth),
+            ("Code Assistant - JavaScript", self.test_code_assistant_javascript, auth),
             
             # Law Library
-            ("Law Library - Search", self.test_law_search),
-            ("Law Library - Assist", self.test_law_assist),
-            ("Law Library - Download", self.test_law_download),
+            ("Law Library - Search", self.test_law_search, auth),
+            ("Law Library - Assist", self.test_law_assist, auth),
+            ("Law Library - Download", self.test_law_download, auth),
             
             # Tribe Office
-            ("Tribe Office - Word Create", self.test_office_word_create),
-            ("Tribe Office - Excel Create", self.test_office_excel_create),
-            ("Tribe Office - PowerPoint Create", self.test_office_powerpoint_create),
-            ("Tribe Office - Integrations Status", self.test_office_integrations_status),
+            ("Tribe Office - Word Create", self.test_office_word_create, auth),
+            ("Tribe Office - Excel Create", self.test_office_excel_create, auth),
+            ("Tribe Office - PowerPoint Create", self.test_office_powerpoint_create, auth),
+            ("Tribe Office - Integrations Status", self.test_office_integrations_status, auth),
             
             # Tribe Studio
-            ("Tribe Studio - Video Generation", self.test_studio_generate_video),
+            ("Tribe Studio - Video Generation", self.test_studio_generate_video, auth),
         ]
+        return tests
+
+    def run_all_tests(self, max_workers: int = DEFAULT_MAX_WORKERS, tags: Optional[List[str]] = None,
+                      test_timeout: Optional[float] = DEFAULT_TEST_TIMEOUT, budget: Optional[float] = None,
+                      fail_fast: bool = False):
+        """Run all backend API tests, or those tagged with any of ``tags`` (and their dependencies)
+
+        Returns (passed, failed); timed-out, cancelled and skipped tests count as failed.
+        """
+        print("🚀 Starting Comprehensive Backend API Testing for Tribe AI Platform")
+        print("=" * 80)
         
-        passed = 0
-        failed = 0
+        plan = select_tests(self.test_plan(), tags) if tags else self.test_plan()
+        if tags:
+            print(f"🏷️  {len(plan)} tests tagged {', '.join(tags)} (with dependencies)")
+        deadlines = {name: TEST_TIMEOUTS.get(name, test_timeout) for name, _, _ in plan} if test_timeout else None
+        started = time.monotonic()
+        outcomes = self.run_scheduled(plan, max_workers=max_workers, deadlines=deadlines, budget=budget,
+                                      fail_fast=fail_fast)
+        elapsed = time.monotonic() - started
+        self.wall_clock = elapsed
         
-        for test_name, test_func in tests:
-            print(f"\n🧪 Running: {test_name}")
-            try:
-                success = test_func()
-                if success:
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                print(f"❌ FAIL {test_name}: Unexpected error - {str(e)}")
-                failed += 1
-            
-            # Small delay between tests
-            time.sleep(0.5)
+        statuses = list(outcomes.values())
+        passed = statuses.count("passed")
+        failed = len(outcomes) - passed
         
         # Summary
         print("\n" + "=" * 80)
         print("📊 TEST SUMMARY")
         print("=" * 80)
         print(f"✅ Passed: {passed}")
-        print(f"❌ Failed: {failed}")
+        print(f"❌ Failed: {statuses.count('failed')}")
+        for status, icon, label in (("timeout", "⏱️ ", "Timed out"), ("cancelled", "🛑", "Cancelled"),
+                                    ("skipped", "⏭️ ", "Skipped")):
+            if status in statuses:
+                print(f"{icon} {label}: {statuses.count(status)}")
         print(f"📈 Success Rate: {(passed/(passed+failed)*100):.1f}%")
+        print(f"⏱️  Wall Clock: {elapsed:.2f}s ({max_workers} workers)")
+        
+        print("\n⏱️  LATENCY BY ENDPOINT")
+        print(format_summary_header())
+        for key, summary in self.latency.summary().items():
+            print(format_summary_row(key, summary))
+        print_phase_report(self.phases.summary())
+        if self.governor is not None:
+            print_governor_report(self.governor.report())
         
         if failed > 0:
             print("\n🔍 FAILED TESTS:")
+            icons = {"timeout": "⏱️ ", "cancelled": "🛑", "skipped": "⏭️ "}
             for test_name, result in self.test_results.items():
                 if not result["success"]:
-                    print(f"   ❌ {test_name}: {result['message']}")
+                    print(f"   {icons.get(result.get('status'), '❌')} {test_name}: {result['message']}")
         
         return passed, failed
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Tribe AI backend API tests")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help="Maximum number of tests running concurrently (1 runs sequentially)")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                        help="HTTP client: requests.Session (sync) or the pooled asyncio engine (async)")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="API root, e.g. http://127.0.0.1:8001/api for the local stand-in (env: TRIBE_BASE_URL)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_REQUEST_TIMEOUT,
+                        help="Per-request timeout in seconds (0 waits forever)")
+    parser.add_argument("--test-timeout", type=float, default=DEFAULT_TEST_TIMEOUT,
+                        help="Deadline per test in seconds (0 disables); video generation gets "
+                             f"{TEST_TIMEOUTS['Tribe Studio - Video Generation']:.0f}s")
+    parser.add_argument("--budget", type=float,
+                        help="Wall-clock seconds for the whole run; tests not started by then are skipped")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop starting tests and cancel in-flight ones after the first failure")
+    parser.add_argument("--tag", action="append", choices=all_tags(),
+                        help="Only run tests with this group or tag (repeatable); dependencies are added")
+    parser.add_argument("--list-tests", action="store_true", help="List tests with their tags and exit")
+    add_governor_args(parser)
+    parser.add_argument("--record", metavar="CASSETTE", help="Record every request and response to this cassette")
+    parser.add_argument("--replay", metavar="CASSETTE",
+                        help="Run against a local stand-in serving this cassette instead of --base-url")
+    parser.add_argument("--replay-scale", type=float, default=1.0,
+                        help="Multiply recorded latencies when replaying (0 replays instantly)")
+    parser.add_argument("--results", help="Save the run to this file (.jsonl appends, .json overwrites)")
+    parser.add_argument("--baseline", help="Fail when this run regresses against these saved results")
+    add_threshold_args(parser)
+    return parser.parse_args(argv)
+
 def main():
     """Main function to run all tests"""
-    tester = TribeAITester()
-    passed, failed = tester.run_all_tests()
+    args = parse_args()
+    if args.list_tests:
+        tester = TribeAITester(verbose=False)
+        for name, _, _ in select_tests(tester.test_plan(), args.tag) if args.tag else tester.test_plan():
+            print(f"{name:<40} {', '.join(sorted(tags_of(name)))}")
+        exit(0)
+    engine = AsyncClientEngine().start() if args.engine == "async" else None
+    governor = governor_from_args(args, retry_errors=(requests.ConnectionError,))
+    replay = replay_server(args.replay, args.replay_scale).start() if args.replay else None
+    base_url = replay.base_url if replay is not None else args.base_url
+    recorder = CassetteRecorder(args.record, base_url) if args.record else None
+    tester = TribeAITester(engine=engine, base_url=base_url, governor=governor, timeout=args.timeout or None,
+                           recorder=recorder)
+    started_at = datetime.now(timezone.utc)
+    try:
+        passed, failed = tester.run_all_tests(max_workers=max(1, args.workers), tags=args.tag,
+                                              test_timeout=args.test_timeout or None, budget=args.budget,
+                                              fail_fast=args.fail_fast)
+    finally:
+        if engine is not None:
+            engine.close()
+        if recorder is not None:
+            recorder.close()
+            print(f"\n📼 Recorded {recorder.interactions} interactions to {args.record}")
+        if replay is not None:
+            replay.stop()
+            stats = replay.app.stats
+            print(f"\n📼 Replayed {args.replay}: {stats['exact']} exact matches, "
+                  f"{stats['sequence']} by endpoint order, {stats['missed']} missed")
+    
+    record = build_run_record(tester, started_at, engine=args.engine, workers=max(1, args.workers))
+    if args.results:
+        save_run(record, args.results)
+        print(f"\n💾 Results saved to {args.results}")
+    regressed = bool(args.baseline) and not gate(args.baseline, [record], **thresholds_from_args(args))
     
     # Exit with appropriate code
-    exit(0 if failed == 0 else 1)
+    exit(0 if failed == 0 and not regressed else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
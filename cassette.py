@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay cassettes for the Tribe AI test harness
+Captures make_request traffic with digests and timing, and serves it back from a local stand-in
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterator
+from urllib.parse import parse_qs
+
+from multipart_stream import MultipartEncoder
+from stub_server import API_PREFIX, UPLOAD_CHUNK_SIZE, StubRequestHandler, StubServer
+
+CASSETTE_VERSION = 1
+# Request fields that change on every run and must not affect matching
+VOLATILE_FIELDS = {"session_id"}
+# Response headers that describe the recorded connection rather than the response
+SKIPPED_HEADERS = {"content-length", "transfer-encoding", "connection", "keep-alive", "content-encoding",
+                   "date", "server"}
+REPLAY_CHUNK_SIZE = 65536
+
+def normalize_fields(fields: Any) -> Any:
+    """Drop volatile fields from a JSON body or form so reruns produce the same digest"""
+    if isinstance(fields, dict):
+        return {key: value for key, value in fields.items() if key not in VOLATILE_FIELDS}
+    return fields
+
+def request_digest(method: str, endpoint: str, fields: Any) -> str:
+    """Digest of the request as matched on replay: method, endpoint and normalized body"""
+    canonical = json.dumps([method, endpoint, normalize_fields(fields)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def client_fields(kwargs: Dict[str, Any]) -> Any:
+    """The request body as make_request built it; multipart uploads are not digested"""
+    if kwargs.get("files") or isinstance(kwargs.get("data"), MultipartEncoder):
+        return None
+    if "json" in kwargs:
+        return kwargs["json"]
+    data = kwargs.get("data")
+    return {key: str(value) for key, value in data.items()} if isinstance(data, dict) else data
+
+def wire_fields(content_type: str, raw: bytes) -> Any:
+    """The same body, parsed back from what arrived on the wire"""
+    try:
+        if "application/json" in content_type and raw:
+            return json.loads(raw)
+        if "application/x-www-form-urlencoded" in content_type:
+            return {key: values[0] for key, values in parse_qs(raw.decode("utf-8")).items()}
+    except ValueError:
+        pass
+    return None
+
+class CassetteRecorder:
+    """Appends interactions to a gzipped JSONL cassette as they happen.
+
+    Response bodies are stored once per sha256 as ``blob`` lines, so repeated
+    responses (health checks, identical documents) cost a single copy.
+    """
+
+    def __init__(self, path: str, base_url: str = ""):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._blobs = set()
+        self._started = time.perf_counter()
+        self.interactions = 0
+        self._write({"type": "cassette", "version": CASSETTE_VERSION, "base_url": base_url,
+                     "recorded_at": datetime.now(timezone.utc).isoformat()})
+
+    def _write(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def record(self, method: str, endpoint: str, kwargs: Dict[str, Any], response, elapsed: float):
+        """Store one finished request. A streamed body is recorded as the caller reads it and
+        stored when it ends (or the response is closed), so the caller still sees it arrive live"""
+        fields = client_fields(kwargs)
+        entry = {
+            "method": method, "endpoint": endpoint, "offset_s": time.perf_counter() - self._started - elapsed,
+            "request_sha256": request_digest(method, endpoint, fields) if fields is not None else None,
+            "status": response.status_code,
+            "headers": {name: value for name, value in response.headers.items()
+                        if name.lower() not in SKIPPED_HEADERS},
+            "ttfb_s": elapsed, "streamed": bool(kwargs.get("stream")),
+        }
+        if entry["streamed"]:
+            StreamTap(self, entry, response)
+        else:
+            self.store(entry, response.content, elapsed)
+
+    def store(self, entry: Dict[str, Any], body: bytes, total: float):
+        """Write an interaction and, the first time its body is seen, the body's blob"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            if digest not in self._blobs:
+                self._blobs.add(digest)
+                self._write({"type": "blob", "sha256": digest, "data": base64.b64encode(body).decode("ascii")})
+            self._write({"type": "interaction", "seq": self.interactions, **entry, "body_sha256": digest,
+                         "body_bytes": len(body), "total_s": total})
+            self.interactions += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class StreamTap:
+    """Copies a streamed requests response's body into the cassette as the caller consumes it.
+
+    The interaction is stored when the body ends, timed to its last chunk, or when the
+    response is closed first, marked ``truncated`` with the part that was read.
+    """
+
+    def __init__(self, recorder: CassetteRecorder, entry: Dict[str, Any], response):
+        self.recorder = recorder
+        self.entry = entry
+        self.opened = time.perf_counter()
+        self.chunks: List[bytes] = []
+        self.stored = False
+        stream, close = response.raw.stream, response.close
+
+        def tapped(*args, **kwargs) -> Iterator[bytes]:
+            for chunk in stream(*args, **kwargs):
+                self.chunks.append(chunk)
+                yield chunk
+            self.store(truncated=False)
+
+        def closing():
+            close()
+            self.store(truncated=True)
+
+        response.raw.stream = tapped
+        response.close = closing
+
+    def store(self, truncated: bool):
+        if self.stored:
+            return
+        self.stored = True
+        if truncated:
+            self.entry["truncated"] = True
+        total = self.entry["ttfb_s"] + time.perf_counter() - self.opened
+        self.recorder.store(self.entry, b"".join(self.chunks), total)
+
+def load_cassette(path: str) -> Dict[str, Any]:
+    """Header, interactions in recorded order and bodies by digest"""
+    header, interactions, blobs = None, [], {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            kind = record.pop("type")
+            if kind == "cassette":
+                header = record
+            elif kind == "blob":
+                blobs[record["sha256"]] = base64.b64decode(record["data"])
+            elif kind == "interaction":
+                interactions.append(record)
+    if header is None or header.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+    return {"header": header, "interactions": interactions, "blobs": blobs}
+
+class ReplayApp:
+    """Matches incoming requests to recorded interactions.
+
+    An exact request digest wins; otherwise calls to the same method and endpoint get
+    the recorded responses in order, wrapping around when they run out. Recorded
+    timings are multiplied by ``latency_scale`` (0 replays instantly).
+    """
+
+    def __init__(self, cassette: Dict[str, Any], latency_scale: float = 1.0):
+        self.blobs = cassette["blobs"]
+        self.latency_scale = latency_scale
+        self.by_digest: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_endpoint: Dict[str, List[Dict[str, Any]]] = {}
+        for interaction in cassette["interactions"]:
+            if interaction["request_sha256"]:
+                self.by_digest.setdefault(interaction["request_sha256"], []).append(interaction)
+            self.by_endpoint.setdefault(f"{interaction['method']} {interaction['endpoint']}", []).append(interaction)
+        self.cursors: Dict[str, int] = {}
+        self.stats = {"exact": 0, "sequence": 0, "missed": 0}
+        self._lock = threading.Lock()
+
+    def _next(self, key: str, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        position = self.cursors.get(key, 0)
+        self.cursors[key] = position + 1
+        return candidates[position % len(candidates)]
+
+    def match(self, method: str, endpoint: str, fields: Any) -> Optional[Dict[str, Any]]:
+        digest = request_digest(method, endpoint, fields) if fields is not None else None
+        with self._lock:
+            if digest in self.by_digest:
+                self.stats["exact"] += 1
+                return self._next(digest, self.by_digest[digest])
+            key = f"{method} {endpoint}"
+            if key in self.by_endpoint:
+                self.stats["sequence"] += 1
+                return self._next(key, self.by_endpoint[key])
+            self.stats["missed"] += 1
+            return None
+
+class ReplayRequestHandler(StubRequestHandler):
+    """Serves recorded responses with their recorded time to first byte and transfer time"""
+
+    def _handle(self):
+        app: ReplayApp = self.server.app
+        endpoint = self.path[len(API_PREFIX):] if self.path.startswith(API_PREFIX) else self.path
+        length = int(self.headers.get("Content-Length") or 0)
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            # Uploads are not digested; discard them without holding the body
+            raw = b""
+            while length:
+                data = self.rfile.read(min(UPLOAD_CHUNK_SIZE, length))
+                if not data:
+                    break
+                length -= len(data)
+        else:
+            raw = self.rfile.read(length) if length else b""
+        interaction = app.match(self.command, endpoint, wire_fields(content_type, raw))
+        if interaction is None:
+            self._send(404, {"detail": "No recorded interaction"})
+            return
+
+        body = app.blobs[interaction["body_sha256"]]
+        time.sleep(interaction["ttfb_s"] * app.latency_scale)
+        if not interaction["streamed"]:
+            self._send(interaction["status"], body, interaction["headers"])
+            return
+        transfer = max(0.0, interaction["total_s"] - interaction["ttfb_s"]) * app.latency_scale
+        self._send_chunked(interaction["status"], self._paced(body, transfer, interaction["headers"]),
+                           interaction["headers"])
+
+    @staticmethod
+    def _paced(body: bytes, transfer: float, headers: Dict[str, str]) -> Iterator[bytes]:
+        """Spread a streamed body over its recorded transfer time, one SSE event per step when possible"""
+        content_type = next((value for name, value in headers.items() if name.lower() == "content-type"), "")
+        if "text/event-stream" in content_type:
+            parts = [event + b"\n\n" for event in body.split(b"\n\n") if event]
+        else:
+            parts = [body[i:i + REPLAY_CHUNK_SIZE] for i in range(0, len(body), REPLAY_CHUNK_SIZE)]
+        step = transfer / len(parts) if parts else 0.0
+        for part in parts:
+            if step > 0:
+                time.sleep(step)
+            yield part
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+def replay_server(path: str, latency_scale: float = 1.0, host: str = "127.0.0.1", port: int = 0,
+                  verbose: bool = False) -> StubServer:
+    """Stand-in server answering from a cassette; call start() or use it as a context manager"""
+    return StubServer(ReplayApp(load_cassette(path), latency_scale), host=host, port=port, verbose=verbose,
+                      handler=ReplayRequestHandler)
+
+def describe(cassette: Dict[str, Any]):
+    """Print what a cassette holds"""
+    interactions = cassette["interactions"]
+    header = cassette["header"]
+    print(f"📼 Recorded {header['recorded_at']} from {header['base_url'] or 'unknown'}")
+    print(f"   {len(interactions)} interactions, {len(cassette['blobs'])} distinct bodies "
+          f"({sum(len(body) for body in cassette['blobs'].values()) / 1024:.1f} KiB)")
+    endpoints: Dict[str, List[float]] = {}
+    for interaction in interactions:
+        endpoints.setdefault(f"{interaction['method']} {interaction['endpoint']}", []).append(interaction["total_s"])
+    for key, timings in sorted(endpoints.items()):
+        print(f"   {key:<40} {len(timings):>5} calls  mean {sum(timings) / len(timings) * 1000:>8.1f}ms")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Inspect or serve a recorded Tribe AI cassette")
+    parser.add_argument("command", choices=["info", "serve"])
+    parser.add_argument("cassette", help="Cassette recorded with backend_test.py --record")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiply recorded timings (0 replays instantly)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+def main():
+    """Describe a cassette, or serve it until interrupted"""
+    args = parse_args()
+    if args.command == "info":
+        describe(load_cassette(args.cassette))
+        return
+    server = replay_server(args.cassette, args.latency_scale, args.host, args.port, args.verbose)
+    print(f"📼 Replaying {args.cassette} on {server.base_url} (latency x{args.latency_scale})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        stats = server.app.stats
+        print(f"\n📊 {stats['exact']} exact matches, {stats['sequence']} by endpoint order, {stats['missed']} missed")
+
+if __name__ == "__main__":
+    main()
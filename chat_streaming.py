@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Streaming /chat measurements for the Tribe AI Platform
+Time to first byte, time to first token, inter-token gaps and tokens/sec per model
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+
+from auth_session import AuthError, get_auth_session
+from backend_test import BASE_URL, TEST_USER_EMAIL, TEST_USER_NAME, TEST_USER_PASSWORD, TribeAITester
+from latency_histogram import LatencyRecorder, format_summary_header, format_summary_row
+from request_phases import PhaseTimingAdapter
+from sse_events import iter_sse_events
+
+MODELS = ["gpt-5", "claude-4-sonnet-20250514", "gemini-2.5-pro"]
+PROMPTS = [
+    "Hello! Can you tell me about artificial intelligence?",
+    "What are the benefits of renewable energy?",
+    "Explain quantum computing in simple terms.",
+]
+# Characters of the completion kept for display; the rest is counted, not stored
+PREVIEW_CHARS = 120
+
+def event_token(data: str) -> str:
+    """Text carried by one SSE data payload, for the token shapes we expect"""
+    try:
+        event = json.loads(data)
+    except ValueError:
+        return data
+    if not isinstance(event, dict):
+        return ""
+    if "token" in event:
+        return event["token"] or ""
+    if "delta" in event:
+        return event["delta"] or ""
+    choices = event.get("choices") or []
+    if choices:
+        return (choices[0].get("delta") or {}).get("content") or ""
+    return ""
+
+class ChatStreamMeter:
+    """Sends /chat with ``stream: true`` and times the body as it arrives.
+
+    Server-sent events are parsed event by event from ``iter_content`` so only the
+    current partial event is buffered. A server that ignores the stream flag and
+    answers with plain JSON is still measured, with first token equal to full
+    response time and ``streamed`` false. Safe to call from several threads.
+    """
+
+    def __init__(self, tester: TribeAITester):
+        self.tester = tester
+        self.latency = LatencyRecorder()
+        self.rates: Dict[str, List[float]] = {}
+        self.chars: Dict[str, List[int]] = {}
+        self.attempts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, counts: Dict[str, Any], model: str, value: Any = None):
+        with self._lock:
+            if value is None:
+                counts[model] = counts.get(model, 0) + 1
+            else:
+                counts.setdefault(model, []).append(value)
+
+    def measure(self, model: str, message: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Stream one completion and record its timings under ``model``"""
+        data = {"message": message, "model": model, "session_id": session_id or self.tester.session_id,
+                "stream": True}
+        self._count(self.attempts, model)
+        started = time.perf_counter()
+        try:
+            response = self.tester.make_request("POST", "/chat", data,
+                                                headers={"Accept": "text/event-stream"}, stream=True)
+        except Exception as e:
+            self._count(self.errors, model)
+            return {"model": model, "success": False, "status_code": None, "error": str(e)}
+        ttfb = time.perf_counter() - started
+        if response.status_code != 200:
+            self._count(self.errors, model)
+            response.close()
+            return {"model": model, "success": False, "status_code": response.status_code}
+
+        content_type = response.headers.get("content-type", "")
+        first_token = last_token = None
+        tokens = 0
+        chars = 0
+        preview = ""
+        gaps = 0
+
+        def on_token(text: str, now: float):
+            nonlocal first_token, last_token, tokens, chars, preview, gaps
+            if not text:
+                return
+            if first_token is None:
+                first_token = now
+            else:
+                self.latency.record(f"{model} inter-token", now - last_token)
+                gaps += 1
+            last_token = now
+            tokens += 1
+            chars += len(text)
+            if len(preview) < PREVIEW_CHARS:
+                preview += text[:PREVIEW_CHARS - len(preview)]
+
+        try:
+            if "text/event-stream" in content_type:
+                for _, payload in iter_sse_events(response.iter_content(chunk_size=None)):
+                    if payload != "[DONE]":
+                        on_token(event_token(payload), time.perf_counter())
+            elif "application/json" in content_type:
+                result = response.json()
+                on_token(result.get("response", ""), time.perf_counter())
+            else:
+                for chunk in response.iter_content(chunk_size=None):
+                    on_token(chunk.decode("utf-8", "replace"), time.perf_counter())
+        except Exception as e:
+            # A stream that breaks or garbles mid-body is this model's error, not the run's
+            self._count(self.errors, model)
+            return {"model": model, "success": False, "status_code": response.status_code, "tokens": tokens,
+                    "error": str(e)}
+        finally:
+            response.close()
+        total = time.perf_counter() - started
+
+        self.latency.record(f"{model} ttfb", ttfb)
+        self.latency.record(f"{model} total", total)
+        if first_token is None:
+            self._count(self.errors, model)
+            return {"model": model, "success": False, "status_code": 200, "ttfb_s": ttfb}
+        self.latency.record(f"{model} ttft", first_token - started)
+        # Decode rate excludes the wait for the first token
+        rate = gaps / (last_token - first_token) if gaps and last_token > first_token else 0.0
+        if rate:
+            self._count(self.rates, model, rate)
+        self._count(self.chars, model, chars)
+        return {"model": model, "success": True, "streamed": "text/event-stream" in content_type,
+                "ttfb_s": ttfb, "ttft_s": first_token - started, "total_s": total,
+                "tokens": tokens, "chars": chars, "tokens_per_s": rate, "preview": preview}
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model timing summaries"""
+        summary = self.latency.summary()
+        report = {}
+        for model in sorted({key.rsplit(" ", 1)[0] for key in summary} | set(self.errors)):
+            rates, chars = self.rates.get(model, []), self.chars.get(model, [])
+            report[model] = {
+                "requests": self.attempts.get(model, 0),
+                "errors": self.errors.get(model, 0),
+                "error_rate": self.errors.get(model, 0) / self.attempts[model] if self.attempts.get(model) else 0.0,
+                "tokens_per_s": sum(rates) / len(rates) if rates else 0.0,
+                "response_chars": sum(chars) / len(chars) if chars else 0.0,
+                **{phase: summary[f"{model} {phase}"] for phase in ("ttfb", "ttft", "inter-token", "total")
+                   if f"{model} {phase}" in summary},
+            }
+        return report
+
+class ModelComparison:
+    """Fans every prompt out to all models at the same moment, so each model answers the
+    same prompt set under the same backend conditions and latencies can be compared.
+
+    Each prompt is a round: one request per model, sent together on a fresh session so
+    conversation history does not grow between rounds. ``concurrency`` rounds run at once.
+    """
+
+    def __init__(self, meter: ChatStreamMeter, models: List[str], concurrency: int = 1):
+        self.meter = meter
+        self.models = models
+        self.concurrency = concurrency
+        self.rounds: List[Dict[str, Optional[float]]] = []
+        self._lock = threading.Lock()
+
+    def run_round(self, pool: ThreadPoolExecutor, prompt: str) -> Dict[str, Optional[float]]:
+        """Send ``prompt`` to every model at once; total seconds per model, None on failure"""
+        futures = {model: pool.submit(self.meter.measure, model, prompt, str(uuid.uuid4())) for model in self.models}
+        totals = {}
+        for model, future in futures.items():
+            result = future.result()
+            totals[model] = result["total_s"] if result["success"] else None
+        with self._lock:
+            self.rounds.append(totals)
+        return totals
+
+    def run(self, prompts: List[str]) -> Dict[str, Any]:
+        """Run one round per prompt and return the per-model comparison"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency * len(self.models), thread_name_prefix="tribe-model") \
+                as requests_pool, ThreadPoolExecutor(max_workers=self.concurrency) as rounds_pool:
+            list(rounds_pool.map(lambda prompt: self.run_round(requests_pool, prompt), prompts))
+        return {"rounds": len(self.rounds), "elapsed_s": time.perf_counter() - started, "models": self.report()}
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Meter summaries plus paired results: how often each model was fastest, and its
+        median slowdown against the fastest model of the same round"""
+        report = self.meter.report()
+        wins = {model: 0 for model in self.models}
+        ratios: Dict[str, List[float]] = {model: [] for model in self.models}
+        complete = [totals for totals in self.rounds if all(totals.get(model) for model in self.models)]
+        for totals in complete:
+            fastest = min(totals.values())
+            wins[min(totals, key=totals.get)] += 1
+            for model, total in totals.items():
+                ratios[model].append(total / fastest)
+        for model in self.models:
+            ordered = sorted(ratios[model])
+            report.setdefault(model, {"requests": 0, "errors": 0, "error_rate": 0.0, "tokens_per_s": 0.0,
+                                      "response_chars": 0.0})
+            report[model]["paired_rounds"] = len(complete)
+            report[model]["fastest_share"] = wins[model] / len(complete) if complete else 0.0
+            report[model]["median_slowdown"] = ordered[len(ordered) // 2] if ordered else 0.0
+        return {model: report[model] for model in self.models}
+
+def print_comparison(comparison: Dict[str, Any]):
+    """One row per model; slowdown and fastest share only count rounds every model answered"""
+    print("\n" + "=" * 80)
+    print(f"📊 MODEL COMPARISON ({comparison['rounds']} prompts fanned out to every model, "
+          f"{comparison['elapsed_s']:.1f}s)")
+    print("=" * 80)
+    print(f"{'model':<28} {'n':>4} {'err%':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'ttft p50':>9} "
+          f"{'chars':>7} {'tok/s':>7} {'fastest':>8} {'slowdown':>9}")
+    for model, stats in comparison["models"].items():
+        total, ttft = stats.get("total"), stats.get("ttft")
+        latency = (f"{total['p50_ms']:>7.1f}ms {total['p90_ms']:>7.1f}ms {total['p99_ms']:>7.1f}ms"
+                   if total else f"{'-':>9} {'-':>9} {'-':>9}")
+        print(f"{model:<28} {stats['requests']:>4} {stats['error_rate'] * 100:>5.1f}% {latency} "
+              f"{ttft['p50_ms'] if ttft else 0.0:>7.1f}ms {stats['response_chars']:>7.0f} "
+              f"{stats['tokens_per_s']:>7.1f} {stats['fastest_share'] * 100:>7.0f}% {stats['median_slowdown']:>8.2f}x")
+
+def print_report(report: Dict[str, Dict[str, Any]]):
+    """Print per-model streaming latency tables"""
+    print("\n" + "=" * 80)
+    print("📊 CHAT STREAMING SUMMARY")
+    print("=" * 80)
+    for model, stats in report.items():
+        print(f"\n🤖 {model}: {stats['tokens_per_s']:.1f} tokens/s, {stats['errors']} errors")
+        print(format_summary_header())
+        for phase in ("ttfb", "ttft", "inter-token", "total"):
+            if phase in stats:
+                print(format_summary_row(phase, stats[phase]))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Measure streaming /chat latency per model")
+    parser.add_argument("--model", action="append", help="Model to measure (repeatable); defaults to all")
+    parser.add_argument("--samples", type=int, default=5, help="Completions per model")
+    parser.add_argument("--compare", action="store_true",
+                        help="Send each prompt to every model concurrently and compare them on one sample set")
+    parser.add_argument("--prompts-file", help="Prompts to use, one per line (default: built-in prompts)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Prompts in flight at once with --compare")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Log in once, then stream a few completions from every model"""
+    args = parse_args()
+    base_url = args.base_url or BASE_URL
+    auth = get_auth_session(base_url, TEST_USER_EMAIL, TEST_USER_PASSWORD, name=TEST_USER_NAME)
+    try:
+        auth.token
+    except AuthError as e:
+        print(f"❌ Could not authenticate: {e}")
+        exit(1)
+    tester = TribeAITester(verbose=False, base_url=base_url, auth=auth)
+    meter = ChatStreamMeter(tester)
+    prompts = PROMPTS
+    if args.prompts_file:
+        with open(args.prompts_file) as f:
+            prompts = [line.strip() for line in f if line.strip()]
+    if args.compare:
+        models = args.model or MODELS
+        # Concurrent streams to each model share the authenticated session's pool
+        adapter = PhaseTimingAdapter(pool_connections=args.concurrency * len(models),
+                                     pool_maxsize=args.concurrency * len(models))
+        tester.session.mount("https://", adapter)
+        tester.session.mount("http://", adapter)
+        comparison = ModelComparison(meter, models, args.concurrency).run(
+            [prompts[i % len(prompts)] for i in range(args.samples)])
+        print_comparison(comparison)
+        report = comparison
+    else:
+        for model in args.model or MODELS:
+            for i in range(args.samples):
+                result = meter.measure(model, prompts[i % len(prompts)])
+                if result["success"]:
+                    print(f"✅ {model}: ttft {result['ttft_s'] * 1000:.1f}ms, {result['tokens']} tokens, "
+                          f"{result['tokens_per_s']:.1f} tokens/s")
+                else:
+                    print(f"❌ {model}: HTTP {result['status_code']}")
+        report = meter.report()
+        print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Distributed load generation for the Tribe AI Platform
+A coordinator hands each agent its share of a load profile, starts them together and merges their metric deltas
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+from load_generator import add_load_args, describe_workload, print_report
+from load_workers import DEFAULT_INTERVAL, LoadCoordinator, merge_governor_reports, print_workers, run_worker
+from rate_governor import print_governor_report
+
+DEFAULT_PORT = 7700
+# Seconds between the start message and the synchronized start, long enough to reach every agent
+DEFAULT_START_LEAD = 1.0
+# Coordinator options that are not part of the plan sent to agents
+COORDINATOR_ONLY = {"command", "listen", "agents", "start_lead"}
+
+# ============= Wire protocol =============
+# One JSON object per line over TCP.
+#   agent -> coordinator: hello {name, cores}; then ready, metrics {payload: LoadMetrics delta},
+#                         done {payload: last delta, governor report, cpu_s} or error {payload: traceback}
+#   coordinator -> agent: plan {index, agents, args}; start {in_s}; stop
+
+def send_message(sock: socket.socket, message: Dict[str, Any]):
+    sock.sendall((json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8"))
+
+def parse_address(text: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+    """(host, port) from ``host:port``, ``:port`` or ``host``"""
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    return host or default_host, int(port) if port else DEFAULT_PORT
+
+# ============= Agent =============
+
+class LoadAgent:
+    """Runs the share of the load a coordinator assigns and streams metric deltas back.
+
+    The start message carries a delay rather than a wall-clock time, so agents need no
+    clock synchronization; their phases line up to within the coordinator-to-agent
+    network latency.
+    """
+
+    def __init__(self, coordinator: Tuple[str, int], name: Optional[str] = None, base_url: Optional[str] = None):
+        self.coordinator = coordinator
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        # Overrides the coordinator's --base-url when agents see the API under another address
+        self.base_url = base_url
+
+    def _control(self, reader, start: threading.Event, stop: threading.Event):
+        """Apply start and stop messages; a lost coordinator stops the run"""
+        for line in reader:
+            message = json.loads(line)
+            if message["type"] == "start":
+                time.sleep(message["in_s"])
+                start.set()
+            elif message["type"] == "stop":
+                stop.set()
+        stop.set()
+        start.set()
+
+    def run(self) -> bool:
+        """Connect, run the assigned plan and return whether it completed without error"""
+        with socket.create_connection(self.coordinator) as sock:
+            reader = sock.makefile("r", encoding="utf-8")
+            send_message(sock, {"type": "hello", "name": self.name, "cores": os.cpu_count()})
+            plan = json.loads(reader.readline())
+            args = argparse.Namespace(**plan["args"])
+            if self.base_url:
+                args.base_url = self.base_url
+            print(f"📋 Agent {plan['index'] + 1}/{plan['agents']}: {args.rate / plan['agents']:.2f}/s of "
+                  f"{describe_workload(args)}")
+
+            start, stop, messages = threading.Event(), threading.Event(), queue.Queue()
+            threading.Thread(target=self._control, args=(reader, start, stop), daemon=True).start()
+            threading.Thread(target=run_worker, name="tribe-agent",
+                             args=(plan["index"], plan["agents"], args, start, stop, messages), daemon=True).start()
+            while True:
+                kind, _, payload = messages.get()
+                try:
+                    send_message(sock, {"type": kind, "payload": payload})
+                except OSError:
+                    stop.set()
+                    return False
+                if kind == "error":
+                    print(payload)
+                    return False
+                if kind == "done":
+                    return True
+
+# ============= Coordinator =============
+
+class DistributedCoordinator(LoadCoordinator):
+    """LoadCoordinator whose workers are remote agents connected over TCP"""
+
+    def __init__(self, args: argparse.Namespace, agents: int, listen: Tuple[str, int],
+                 start_lead: float = DEFAULT_START_LEAD):
+        super().__init__(args, agents)
+        self.listen = listen
+        self.start_lead = start_lead
+        self.names: List[str] = []
+        self.connections: List[socket.socket] = []
+
+    def _read(self, index: int, sock: socket.socket, reader, messages: queue.Queue):
+        """Forward one agent's messages as (kind, index, payload) tuples"""
+        finished = False
+        try:
+            for line in reader:
+                message = json.loads(line)
+                finished = message["type"] in ("done", "error")
+                messages.put((message["type"], index, message.get("payload")))
+        except OSError:
+            pass
+        if not finished:
+            messages.put(("error", index, f"Agent {self.names[index]} disconnected"))
+
+    def _broadcast(self, message: Dict[str, Any]):
+        for sock in self.connections:
+            try:
+                send_message(sock, message)
+            except OSError:
+                pass
+
+    def _start(self):
+        self._broadcast({"type": "start", "in_s": self.start_lead})
+        time.sleep(self.start_lead)
+
+    def run(self) -> Dict[str, Any]:
+        """Wait for every agent, send each its plan, run and return the merged report"""
+        plan_args = {key: value for key, value in vars(self.args).items() if key not in COORDINATOR_ONLY}
+        if isinstance(plan_args.get("scenario_file"), str):
+            # Agents get the file's contents, so it only has to exist on the coordinator
+            with open(plan_args["scenario_file"]) as f:
+                plan_args["scenario_file"] = {"name": plan_args["scenario_file"], **json.load(f)}
+        messages: queue.Queue = queue.Queue()
+        with socket.create_server(self.listen) as server:
+            print(f"📡 Waiting for {self.workers} agents on {self.listen[0]}:{server.getsockname()[1]}")
+            try:
+                for index in range(self.workers):
+                    sock, address = server.accept()
+                    reader = sock.makefile("r", encoding="utf-8")
+                    hello = json.loads(reader.readline())
+                    self.names.append(hello["name"])
+                    self.connections.append(sock)
+                    print(f"   agent {index}: {hello['name']} from {address[0]} ({hello['cores']} cores)")
+                    send_message(sock, {"type": "plan", "index": index, "agents": self.workers, "args": plan_args})
+                    threading.Thread(target=self._read, args=(index, sock, reader, messages), daemon=True).start()
+                elapsed = self.collect(messages, self._start, lambda: self._broadcast({"type": "stop"}))
+            finally:
+                for sock in self.connections:
+                    sock.close()
+        return self.metrics.report(elapsed)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Distributed open-loop load generation for the Tribe AI API")
+    commands = parser.add_subparsers(dest="command", required=True)
+    coordinator = commands.add_parser("coordinator", help="Split the load across agents and report")
+    coordinator.add_argument("--agents", type=int, required=True, help="Agents to wait for before starting")
+    coordinator.add_argument("--listen", default=f"0.0.0.0:{DEFAULT_PORT}", help="host:port to accept agents on")
+    coordinator.add_argument("--start-lead", type=float, default=DEFAULT_START_LEAD,
+                             help="Seconds between the start message and the synchronized start")
+    coordinator.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                             help="Seconds between metric deltas and live lines")
+    add_load_args(coordinator)
+    agent = commands.add_parser("agent", help="Run the share of the load a coordinator assigns")
+    agent.add_argument("--coordinator", default=f"127.0.0.1:{DEFAULT_PORT}", help="Coordinator host:port")
+    agent.add_argument("--name", help="Agent name in reports (default: hostname:pid)")
+    agent.add_argument("--base-url", help="API root as seen from this agent (default: the coordinator's)")
+    return parser.parse_args(argv)
+
+def main():
+    """Run a coordinator or an agent from the command line"""
+    args = parse_args()
+    if args.command == "agent":
+        exit(0 if LoadAgent(parse_address(args.coordinator), args.name, args.base_url).run() else 1)
+
+    coordinator = DistributedCoordinator(args, args.agents, parse_address(args.listen, "0.0.0.0"), args.start_lead)
+    print(f"🚀 Load test: {args.rate}/s across {args.agents} agents for "
+          f"{args.ramp_up + args.steady + args.ramp_down:.0f}s, {describe_workload(args)}")
+    report = coordinator.run()
+    print_report(report)
+    print_workers(coordinator, report["elapsed_s"], coordinator.names)
+    if coordinator.governor_reports:
+        print_governor_report(merge_governor_reports(coordinator.governor_reports))
+    exit(1 if coordinator.errors else 0)
+
+if __name__ == "__main__":
+    main()
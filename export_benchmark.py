@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Chat export scaling benchmark for the Tribe AI Platform
+Seeds a session with growing history and fits /chat/export cost against its length
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+
+from auth_session import get_auth_session
+from backend_test import BASE_URL, TEST_USER_EMAIL, TEST_USER_NAME, TEST_USER_PASSWORD, TribeAITester
+from scaling import describe_fit, fit_linear, fit_marginal_power_law, median
+
+HISTORY_SIZES = [10, 100, 1000, 10000]
+FORMATS = ["pdf", "txt"]
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# Exports larger than this at the top of the sweep should be streamed end to end
+STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+class ExportBenchmark:
+    """Grows one session's history step by step and measures both export formats.
+
+    Seeding goes through concurrent ``/chat`` calls, or through the stand-in's
+    ``/__fixtures/chat-history`` route when ``seed_mode`` is ``fixture``.
+    """
+
+    def __init__(self, tester: TribeAITester, seed_mode: str = "chat", concurrency: int = 16, repeat: int = 3):
+        if seed_mode not in ("chat", "fixture"):
+            raise ValueError(f"Unsupported seed mode: {seed_mode}")
+        self.tester = tester
+        self.seed_mode = seed_mode
+        self.concurrency = concurrency
+        self.repeat = repeat
+
+    def seed(self, session_id: str, count: int) -> Dict[str, Any]:
+        """Add ``count`` chat messages to the session"""
+        started = time.perf_counter()
+        if self.seed_mode == "fixture":
+            response = self.tester.make_request("POST", "/__fixtures/chat-history",
+                                                {"session_id": session_id, "messages": count})
+            failures = 0 if response.status_code == 200 else count
+        else:
+            def send(i: int) -> bool:
+                data = {"message": f"Seed message {i}: summarize the previous answer in one line.",
+                        "model": "gpt-5", "session_id": session_id}
+                try:
+                    return self.tester.make_request("POST", "/chat", data).status_code == 200
+                except Exception:
+                    return False
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                failures = sum(1 for ok in pool.map(send, range(count)) if not ok)
+        return {"messages": count, "failures": failures, "elapsed_s": time.perf_counter() - started}
+
+    def measure(self, session_id: str, export_format: str) -> Dict[str, Any]:
+        """Streamed exports for latency, plus one buffered export for client memory"""
+        data = {"format": export_format, "session_id": session_id}
+        samples = []
+        server_streamed = False
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            response = self.tester.make_request("POST", "/chat/export", data, stream=True)
+            ttfb = time.perf_counter() - started
+            if response.status_code != 200:
+                response.close()
+                return {"success": False, "status_code": response.status_code}
+            server_streamed = "content-length" not in response.headers
+            received = 0
+            try:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    received += len(chunk)
+            finally:
+                response.close()
+            samples.append({"ttfb_s": ttfb, "total_s": time.perf_counter() - started, "bytes": received})
+
+        # The regression tests read response.content; measure what that costs the client
+        tracemalloc.start()
+        try:
+            response = self.tester.make_request("POST", "/chat/export", data)
+            buffered_bytes = len(response.content)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        if response.status_code != 200:
+            return {"success": False, "status_code": response.status_code}
+        return {
+            "success": True,
+            "ttfb_s": median([s["ttfb_s"] for s in samples]),
+            "total_s": median([s["total_s"] for s in samples]),
+            "bytes": int(median([s["bytes"] for s in samples])),
+            "peak_bytes": max([s["bytes"] for s in samples] + [buffered_bytes]),
+            "client_peak_memory_bytes": peak,
+            "server_streamed": server_streamed,
+        }
+
+    def run(self, sizes: List[int], formats: List[str], on_point=None) -> Dict[str, Any]:
+        """Seed cumulatively up to each size and export in every format"""
+        session_id = str(uuid.uuid4())
+        seeded = 0
+        points = []
+        for size in sorted(sizes):
+            seeding = self.seed(session_id, size - seeded)
+            seeded = size
+            for export_format in formats:
+                point = {"history": size, "format": export_format, "seed_failures": seeding["failures"],
+                         **self.measure(session_id, export_format)}
+                points.append(point)
+                if on_point:
+                    on_point(point)
+
+        fits = {}
+        for export_format in formats:
+            ok = [p for p in points if p["format"] == export_format and p["success"]]
+            history = [p["history"] for p in ok]
+            fits[export_format] = {
+                "latency": fit_marginal_power_law(history, [p["total_s"] for p in ok]),
+                "latency_linear": fit_linear(history, [p["total_s"] for p in ok]),
+                "bytes": fit_marginal_power_law(history, [p["bytes"] for p in ok]),
+                "bytes_linear": fit_linear(history, [p["bytes"] for p in ok]),
+                "largest": ok[-1] if ok else None,
+            }
+        return {"session_id": session_id, "seed_mode": self.seed_mode, "points": points, "fits": fits}
+
+def print_point(point: Dict[str, Any]):
+    if not point["success"]:
+        print(f"❌ {point['history']:>6} messages {point['format']}: HTTP {point['status_code']}")
+        return
+    print(f"✅ {point['history']:>6} messages {point['format']:<4} ttfb {point['ttfb_s'] * 1000:>8.1f}ms  "
+          f"total {point['total_s'] * 1000:>8.1f}ms  size {point['bytes'] / 1024:>9.1f} KiB  "
+          f"client peak {point['client_peak_memory_bytes'] / 1024:>9.1f} KiB  "
+          f"{'chunked' if point['server_streamed'] else 'buffered'}"
+          f"{'  (' + str(point['seed_failures']) + ' seed failures)' if point['seed_failures'] else ''}")
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print("📊 CHAT EXPORT SCALING SUMMARY")
+    print("=" * 80)
+    for export_format, fits in report["fits"].items():
+        print(describe_fit(f"{export_format} latency", fits["latency"]))
+        print(f"   ≈ {fits['latency_linear']['slope'] * 1e6:.1f}µs per message")
+        print(describe_fit(f"{export_format} size", fits["bytes"]))
+        print(f"   ≈ {fits['bytes_linear']['slope']:.0f} bytes per message")
+        largest = fits["largest"]
+        if largest and not largest["server_streamed"] and largest["peak_bytes"] > STREAMING_THRESHOLD_BYTES:
+            print(f"⚠️  {export_format} export of {largest['history']} messages is {largest['peak_bytes'] / 2 ** 20:.1f} MiB "
+                  f"and fully buffered by the server; consider streaming it")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Chat export scaling benchmark")
+    parser.add_argument("--size", type=int, action="append",
+                        help="History length to measure (repeatable); defaults to 10, 100, 1k, 10k")
+    parser.add_argument("--format", action="append", choices=FORMATS, help="Export format (repeatable)")
+    parser.add_argument("--seed-mode", choices=["chat", "fixture"], default="chat",
+                        help="Seed with real /chat calls or the stand-in's fixture route")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent /chat calls while seeding")
+    parser.add_argument("--repeat", type=int, default=3, help="Exports per point; medians are reported")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Run the sweep and print per-size results and growth fits"""
+    args = parse_args()
+    base_url = args.base_url or BASE_URL
+    auth = get_auth_session(base_url, TEST_USER_EMAIL, TEST_USER_PASSWORD, name=TEST_USER_NAME)
+    tester = TribeAITester(verbose=False, base_url=base_url, auth=auth)
+    benchmark = ExportBenchmark(tester, seed_mode=args.seed_mode, concurrency=args.concurrency, repeat=args.repeat)
+    report = benchmark.run(args.size or HISTORY_SIZES, args.format or FORMATS, on_point=print_point)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
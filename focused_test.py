@@ -3,44 +3,40 @@
 Focused test for the previously failing endpoints
 """
 
-import requests
+import os
 import json
 
-BASE_URL = "https://tribe-multiverse.preview.emergentagent.com/api"
+from auth_session import AuthError, get_auth_session
+
+BASE_URL = os.environ.get("TRIBE_BASE_URL", "https://tribe-multiverse.preview.emergentagent.com/api")
 TEST_USER_EMAIL = "test.user@tribeai.com"
 TEST_USER_PASSWORD = "SecurePassword123!"
+# Seconds to wait for a response (connect and each read), as in backend_test
+REQUEST_TIMEOUT = 180.0
 
-def get_auth_token():
-    """Get authentication token"""
-    session = requests.Session()
-    
-    # Login
-    data = {
-        "email": TEST_USER_EMAIL,
-        "password": TEST_USER_PASSWORD
-    }
-    
-    response = session.post(f"{BASE_URL}/auth/login", json=data)
-    if response.status_code == 200:
-        # Extract token from cookies if available
-        if "session_token" in response.cookies:
-            return response.cookies["session_token"], session
-    return None, session
+def authed_request(method: str, endpoint: str, **kwargs):
+    """Send a request as the test user, or None when the login fails
+
+    Every test shares one cached login and one pooled keep-alive session; a 401
+    refreshes the token and retries once.
+    """
+    auth = get_auth_session(BASE_URL, TEST_USER_EMAIL, TEST_USER_PASSWORD, timeout=REQUEST_TIMEOUT)
+    try:
+        return auth.request(method, endpoint, timeout=REQUEST_TIMEOUT, **kwargs)
+    except AuthError as e:
+        print(f"Login failed: {e}")
+        return None
 
 def test_law_search():
     """Test legal information search"""
-    token, session = get_auth_token()
-    
     data = {
         "query": "tenant rights and landlord responsibilities",
         "category": "Landlord-Tenant"
     }
     
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    
-    response = session.post(f"{BASE_URL}/law/search", json=data, headers=headers)
+    response = authed_request("POST", "/law/search", json=data)
+    if response is None:
+        return
     print(f"Law Search: {response.status_code}")
     if response.status_code != 200:
         print(f"Error: {response.text}")
@@ -50,8 +46,6 @@ def test_law_search():
 
 def test_law_assist():
     """Test AI-guided form filling"""
-    token, session = get_auth_token()
-    
     data = {
         "form_type": "rental_agreement",
         "conversation": [
@@ -60,11 +54,9 @@ def test_law_assist():
         "current_data": {}
     }
     
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    
-    response = session.post(f"{BASE_URL}/law/assist", json=data, headers=headers)
+    response = authed_request("POST", "/law/assist", json=data)
+    if response is None:
+        return
     print(f"Law Assist: {response.status_code}")
     if response.status_code != 200:
         print(f"Error: {response.text}")
@@ -74,19 +66,15 @@ def test_law_assist():
 
 def test_studio_video():
     """Test AI video generation with form data"""
-    token, session = get_auth_token()
-    
     data = {
         "prompt": "A cat playing with a ball of yarn in a sunny room",
         "style": "realistic",
         "service": "modelscope"
     }
     
-    headers = {}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    
-    response = session.post(f"{BASE_URL}/studio/generate-video", data=data, headers=headers)
+    response = authed_request("POST", "/studio/generate-video", data=data)
+    if response is None:
+        return
     print(f"Studio Video: {response.status_code}")
     if response.status_code != 200:
         print(f"Error: {response.text}")
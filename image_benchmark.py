@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Base64 overhead and harness memory for /image/generate
+Compares base64-in-JSON image delivery with a binary transfer mode
+"""
+
+import argparse
+import hashlib
+import time
+import tracemalloc
+from typing import Dict, Any, Optional, List
+
+from auth_session import get_auth_session
+from backend_test import BASE_URL, TEST_USER_EMAIL, TEST_USER_NAME, TEST_USER_PASSWORD, TribeAITester
+from image_payload import CHUNK_SIZE, HEADER_BYTES, scan_image_response, sniff_image
+
+def measure_transfer(tester: TribeAITester, prompt: str, count: int, binary: bool = False) -> Dict[str, Any]:
+    """One /image/generate call; ``binary`` asks for raw image bytes instead of base64 JSON"""
+    data = {"prompt": prompt, "number_of_images": count}
+    if binary:
+        data["response_format"] = "binary"
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        response = tester.make_request("POST", "/image/generate", data, stream=True)
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200:
+            response.close()
+            return {"success": False, "status_code": response.status_code}
+        if content_type.startswith("image/"):
+            digest = hashlib.sha256()
+            header = b""
+            wire = 0
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                digest.update(chunk)
+                wire += len(chunk)
+                if len(header) < HEADER_BYTES:
+                    header += chunk[:HEADER_BYTES - len(header)]
+            response.close()
+            image_format, width, height = sniff_image(header)
+            result = {"wire_bytes": wire, "images": [{"sha256": digest.hexdigest(), "decoded_bytes": wire,
+                                                      "format": image_format, "width": width, "height": height}],
+                      "fields": {}}
+        else:
+            result = scan_image_response(response)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    decoded = sum(image["decoded_bytes"] for image in result["images"])
+    return {"success": bool(result["images"]), "binary": content_type.startswith("image/"),
+            "elapsed_s": elapsed, "wire_bytes": result["wire_bytes"], "decoded_bytes": decoded,
+            "inflation": result["wire_bytes"] / decoded if decoded else 0.0,
+            "peak_memory_bytes": peak, "images": result["images"]}
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Measure /image/generate payload size and base64 overhead")
+    parser.add_argument("--images", type=int, default=4, help="number_of_images per request")
+    parser.add_argument("--samples", type=int, default=3, help="Requests per transfer mode")
+    parser.add_argument("--binary", action="store_true", help="Also request raw binary images for comparison")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Compare base64 JSON against binary transfer for generated images"""
+    args = parse_args()
+    base_url = args.base_url or BASE_URL
+    auth = get_auth_session(base_url, TEST_USER_EMAIL, TEST_USER_PASSWORD, name=TEST_USER_NAME)
+    tester = TribeAITester(verbose=False, base_url=base_url, auth=auth)
+    prompt = "A beautiful sunset over mountains with vibrant colors"
+    modes = [("base64", False)] + ([("binary", True)] if args.binary else [])
+    print("\n" + "=" * 80)
+    print("📊 IMAGE PAYLOAD SUMMARY")
+    print("=" * 80)
+    if args.binary:
+        # A binary response carries one image, so compare the modes per image
+        print(f"ℹ️  base64 requests {args.images} images, binary 1; wire and decoded sizes are per image")
+    for name, binary in modes:
+        for _ in range(args.samples):
+            result = measure_transfer(tester, prompt, 1 if binary else args.images, binary=binary)
+            if not result["success"]:
+                print(f"❌ {name}: HTTP {result.get('status_code')}")
+                continue
+            first = result["images"][0]
+            count = len(result["images"])
+            print(f"{'✅' if result['binary'] == binary else '⚠️ '} {name}: {count} x "
+                  f"{first['format']} {first['width']}x{first['height']}, wire {result['wire_bytes'] / count:.0f} B, "
+                  f"decoded {result['decoded_bytes'] / count:.0f} B, inflation {result['inflation']:.3f}x, "
+                  f"{result['elapsed_s'] * 1000:.1f}ms ({result['elapsed_s'] * 1000 / count:.1f}ms per image), "
+                  f"peak harness memory {result['peak_memory_bytes'] / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    main()
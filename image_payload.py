@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Low-memory handling of /image/generate payloads
+Decodes base64 images straight off the wire, keeping only digests, sizes and header facts
+"""
+
+import binascii
+import hashlib
+import json
+import struct
+from typing import Dict, Any, Optional, List, Tuple
+
+# Decoded bytes kept per image for format sniffing; JPEG SOF markers sit well inside this
+HEADER_BYTES = 65536
+CHUNK_SIZE = 65536
+# JSON string escapes that stand for control characters
+JSON_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+def sniff_image(header: bytes) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+    """Format, width and height from the first bytes of an image, or Nones"""
+    if header.startswith(b"\x89PNG\r\n\x1a\n") and len(header) >= 24 and header[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", header[16:24])
+        return "png", width, height
+    if header[:6] in (b"GIF87a", b"GIF89a") and len(header) >= 10:
+        width, height = struct.unpack("<HH", header[6:10])
+        return "gif", width, height
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP" and len(header) >= 30:
+        kind = header[12:16]
+        if kind == b"VP8 ":
+            width, height = struct.unpack("<HH", header[26:30])
+            return "webp", width & 0x3FFF, height & 0x3FFF
+        if kind == b"VP8L":
+            bits = int.from_bytes(header[21:25], "little")
+            return "webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if kind == b"VP8X":
+            return "webp", int.from_bytes(header[24:27], "little") + 1, int.from_bytes(header[27:30], "little") + 1
+        return "webp", None, None
+    if header[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 <= len(header):
+            if header[offset] != 0xFF:
+                offset += 1
+                continue
+            marker = header[offset + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                offset += 1 if marker == 0xFF else 2
+                continue
+            length = struct.unpack(">H", header[offset + 2:offset + 4])[0]
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", header[offset + 5:offset + 9])
+                return "jpeg", width, height
+            offset += 2 + length
+        return "jpeg", None, None
+    return None, None, None
+
+class Base64ImageDecoder:
+    """Incremental base64 decoder that hashes the image and keeps only its header"""
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.header = b""
+        self.encoded_chars = 0
+        self.decoded_bytes = 0
+        self._pending = b""
+        self._prefix = b""
+        self._in_prefix = True
+
+    def feed(self, data: bytes):
+        self.encoded_chars += len(data)
+        if self._in_prefix:
+            # Strip an optional "data:image/png;base64," prefix
+            self._prefix += data
+            if len(self._prefix) < 5 and b"data:".startswith(self._prefix):
+                return
+            if self._prefix.startswith(b"data:"):
+                comma = self._prefix.find(b",")
+                if comma < 0:
+                    return
+                data = self._prefix[comma + 1:]
+            else:
+                data = self._prefix
+            self._in_prefix = False
+            self._prefix = b""
+        data = self._pending + data
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        if usable:
+            self._emit(binascii.a2b_base64(data[:usable]))
+
+    def _emit(self, decoded: bytes):
+        self.digest.update(decoded)
+        self.decoded_bytes += len(decoded)
+        if len(self.header) < HEADER_BYTES:
+            self.header += decoded[:HEADER_BYTES - len(self.header)]
+
+    def close(self) -> Dict[str, Any]:
+        """Finish decoding and describe the image"""
+        if self._in_prefix and self._prefix:
+            self._in_prefix = False
+            self._pending, self._prefix = self._prefix, b""
+        if self._pending:
+            try:
+                self._emit(binascii.a2b_base64(self._pending + b"=" * (-len(self._pending) % 4)))
+            except binascii.Error:
+                pass  # a dangling single character carries no data
+            self._pending = b""
+        image_format, width, height = sniff_image(self.header)
+        return {"sha256": self.digest.hexdigest(), "encoded_chars": self.encoded_chars,
+                "decoded_bytes": self.decoded_bytes, "format": image_format, "width": width, "height": height}
+
+class ImageResponseScanner:
+    """Streaming JSON scanner for ``{"success": ..., "images": ["<base64>", ...]}``.
+
+    Strings inside the top-level ``images`` array are fed to a Base64ImageDecoder as
+    they arrive; other top-level scalars are kept (truncated) so callers can check
+    fields like ``success``. Nested objects are skipped.
+    """
+
+    FIELD_LIMIT = 1024
+
+    def __init__(self, images_key: str = "images"):
+        self.images_key = images_key.encode("utf-8")
+        self.fields: Dict[str, Any] = {}
+        self.images: List[Dict[str, Any]] = []
+        self.wire_bytes = 0
+        self._stack: List[str] = []
+        self._key: Optional[bytes] = None
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._string = b""
+        self._decoder: Optional[Base64ImageDecoder] = None
+        self._scalar = b""
+
+    def _in_images(self) -> bool:
+        return self._stack == ["{", "["] and self._key == self.images_key
+
+    def feed(self, chunk: bytes):
+        self.wire_bytes += len(chunk)
+        i, n = 0, len(chunk)
+        while i < n:
+            if self._in_string:
+                if self._decoder is not None and not self._escape:
+                    # Bulk path: hand everything up to the next quote or escape to the decoder
+                    end = len(chunk)
+                    for stop in (chunk.find(b'"', i), chunk.find(b"\\", i)):
+                        if stop != -1:
+                            end = min(end, stop)
+                    if end > i:
+                        self._decoder.feed(chunk[i:end])
+                        i = end
+                        continue
+                byte = chunk[i:i + 1]
+                i += 1
+                if self._escape:
+                    self._escape = False
+                    if self._decoder is not None and byte in b"nrt":
+                        continue  # line-wrapped base64 (base64.encodebytes); the breaks carry no data
+                    self._string_char(JSON_ESCAPES.get(byte, byte))
+                elif byte == b"\\":
+                    self._escape = True
+                elif byte == b'"':
+                    self._in_string = False
+                    self._end_string()
+                else:
+                    self._string_char(byte)
+                continue
+
+            byte = chunk[i:i + 1]
+            i += 1
+            if byte in b" \t\r\n":
+                continue
+            if byte == b'"':
+                self._in_string = True
+                self._string = b""
+                if self._in_images():
+                    self._decoder = Base64ImageDecoder()
+            elif byte in b"{[":
+                self._flush_scalar()
+                self._stack.append(byte.decode())
+                self._expect_key = byte == b"{"
+            elif byte in b"}]":
+                self._flush_scalar()
+                if self._stack:
+                    self._stack.pop()
+                if len(self._stack) == 1 and self._stack[0] == "{":
+                    self._expect_key = False
+            elif byte == b":":
+                self._expect_key = False
+            elif byte == b",":
+                self._flush_scalar()
+                if self._stack and self._stack[-1] == "{":
+                    self._expect_key = True
+            else:
+                self._scalar += byte
+
+    def _string_char(self, byte: bytes):
+        if self._decoder is not None:
+            self._decoder.feed(byte)
+        elif len(self._string) < self.FIELD_LIMIT:
+            self._string += byte
+
+    def _end_string(self):
+        if self._decoder is not None:
+            self.images.append(self._decoder.close())
+            self._decoder = None
+        elif self._stack == ["{"]:
+            if self._expect_key:
+                self._key = self._string
+            else:
+                self.fields[self._key.decode("utf-8", "replace")] = self._string.decode("utf-8", "replace")
+
+    def _flush_scalar(self):
+        if not self._scalar:
+            return
+        if self._stack == ["{"] and self._key is not None:
+            text = self._scalar.decode("utf-8", "replace")
+            try:
+                value = json.loads(text)
+            except ValueError:
+                value = text
+            self.fields[self._key.decode("utf-8", "replace")] = value
+        self._scalar = b""
+
+    def close(self) -> Dict[str, Any]:
+        self._flush_scalar()
+        if self.images:
+            self.fields[self.images_key.decode()] = len(self.images)
+        return {"fields": self.fields, "images": self.images, "wire_bytes": self.wire_bytes}
+
+def scan_image_response(response, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Consume a streamed /image/generate response with bounded memory.
+
+    Also takes an httpx response the async engine has already read.
+    """
+    scanner = ImageResponseScanner()
+    if hasattr(response, "iter_content"):
+        chunks = response.iter_content(chunk_size=chunk_size)
+    else:
+        chunks = response.iter_bytes(chunk_size)
+    try:
+        for chunk in chunks:
+            scanner.feed(chunk)
+    finally:
+        if not getattr(response, "is_closed", False):
+            response.close()
+    return scanner.close()
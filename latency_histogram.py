@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+High-dynamic-range latency histograms for the Tribe AI test harness
+Log-linear bucketing with a fixed number of significant figures, as in HdrHistogram
+"""
+
+import math
+import threading
+from typing import Dict, Any, Optional, Iterable, Tuple
+
+# Latencies are recorded as integer microseconds between 1us and one hour
+DEFAULT_LOWEST_US = 1
+DEFAULT_HIGHEST_US = 3_600_000_000
+DEFAULT_SIGNIFICANT_FIGURES = 3
+SUMMARY_PERCENTILES = (("p50", 50.0), ("p90", 90.0), ("p99", 99.0), ("p99.9", 99.9))
+
+class HdrHistogram:
+    """Histogram whose buckets keep ``significant_figures`` of precision at every magnitude.
+
+    Counts are stored sparsely, so an idle histogram costs a few hundred bytes and a
+    busy one only grows with the number of distinct buckets hit. Two histograms with
+    the same configuration can be merged exactly, which is how per-thread or
+    per-process recordings are combined.
+    """
+
+    def __init__(self, lowest: int = DEFAULT_LOWEST_US, highest: int = DEFAULT_HIGHEST_US,
+                 significant_figures: int = DEFAULT_SIGNIFICANT_FIGURES):
+        if lowest < 1 or highest < 2 * lowest:
+            raise ValueError("highest must be at least twice lowest, and lowest at least 1")
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        self.unit_magnitude = int(math.floor(math.log2(lowest)))
+        self.sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit)))
+        self.sub_bucket_half_count_magnitude = self.sub_bucket_count_magnitude - 1
+        self.sub_bucket_count = 1 << self.sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = (self.sub_bucket_count - 1) << self.unit_magnitude
+
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.total_sum = 0
+        self.min_value: Optional[int] = None
+        self.max_value: Optional[int] = None
+
+    # ============= Bucket Arithmetic =============
+
+    def _bucket_index(self, value: int) -> int:
+        return (value | self.sub_bucket_mask).bit_length() - self.unit_magnitude - self.sub_bucket_count_magnitude
+
+    def _counts_index(self, value: int) -> int:
+        bucket_index = self._bucket_index(value)
+        sub_bucket_index = value >> (bucket_index + self.unit_magnitude)
+        return ((bucket_index + 1) << self.sub_bucket_half_count_magnitude) + (sub_bucket_index - self.sub_bucket_half_count)
+
+    def _value_range(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value that map to a counts index"""
+        bucket_index = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self.sub_bucket_half_count
+            bucket_index = 0
+        low = sub_bucket_index << (bucket_index + self.unit_magnitude)
+        return low, low + (1 << (bucket_index + self.unit_magnitude)) - 1
+
+    # ============= Recording =============
+
+    def record(self, value: int, count: int = 1):
+        """Record an integer value, clamped to the trackable range"""
+        value = min(max(int(value), self.lowest), self.highest)
+        index = self._counts_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.total_sum += value * count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def merge(self, other: "HdrHistogram"):
+        """Add another histogram's counts into this one"""
+        if (other.lowest, other.highest, other.significant_figures) != \
+                (self.lowest, self.highest, self.significant_figures):
+            raise ValueError("Cannot merge histograms with different configurations")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.total_sum += other.total_sum
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+
+    def copy(self) -> "HdrHistogram":
+        clone = HdrHistogram(self.lowest, self.highest, self.significant_figures)
+        clone.merge(self)
+        return clone
+
+    def reset(self):
+        self.counts.clear()
+        self.total_count = 0
+        self.total_sum = 0
+        self.min_value = None
+        self.max_value = None
+
+    # ============= Queries =============
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Highest value equivalent to the value at the given percentile"""
+        if not self.total_count:
+            return 0
+        target = max(1, int(math.ceil(percentile / 100.0 * self.total_count)))
+        running = 0
+        for index in sorted(self.counts):
+            running += self.counts[index]
+            if running >= target:
+                return min(self._value_range(index)[1], self.max_value)
+        return self.max_value
+
+    def values_at_percentiles(self, percentiles: Iterable[float]) -> Dict[float, int]:
+        """Several percentiles in one pass over the counts"""
+        wanted = sorted(percentiles)
+        result = {}
+        if not self.total_count:
+            return {p: 0 for p in wanted}
+        running = 0
+        position = 0
+        for index in sorted(self.counts):
+            running += self.counts[index]
+            while position < len(wanted) and running >= max(1, math.ceil(wanted[position] / 100.0 * self.total_count)):
+                result[wanted[position]] = min(self._value_range(index)[1], self.max_value)
+                position += 1
+            if position == len(wanted):
+                break
+        for p in wanted[position:]:
+            result[p] = self.max_value
+        return result
+
+    def count_at_or_below(self, value: int) -> int:
+        """Recorded values whose bucket lies entirely at or below ``value``"""
+        return sum(count for index, count in self.counts.items() if self._value_range(index)[1] <= value)
+
+    @property
+    def mean(self) -> float:
+        return self.total_sum / self.total_count if self.total_count else 0.0
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Count, percentiles and max in milliseconds, for reports"""
+        values = self.values_at_percentiles(p for _, p in SUMMARY_PERCENTILES)
+        summary = {"count": self.total_count, "mean_ms": self.mean / 1000.0}
+        for name, p in SUMMARY_PERCENTILES:
+            summary[f"{name}_ms"] = values[p] / 1000.0
+        summary["max_ms"] = (self.max_value or 0) / 1000.0
+        return summary
+
+    # ============= Serialization =============
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact JSON/pickle friendly form for shipping between processes"""
+        return {
+            "lowest": self.lowest,
+            "highest": self.highest,
+            "significant_figures": self.significant_figures,
+            "counts": [[index, count] for index, count in sorted(self.counts.items())],
+            "total_sum": self.total_sum,
+            "min": self.min_value,
+            "max": self.max_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HdrHistogram":
+        histogram = cls(data["lowest"], data["highest"], data["significant_figures"])
+        for index, count in data["counts"]:
+            histogram.counts[int(index)] = count
+            histogram.total_count += count
+        histogram.total_sum = data["total_sum"]
+        histogram.min_value = data["min"]
+        histogram.max_value = data["max"]
+        return histogram
+
+class LatencyRecorder:
+    """Thread-safe set of named histograms, one per endpoint (or any other key)"""
+
+    def __init__(self, significant_figures: int = DEFAULT_SIGNIFICANT_FIGURES):
+        self.significant_figures = significant_figures
+        self.histograms: Dict[str, HdrHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        """Record one latency in seconds"""
+        micros = int(seconds * 1_000_000)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = HdrHistogram(significant_figures=self.significant_figures)
+            histogram.record(micros)
+
+    def get(self, key: str) -> Optional[HdrHistogram]:
+        with self._lock:
+            histogram = self.histograms.get(key)
+            return histogram.copy() if histogram is not None else None
+
+    def merge(self, other: "LatencyRecorder"):
+        """Merge another recorder, e.g. from a worker thread or process"""
+        self.merge_snapshot(other.snapshot())
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Serialized copy of every histogram; ``reset`` turns it into a delta"""
+        with self._lock:
+            snapshot = {key: histogram.to_dict() for key, histogram in self.histograms.items()}
+            if reset:
+                self.histograms.clear()
+        return snapshot
+
+    def merge_snapshot(self, snapshot: Dict[str, Dict[str, Any]]):
+        """Merge a snapshot produced by snapshot()"""
+        with self._lock:
+            for key, data in snapshot.items():
+                incoming = HdrHistogram.from_dict(data)
+                if key in self.histograms:
+                    self.histograms[key].merge(incoming)
+                else:
+                    self.histograms[key] = incoming
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-key summaries in milliseconds, sorted by key"""
+        with self._lock:
+            return {key: self.histograms[key].summary_ms() for key in sorted(self.histograms)}
+
+def format_summary_row(name: str, summary: Dict[str, float], width: int = 40) -> str:
+    """One aligned report line: count, percentiles and max"""
+    return (f"{name:<{width}} {summary['count']:>7} {summary['p50_ms']:>9.1f} {summary['p90_ms']:>9.1f} "
+            f"{summary['p99_ms']:>9.1f} {summary['p99.9_ms']:>9.1f} {summary['max_ms']:>9.1f}")
+
+def format_summary_header(width: int = 40) -> str:
+    return (f"{'':<{width}} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+            f"{'p99.9 ms':>9} {'max ms':>9}")
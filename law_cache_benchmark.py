@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+/law/search cache-effectiveness benchmark for the Tribe AI Platform
+Replays a Zipfian legal-query workload and estimates server-side cache hits and the value of a search cache
+"""
+
+import argparse
+import bisect
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+from backend_test import BASE_URL, TribeAITester
+from latency_histogram import HdrHistogram, LatencyRecorder, format_summary_header, format_summary_row
+from request_phases import PhaseTimingAdapter
+
+# Topics by category, most commonly asked first within each category
+LEGAL_TOPICS = {
+    "Landlord-Tenant": [
+        "tenant rights and landlord responsibilities", "how to get my security deposit back",
+        "can my landlord evict me without notice", "who pays for repairs in a rental",
+        "breaking a lease early penalties", "rent increase limits", "landlord entering without permission",
+        "mold in apartment landlord liability", "subletting my apartment legally", "eviction process timeline",
+    ],
+    "Employment": [
+        "wrongful termination rights", "unpaid overtime claim", "workplace discrimination complaint",
+        "non-compete agreement enforceability", "final paycheck deadline", "sexual harassment at work",
+        "independent contractor vs employee", "family medical leave eligibility", "severance negotiation",
+        "retaliation for reporting safety violations",
+    ],
+    "Family": [
+        "how to file for divorce", "child custody arrangements", "child support calculation",
+        "spousal support duration", "prenuptial agreement validity", "adoption requirements",
+        "changing a custody order", "domestic violence protective order", "grandparents visitation rights",
+        "legal separation vs divorce",
+    ],
+    "Consumer": [
+        "refund rights for defective products", "debt collector harassment", "identity theft steps",
+        "car lemon law claim", "cancelling a gym membership contract", "credit report errors dispute",
+        "online purchase never delivered", "warranty claim denied",
+    ],
+    "Immigration": [
+        "work visa application process", "green card through marriage", "asylum eligibility",
+        "DACA renewal", "citizenship naturalization requirements", "visa overstay consequences",
+    ],
+    "Small Claims": [
+        "how to file a small claims case", "small claims court limits", "collecting a small claims judgment",
+        "suing a contractor for bad work", "serving papers to the defendant",
+    ],
+    "Estate": [
+        "writing a valid will", "probate process without a will", "setting up a living trust",
+        "power of attorney for elderly parent", "executor responsibilities",
+    ],
+    "Traffic": [
+        "contesting a speeding ticket", "license suspension after DUI", "car accident fault determination",
+        "points on driving record",
+    ],
+}
+# Ways users phrase the same question; applied to make near-duplicates
+PREFIXES = ["", "what are ", "explain ", "help with ", "info on ", "question about "]
+SUFFIXES = ["", "?", " please", " in california", " 2024", " urgent"]
+DEFAULT_ZIPF_S = 1.0
+DEFAULT_NEAR_DUPLICATE_RATE = 0.2
+CACHE_SIZES = [10, 25, 50, 100, 250]
+# Assumed latency of a search served from a cache, for the savings estimate
+DEFAULT_HIT_MS = 5.0
+# Cold-latency quantile below which a repeat is attributed to a cache hit
+HIT_QUANTILE = 10.0
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** s"""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        weights = [1.0 / (rank + 1) ** s for rank in range(n)]
+        total = sum(weights)
+        self.cumulative = []
+        running = 0.0
+        for weight in weights:
+            running += weight / total
+            self.cumulative.append(running)
+        self.rng = rng
+
+    def sample(self) -> int:
+        return min(bisect.bisect_left(self.cumulative, self.rng.random()), len(self.cumulative) - 1)
+
+def normalize_query(query: str) -> str:
+    """Key a normalizing cache would use: lowercase words, no punctuation or phrasing filler"""
+    text = re.sub(r"[^a-z0-9 ]", " ", query.lower())
+    for filler in sorted({p.strip() for p in PREFIXES + SUFFIXES if p.strip(" ?")}, key=len, reverse=True):
+        text = re.sub(rf"\b{re.escape(filler)}\b", " ", text)
+    return " ".join(text.split())
+
+class QueryWorkload:
+    """Zipfian stream of (category, query, base topic) triples with exact repeats and near-duplicates.
+
+    Categories are drawn by Zipf rank in LEGAL_TOPICS order, then a topic within the
+    category by Zipf rank; ``near_duplicate_rate`` of draws rephrase the topic.
+    """
+
+    def __init__(self, s: float = DEFAULT_ZIPF_S, near_duplicate_rate: float = DEFAULT_NEAR_DUPLICATE_RATE,
+                 seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.near_duplicate_rate = near_duplicate_rate
+        self.categories = list(LEGAL_TOPICS)
+        self.category_sampler = ZipfSampler(len(self.categories), s, self.rng)
+        self.topic_samplers = {category: ZipfSampler(len(topics), s, self.rng)
+                               for category, topics in LEGAL_TOPICS.items()}
+
+    def rephrase(self, topic: str) -> str:
+        prefix, suffix = self.rng.choice(PREFIXES[1:] + [""]), self.rng.choice(SUFFIXES[1:])
+        text = prefix + topic + suffix
+        return text.capitalize() if self.rng.random() < 0.5 else text
+
+    def next(self) -> Tuple[str, str, str]:
+        category = self.categories[self.category_sampler.sample()]
+        topic = LEGAL_TOPICS[category][self.topic_samplers[category].sample()]
+        query = self.rephrase(topic) if self.rng.random() < self.near_duplicate_rate else topic
+        return category, query, topic
+
+    def stream(self, count: int) -> List[Tuple[str, str, str]]:
+        return [self.next() for _ in range(count)]
+
+def lru_hit_ratio(keys: List[Any], size: int) -> float:
+    """Hit ratio of an LRU cache of ``size`` entries over a key stream"""
+    cache: OrderedDict = OrderedDict()
+    hits = 0
+    for key in keys:
+        if key in cache:
+            hits += 1
+            cache.move_to_end(key)
+        else:
+            cache[key] = True
+            if len(cache) > size:
+                cache.popitem(last=False)
+    return hits / len(keys) if keys else 0.0
+
+def implied_hit_ratio(cold: HdrHistogram, repeats: HdrHistogram, quantile: float = HIT_QUANTILE) -> Dict[str, float]:
+    """Share of repeats served from a cache, treating repeats as a mix of hits (all faster than
+    the cold ``quantile``) and misses (distributed like cold requests)"""
+    if not cold.total_count or not repeats.total_count:
+        return {"ratio": 0.0, "threshold_ms": 0.0}
+    threshold = cold.value_at_percentile(quantile)
+    miss_below = quantile / 100.0
+    ratio = (repeats.count_at_or_below(threshold) / repeats.total_count - miss_below) / (1 - miss_below)
+    return {"ratio": min(1.0, max(0.0, ratio)), "threshold_ms": threshold / 1000.0}
+
+class LawCacheBenchmark:
+    """Sends a query stream to /law/search and splits latency by what the client has sent before:
+    ``cold`` (first time this topic is asked in any wording), ``exact`` (byte-identical repeat)
+    and ``near-duplicate`` (topic seen before, but not this wording)."""
+
+    def __init__(self, tester: TribeAITester, concurrency: int = 1, hit_ms: float = DEFAULT_HIT_MS):
+        self.tester = tester
+        self.concurrency = concurrency
+        self.hit_ms = hit_ms
+        self.latency = LatencyRecorder()
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def send(self, category: str, query: str, kind: str) -> bool:
+        started = time.perf_counter()
+        try:
+            response = self.tester.make_request("POST", "/law/search", {"query": query, "category": category})
+            ok = response.status_code == 200 and bool(response.json().get("information"))
+        except Exception:
+            ok = False
+        if ok:
+            self.latency.record(kind, time.perf_counter() - started)
+        else:
+            with self._lock:
+                self.errors += 1
+        return ok
+
+    def run(self, stream: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+        """Classify every request up front (in stream order) and send them"""
+        seen_exact, seen_topics, plan = set(), set(), []
+        for category, query, topic in stream:
+            exact, base = (category, query), (category, topic)
+            kind = "exact" if exact in seen_exact else "near-duplicate" if base in seen_topics else "cold"
+            seen_exact.add(exact)
+            seen_topics.add(base)
+            plan.append((category, query, kind))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="tribe-law") as pool:
+            list(pool.map(lambda item: self.send(*item), plan))
+        elapsed = time.perf_counter() - started
+
+        cold = self.latency.get("cold") or HdrHistogram()
+        exact = self.latency.get("exact") or HdrHistogram()
+        near = self.latency.get("near-duplicate") or HdrHistogram()
+        exact_keys = [(category, query) for category, query, _ in stream]
+        normalized_keys = [(category, normalize_query(query)) for category, query, _ in stream]
+        cold_mean_ms = cold.mean / 1000.0
+        caches = []
+        for size in CACHE_SIZES:
+            exact_ratio, normalized_ratio = lru_hit_ratio(exact_keys, size), lru_hit_ratio(normalized_keys, size)
+            caches.append({"size": size, "exact_hit_ratio": exact_ratio, "normalized_hit_ratio": normalized_ratio,
+                           "saved_ms_per_request": normalized_ratio * max(0.0, cold_mean_ms - self.hit_ms)})
+        best = max(cache["normalized_hit_ratio"] for cache in caches)
+        # Smallest simulated cache that gets within 90% of what an unbounded one would
+        recommended = next(cache["size"] for cache in caches if cache["normalized_hit_ratio"] >= 0.9 * best)
+        return {
+            "recommended_size": recommended,
+            "requests": len(stream), "errors": self.errors, "hit_ms": self.hit_ms, "elapsed_s": elapsed,
+            "distinct_exact": len(set(exact_keys)), "distinct_normalized": len(set(normalized_keys)),
+            "distinct_topics": len({(category, topic) for category, _, topic in stream}),
+            "latency": self.latency.summary(),
+            "server_cache": {"exact": implied_hit_ratio(cold, exact), "near-duplicate": implied_hit_ratio(cold, near)},
+            "caches": caches,
+        }
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print(f"📊 LAW SEARCH CACHE SUMMARY ({report['requests']} requests, {report['errors']} errors)")
+    print("=" * 80)
+    print(f"🔑 {report['distinct_exact']} distinct queries, {report['distinct_normalized']} after normalization, "
+          f"{report['distinct_topics']} topics")
+    print(format_summary_header())
+    for kind in ("cold", "exact", "near-duplicate"):
+        if kind in report["latency"]:
+            print(format_summary_row(kind, report["latency"][kind]))
+    print("\n🗄️  Implied server-side cache hits (repeats faster than cold p10, net of cold requests that fast)")
+    for kind, estimate in report["server_cache"].items():
+        print(f"   {kind:<16} {estimate['ratio'] * 100:>5.1f}% below {estimate['threshold_ms']:.1f}ms")
+    if report["server_cache"]["exact"]["ratio"] < 0.05:
+        print("   No sign of a response cache: repeats cost the same as first requests")
+    print(f"\n📐 Simulated LRU search cache over this workload (hits assumed {report['hit_ms']:.0f}ms)")
+    print(f"{'entries':>10} {'exact key':>10} {'normalized':>11} {'saved/req':>10}")
+    for cache in report["caches"]:
+        print(f"{cache['size']:>10} {cache['exact_hit_ratio'] * 100:>9.1f}% {cache['normalized_hit_ratio'] * 100:>10.1f}% "
+              f"{cache['saved_ms_per_request']:>8.1f}ms")
+    print(f"💡 {report['recommended_size']} normalized entries get within 90% of the best simulated hit ratio")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="/law/search cache-effectiveness benchmark")
+    parser.add_argument("--requests", type=int, default=500, help="Queries to send")
+    parser.add_argument("--zipf-s", type=float, default=DEFAULT_ZIPF_S,
+                        help="Zipf exponent for categories and topics (higher = more skewed)")
+    parser.add_argument("--near-duplicates", type=float, default=DEFAULT_NEAR_DUPLICATE_RATE,
+                        help="Share of queries rephrased instead of repeated verbatim")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Concurrent queries (1 keeps cold/repeat classification exact)")
+    parser.add_argument("--hit-ms", type=float, default=DEFAULT_HIT_MS,
+                        help="Assumed latency of a cached search, for the savings estimate")
+    parser.add_argument("--seed", type=int, help="Random seed for the query stream")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Generate the workload, send it and report"""
+    args = parse_args()
+    stream = QueryWorkload(args.zipf_s, args.near_duplicates, args.seed).stream(args.requests)
+    tester = TribeAITester(verbose=False, base_url=args.base_url or BASE_URL)
+    adapter = PhaseTimingAdapter(pool_connections=args.concurrency, pool_maxsize=args.concurrency)
+    tester.session.mount("https://", adapter)
+    tester.session.mount("http://", adapter)
+    try:
+        report = LawCacheBenchmark(tester, args.concurrency, args.hit_ms).run(stream)
+    finally:
+        tester.session.close()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generation for the Tribe AI Platform
+Replays the backend_test flows as virtual-user scenarios at a target arrival rate
+"""
+
+import argparse
+import asyncio
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterator, Callable, Awaitable
+
+from async_engine import AsyncClientEngine
+from auth_session import AuthPool, AuthSession
+from backend_test import BASE_URL, TEST_USER_PASSWORD, TribeAITester, run_blocking
+from latency_histogram import HdrHistogram, LatencyRecorder
+from rate_governor import RateGovernor, add_governor_args, governor_from_args, print_governor_report
+from scenario_file import ScenarioFile, load_scenario_file
+
+# Virtual-user flows, expressed as the TribeAITester test methods they run in order. Each
+# starts by registering the test user, which falls back to logging in once it exists, so
+# the flows also work against a fresh backend
+SCENARIOS = {
+    "chat_export": ["test_auth_register", "test_chat_gpt5", "test_export_chat_history_txt"],
+    "chat_models": ["test_auth_register", "test_chat_gpt5", "test_chat_claude", "test_chat_gemini"],
+    "law": ["test_auth_register", "test_law_search", "test_law_assist", "test_law_download"],
+    "office": ["test_auth_register", "test_office_word_create", "test_office_excel_create",
+               "test_office_powerpoint_create"],
+    "code": ["test_auth_register", "test_code_assistant_python", "test_code_assistant_javascript"],
+    "image": ["test_auth_register", "test_image_generation"],
+    "studio": ["test_auth_register", "test_studio_generate_video"],
+}
+
+# Every test in backend_test's run_all_tests plan, run in declaration order
+FULL_WORKLOAD = "full"
+
+# Steps skipped when virtual users come pre-authenticated from a user pool
+AUTH_STEPS = {"test_auth_login", "test_auth_register"}
+
+# Error statuses the flows expect: registering the existing test user answers 400 and the
+# flow logs in instead, so load reports do not count it as an error
+EXPECTED_STATUSES = {"POST /auth/register": {400}}
+
+DEFAULT_MAX_VUS = 256
+# Seconds between stop checks while a virtual user on the event loop thinks
+STOP_POLL = 0.1
+
+@functools.lru_cache(maxsize=None)
+def full_workload_steps() -> List[str]:
+    """Test method names of the full run_all_tests plan"""
+    tester = TribeAITester(verbose=False)
+    try:
+        return [test.__name__ for _, test, _ in tester.test_plan()]
+    finally:
+        tester.session.close()
+
+def scenario_steps(name: str) -> List[str]:
+    return full_workload_steps() if name == FULL_WORKLOAD else SCENARIOS[name]
+
+class LoadProfile:
+    """Target arrival rate over ramp-up, steady-state and ramp-down phases.
+
+    The rate climbs linearly from 0 to ``rate`` arrivals/second during ramp-up,
+    holds for ``steady`` seconds and falls linearly back to 0 during ramp-down.
+    """
+
+    def __init__(self, rate: float, ramp_up: float = 0.0, steady: float = 60.0,
+                 ramp_down: float = 0.0, arrival: str = "constant"):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if min(ramp_up, steady, ramp_down) < 0:
+            raise ValueError("phase durations must not be negative")
+        if arrival not in ("constant", "poisson"):
+            raise ValueError(f"Unsupported arrival process: {arrival}")
+        self.rate = rate
+        self.ramp_up = ramp_up
+        self.steady = steady
+        self.ramp_down = ramp_down
+        self.arrival = arrival
+
+    @property
+    def duration(self) -> float:
+        return self.ramp_up + self.steady + self.ramp_down
+
+    def rate_at(self, t: float) -> float:
+        """Target arrivals per second at offset t"""
+        if t < 0 or t >= self.duration:
+            return 0.0
+        if t < self.ramp_up:
+            return self.rate * t / self.ramp_up
+        if t < self.ramp_up + self.steady:
+            return self.rate
+        return self.rate * (self.duration - t) / self.ramp_down
+
+    def cumulative(self, t: float) -> float:
+        """Expected number of arrivals in [0, t]"""
+        t = min(max(t, 0.0), self.duration)
+        up = min(t, self.ramp_up)
+        total = self.rate * up * up / (2 * self.ramp_up) if self.ramp_up else 0.0
+        total += self.rate * min(max(t - self.ramp_up, 0.0), self.steady)
+        down = max(t - self.ramp_up - self.steady, 0.0)
+        if down:
+            total += self.rate * down - self.rate * down * down / (2 * self.ramp_down)
+        return total
+
+    def arrival_times(self, rng: random.Random) -> Iterator[float]:
+        """Yield intended arrival offsets in seconds, independent of response times"""
+        if self.arrival == "poisson":
+            # Non-homogeneous Poisson process by thinning a rate-`rate` process
+            t = 0.0
+            while True:
+                t += rng.expovariate(self.rate)
+                if t >= self.duration:
+                    return
+                if rng.random() * self.rate < self.rate_at(t):
+                    yield t
+        else:
+            total = self.cumulative(self.duration)
+            k = 1
+            while k <= total:
+                yield self._inverse_cumulative(k)
+                k += 1
+
+    def _inverse_cumulative(self, count: float) -> float:
+        """Offset at which the expected arrival count reaches ``count``"""
+        low, high = 0.0, self.duration
+        for _ in range(60):
+            mid = (low + high) / 2
+            if self.cumulative(mid) < count:
+                low = mid
+            else:
+                high = mid
+        return high
+
+class LoadMetrics:
+    """Thread-safe per-endpoint and per-scenario latency histograms and error counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = LatencyRecorder()
+        self.scenarios = LatencyRecorder()
+        self.schedule_lag = LatencyRecorder()
+        self.errors: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+
+    def observe_request(self, method: str, endpoint: str, status_code: Optional[int], elapsed: float):
+        """make_request observer: service time of one request"""
+        key = f"{method} {endpoint}"
+        self.endpoints.record(key, elapsed)
+        if status_code is None or (status_code >= 400 and status_code not in EXPECTED_STATUSES.get(key, ())):
+            with self._lock:
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def observe_scenario(self, name: str, success: bool, latency: float, lag: float):
+        """Completion of one virtual user, timed from its intended arrival"""
+        self.scenarios.record(name, latency)
+        self.schedule_lag.record("lag", lag)
+        if not success:
+            with self._lock:
+                self.failures[name] = self.failures.get(name, 0) + 1
+
+    def merge(self, other: "LoadMetrics"):
+        """Fold another collector's histograms and counts into this one"""
+        self.merge_snapshot(other.snapshot())
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        """JSON-serializable copy of every histogram and count; ``reset`` turns it into a delta"""
+        snapshot = {"endpoints": self.endpoints.snapshot(reset), "scenarios": self.scenarios.snapshot(reset),
+                    "schedule_lag": self.schedule_lag.snapshot(reset)}
+        with self._lock:
+            snapshot["errors"], snapshot["failures"] = dict(self.errors), dict(self.failures)
+            if reset:
+                self.errors.clear()
+                self.failures.clear()
+        return snapshot
+
+    def merge_snapshot(self, snapshot: Dict[str, Any]):
+        """Merge a snapshot produced by snapshot(), e.g. sent by a worker process"""
+        self.endpoints.merge_snapshot(snapshot["endpoints"])
+        self.scenarios.merge_snapshot(snapshot["scenarios"])
+        self.schedule_lag.merge_snapshot(snapshot["schedule_lag"])
+        with self._lock:
+            for key, count in snapshot["errors"].items():
+                self.errors[key] = self.errors.get(key, 0) + count
+            for name, count in snapshot["failures"].items():
+                self.failures[name] = self.failures.get(name, 0) + count
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Summarize throughput and latency percentiles (milliseconds)"""
+        with self._lock:
+            errors, failures = dict(self.errors), dict(self.failures)
+        endpoints = {}
+        for key, summary in self.endpoints.summary().items():
+            endpoints[key] = {"errors": errors.get(key, 0),
+                              "throughput_rps": summary["count"] / elapsed if elapsed else 0.0, **summary}
+        scenarios = {}
+        for name, summary in self.scenarios.summary().items():
+            scenarios[name] = {"failures": failures.get(name, 0),
+                               "throughput_rps": summary["count"] / elapsed if elapsed else 0.0, **summary}
+        lag = self.schedule_lag.get("lag")
+        return {"elapsed_s": elapsed, "endpoints": endpoints, "scenarios": scenarios,
+                "schedule_lag": lag.summary_ms() if lag is not None else HdrHistogram().summary_ms()}
+
+class LoadGenerator:
+    """Open-loop driver: virtual users start on schedule whether or not earlier ones finished.
+
+    Scenario latency is measured from each user's intended arrival time, so time spent
+    waiting for a free worker while the backend is slow shows up in the results instead
+    of silently lowering the offered load (coordinated omission).
+    """
+
+    def __init__(self, scenarios: List[str], profile: LoadProfile, max_vus: int = DEFAULT_MAX_VUS,
+                 engine: Optional[AsyncClientEngine] = None, seed: Optional[int] = None,
+                 base_url: Optional[str] = None, auth_pool: Optional[AuthPool] = None,
+                 weights: Optional[List[float]] = None, metrics: Optional[LoadMetrics] = None,
+                 governor: Optional[RateGovernor] = None, scenario_file: Optional[ScenarioFile] = None):
+        if scenario_file is not None:
+            # The file's flows and weights replace the named scenarios
+            scenarios, weights = list(scenario_file.flows), scenario_file.weights
+        unknown = [name for name in scenarios if name not in SCENARIOS and name != FULL_WORKLOAD
+                   and (scenario_file is None or name not in scenario_file.flows)]
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {unknown}")
+        if weights is not None and (len(weights) != len(scenarios) or min(weights) < 0 or not sum(weights)):
+            raise ValueError("weights must be non-negative, not all zero, one per scenario")
+        self.scenarios = scenarios
+        self.scenario_file = scenario_file
+        # Relative arrival share per scenario; uniform when None
+        self.weights = weights
+        self.profile = profile
+        self.max_vus = max_vus
+        self.engine = engine
+        self.base_url = base_url
+        # Pre-authenticated users; without a pool every virtual user logs in itself
+        self.auth_pool = auth_pool
+        # Shared by every virtual user so rate limits and backoff apply to the whole run
+        self.governor = governor
+        self.rng = random.Random(seed)
+        self.metrics = metrics if metrics is not None else LoadMetrics()
+        # Set to stop dispatching new arrivals; users already started still finish
+        self.stopped = threading.Event()
+
+    def new_tester(self, auth: Optional[AuthSession] = None) -> TribeAITester:
+        """Quiet tester wired into the metrics collector"""
+        tester = TribeAITester(engine=self.engine, verbose=False, base_url=self.base_url, auth=auth,
+                               governor=self.governor)
+        # The generator's histograms replace the tester's own per-run recorder
+        tester.request_observers = [self.metrics.observe_request]
+        return tester
+
+    def run_virtual_user(self, scenario: str, intended: float, seed: Optional[int] = None):
+        """Run one scenario flow in the calling thread, stopping at the first failing step"""
+        async def wait(seconds: float) -> bool:
+            return self.stopped.wait(seconds)
+
+        run_blocking(self.arun_virtual_user(scenario, intended, seed, wait))
+
+    async def arun_virtual_user(self, scenario: str, intended: float, seed: Optional[int] = None,
+                                wait: Optional[Callable[[float], Awaitable[bool]]] = None):
+        """run_virtual_user as a coroutine; on the engine's event loop its requests and think
+        times are awaited, so the user holds no thread"""
+        lag = time.perf_counter() - intended
+        auth = self.auth_pool.next() if self.auth_pool is not None else None
+        tester = self.new_tester(auth)
+        success = True
+        try:
+            if self.scenario_file is not None:
+                # Think times end early once the run is stopped, closing the session
+                success = await self.scenario_file.arun(scenario, tester, random.Random(seed),
+                                                        AUTH_STEPS if auth is not None else set(),
+                                                        wait or self.wait_stopped)
+                return
+            for step in scenario_steps(scenario):
+                if auth is not None and step in AUTH_STEPS:
+                    continue
+                if not await getattr(TribeAITester, step).flow(tester):
+                    success = False
+                    break
+        except Exception:
+            success = False
+        finally:
+            if auth is None:
+                tester.session.close()
+            self.metrics.observe_scenario(scenario, success, time.perf_counter() - intended, lag)
+
+    async def wait_stopped(self, seconds: float) -> bool:
+        """stopped.wait for the event loop: sleep up to ``seconds``, True once the run is stopped"""
+        end = time.perf_counter() + seconds
+        while not self.stopped.is_set():
+            left = end - time.perf_counter()
+            if left <= 0:
+                return False
+            await asyncio.sleep(min(left, STOP_POLL))
+        return True
+
+    def choose_scenario(self) -> str:
+        if self.weights is None:
+            return self.rng.choice(self.scenarios)
+        return self.rng.choices(self.scenarios, weights=self.weights)[0]
+
+    def run(self) -> Dict[str, Any]:
+        """Dispatch arrivals for the whole profile and return the report"""
+        if self.engine is not None:
+            return self.engine.submit(self.arun())
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_vus, thread_name_prefix="tribe-vu") as pool:
+            for offset in self.profile.arrival_times(self.rng):
+                intended = started + offset
+                delay = intended - time.perf_counter()
+                if self.stopped.wait(delay) if delay > 0 else self.stopped.is_set():
+                    break
+                pool.submit(self.run_virtual_user, self.choose_scenario(), intended, self.rng.getrandbits(64))
+        return self.metrics.report(time.perf_counter() - started)
+
+    async def arun(self) -> Dict[str, Any]:
+        """run() on the engine's event loop: every virtual user is a task, at most max_vus running"""
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(self.max_vus)
+        users = set()
+
+        async def user(scenario: str, intended: float, seed: int):
+            async with slots:
+                await self.arun_virtual_user(scenario, intended, seed)
+
+        for offset in self.profile.arrival_times(self.rng):
+            intended = started + offset
+            delay = intended - time.perf_counter()
+            if await self.wait_stopped(delay) if delay > 0 else self.stopped.is_set():
+                break
+            task = asyncio.create_task(user(self.choose_scenario(), intended, self.rng.getrandbits(64)))
+            users.add(task)
+            task.add_done_callback(users.discard)
+        await asyncio.gather(*users)
+        return self.metrics.report(time.perf_counter() - started)
+
+def print_report(report: Dict[str, Any]):
+    """Print throughput and latency tables"""
+    print("\n" + "=" * 80)
+    print(f"📊 LOAD SUMMARY ({report['elapsed_s']:.1f}s)")
+    print("=" * 80)
+    header = (f"{'':<40} {'count':>7} {'err':>5} {'rps':>8} {'p50':>9} {'p90':>9} {'p99':>9} "
+              f"{'p99.9':>9} {'max':>9}")
+    for title, rows, error_key in (("Endpoint", report["endpoints"], "errors"),
+                                   ("Scenario (from intended start)", report["scenarios"], "failures")):
+        print(f"\n{title}")
+        print(header)
+        for name, stats in rows.items():
+            print(f"{name:<40} {stats['count']:>7} {stats[error_key]:>5} {stats['throughput_rps']:>8.2f} "
+                  f"{stats['p50_ms']:>7.1f}ms {stats['p90_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms "
+                  f"{stats['p99.9_ms']:>7.1f}ms {stats['max_ms']:>7.1f}ms")
+    lag = report["schedule_lag"]
+    print(f"\n⏱️  Schedule lag: p50 {lag['p50_ms']:.1f}ms, p99 {lag['p99_ms']:.1f}ms, max {lag['max_ms']:.1f}ms")
+
+def workload_from_args(args: argparse.Namespace) -> Optional[ScenarioFile]:
+    """The --scenario-file workload, if one was given (a path, or its contents when sent to an agent)"""
+    return load_scenario_file(args.scenario_file, SCENARIOS) if args.scenario_file else None
+
+def describe_workload(args: argparse.Namespace) -> str:
+    if args.scenario_file:
+        source = args.scenario_file
+        return f"scenario file {source if isinstance(source, str) else source.get('name', '(inline)')}"
+    return f"scenarios {args.scenario or ['chat_export']}"
+
+def add_load_args(parser: argparse.ArgumentParser):
+    """Workload, profile and client options shared by the load CLIs"""
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS) + [FULL_WORKLOAD],
+                        help="Scenario to run (repeatable); defaults to chat_export")
+    parser.add_argument("--scenario-file",
+                        help="JSON file of weighted flows, think times and data generators (replaces --scenario)")
+    parser.add_argument("--rate", type=float, required=True, help="Target virtual-user arrivals per second")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Ramp-up seconds")
+    parser.add_argument("--steady", type=float, default=60.0, help="Steady-state seconds")
+    parser.add_argument("--ramp-down", type=float, default=0.0, help="Ramp-down seconds")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant",
+                        help="Arrival process")
+    parser.add_argument("--max-vus", type=int, default=DEFAULT_MAX_VUS,
+                        help="Maximum concurrently active virtual users")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync", help="HTTP client")
+    parser.add_argument("--seed", type=int, help="Random seed for scenario choice and arrivals")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    parser.add_argument("--user-pool", type=int, default=0,
+                        help="Pre-authenticate this many users and share them across virtual users")
+    add_governor_args(parser)
+    parser.set_defaults(max_retries=0)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Open-loop load generation for the Tribe AI API")
+    add_load_args(parser)
+    return parser.parse_args(argv)
+
+def main():
+    """Run a load test from the command line"""
+    args = parse_args()
+    profile = LoadProfile(args.rate, args.ramp_up, args.steady, args.ramp_down, args.arrival)
+    engine = AsyncClientEngine().start() if args.engine == "async" else None
+    auth_pool = None
+    if args.user_pool:
+        auth_pool = AuthPool(args.base_url or BASE_URL, args.user_pool, TEST_USER_PASSWORD).prepare()
+        print(f"🔑 {args.user_pool} users authenticated")
+    try:
+        generator = LoadGenerator(args.scenario or ["chat_export"], profile,
+                                  max_vus=args.max_vus, engine=engine, seed=args.seed,
+                                  base_url=args.base_url, auth_pool=auth_pool, governor=governor_from_args(args),
+                                  scenario_file=workload_from_args(args))
+        print(f"🚀 Load test: {args.rate}/s for {profile.duration:.0f}s, {describe_workload(args)}")
+        print_report(generator.run())
+        if generator.governor is not None:
+            print_governor_report(generator.governor.report())
+    finally:
+        if engine is not None:
+            engine.close()
+        if auth_pool is not None:
+            auth_pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Multi-process load generation for the Tribe AI Platform
+Splits a load profile across worker processes and merges their metric deltas into one live view
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import traceback
+from typing import Dict, Any, Optional, List, Callable
+
+from async_engine import AsyncClientEngine
+from auth_session import AuthPool
+from backend_test import BASE_URL, TEST_USER_PASSWORD
+from latency_histogram import HdrHistogram
+from load_generator import (LoadGenerator, LoadMetrics, LoadProfile, add_load_args, describe_workload, print_report,
+                            workload_from_args)
+from rate_governor import RateGovernor, governor_from_args, print_governor_report
+
+DEFAULT_INTERVAL = 5.0
+# Seconds a worker may take to import, authenticate its users and report ready
+DEFAULT_READY_TIMEOUT = 120.0
+
+def share(total: float, workers: int) -> float:
+    """One worker's share of a rate or pool size"""
+    return total / workers
+
+def scale_governor(governor: Optional[RateGovernor], workers: int) -> Optional[RateGovernor]:
+    """Split client-side rate limits evenly so all workers together honour the configured rates"""
+    if governor is None:
+        return None
+    if governor.rate:
+        governor.rate = share(governor.rate, workers)
+    if governor.burst:
+        governor.burst = max(1.0, share(governor.burst, workers))
+    governor.endpoint_rates = {key: share(rate, workers) for key, rate in governor.endpoint_rates.items()}
+    return governor
+
+def merge_governor_reports(reports: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    """Sum per-endpoint retry counts and waits across workers; limits are summed as total concurrency"""
+    merged: Dict[str, Dict[str, float]] = {}
+    for report in reports:
+        for key, stats in report.items():
+            target = merged.setdefault(key, {})
+            for name, value in stats.items():
+                target[name] = target.get(name, 0) + value
+    return dict(sorted(merged.items()))
+
+# ============= Worker process =============
+
+def run_worker(index: int, workers: int, args: argparse.Namespace, start, stop, messages):
+    """Run worker ``index``'s share of the profile and send metric deltas to ``messages``.
+
+    Messages are (kind, worker index, payload) tuples: ``ready``, ``metrics`` with a
+    LoadMetrics.snapshot(reset=True) delta, ``done`` with the last delta plus the
+    worker's governor report and CPU time, or ``error`` with a traceback.
+    """
+    engine = auth_pool = None
+    try:
+        engine = AsyncClientEngine().start() if args.engine == "async" else None
+        if args.user_pool:
+            auth_pool = AuthPool(args.base_url or BASE_URL, math.ceil(share(args.user_pool, workers)),
+                                 TEST_USER_PASSWORD,
+                                 email_template=f"loadtest.worker{index}.user{{index}}@tribeai.com",
+                                 name_template=f"Load Worker {index} User {{index}}").prepare()
+        profile = LoadProfile(share(args.rate, workers), args.ramp_up, args.steady, args.ramp_down, args.arrival)
+        metrics = LoadMetrics()
+        generator = LoadGenerator(args.scenario or ["chat_export"], profile,
+                                  max_vus=max(1, math.ceil(share(args.max_vus, workers))), engine=engine,
+                                  seed=args.seed + index if args.seed is not None else None,
+                                  base_url=args.base_url, auth_pool=auth_pool, metrics=metrics,
+                                  governor=scale_governor(governor_from_args(args), workers),
+                                  scenario_file=workload_from_args(args))
+        messages.put(("ready", index, None))
+        start.wait()
+        if stop.is_set():
+            generator.stopped.set()
+        threading.Thread(target=lambda: stop.wait() and generator.stopped.set(), daemon=True).start()
+        if args.arrival == "constant":
+            # Stagger evenly spaced arrivals so the workers interleave instead of firing together
+            generator.stopped.wait(index / args.rate)
+        runner = threading.Thread(target=generator.run, name="tribe-load")
+        runner.start()
+        while runner.is_alive():
+            runner.join(args.interval)
+            messages.put(("metrics", index, metrics.snapshot(reset=True)))
+        messages.put(("done", index, {
+            "metrics": metrics.snapshot(reset=True),
+            "governor": generator.governor.report() if generator.governor is not None else {},
+            "cpu_s": time.process_time(),
+        }))
+    except Exception:
+        messages.put(("error", index, traceback.format_exc()))
+    finally:
+        if engine is not None:
+            engine.close()
+        if auth_pool is not None:
+            auth_pool.close()
+
+def worker_process(*args):
+    """multiprocessing target for run_worker"""
+    # Ctrl-C reaches every process in the group; the coordinator decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_worker(*args)
+
+# ============= Coordinator =============
+
+class LoadCoordinator:
+    """Starts worker processes behind a common start signal and merges what they send.
+
+    Every delta is folded into the run totals and into the current interval, which
+    is printed as one live line per interval.
+    """
+
+    def __init__(self, args: argparse.Namespace, workers: int):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.args = args
+        self.workers = workers
+        self.metrics = LoadMetrics()
+        self.interval = LoadMetrics()
+        self.governor_reports: List[Dict[str, Dict[str, float]]] = []
+        self.cpu: Dict[int, float] = {}
+        self.requests: Dict[int, int] = {}
+        self.errors: Dict[int, str] = {}
+
+    def _merge(self, index: int, snapshot: Dict[str, Any]):
+        self.metrics.merge_snapshot(snapshot)
+        self.interval.merge_snapshot(snapshot)
+        count = sum(sum(c for _, c in data["counts"]) for data in snapshot["endpoints"].values())
+        self.requests[index] = self.requests.get(index, 0) + count
+
+    def _print_interval(self, elapsed: float, seconds: float, active: int):
+        """One live line for the interval that just ended"""
+        window, self.interval = self.interval, LoadMetrics()
+        combined = HdrHistogram()
+        for key in window.endpoints.summary():
+            combined.merge(window.endpoints.get(key))
+        summary = combined.summary_ms()
+        errors = sum(window.errors.values())
+        print(f"[{elapsed:>7.1f}s] {active:>3} workers  {summary['count'] / seconds if seconds else 0.0:>8.1f} req/s  "
+              f"p50 {summary['p50_ms']:>7.1f}ms  p99 {summary['p99_ms']:>7.1f}ms  errors {errors}")
+
+    def _wait_ready(self, messages):
+        """Block until every worker has its clients and users ready"""
+        ready = set()
+        deadline = time.monotonic() + DEFAULT_READY_TIMEOUT
+        while len(ready) + len(self.errors) < self.workers:
+            try:
+                kind, index, payload = messages.get(timeout=max(0.1, deadline - time.monotonic()))
+            except queue.Empty:
+                raise RuntimeError(f"Only {len(ready)} of {self.workers} workers ready after {DEFAULT_READY_TIMEOUT:.0f}s")
+            if kind == "error":
+                self.errors[index] = payload
+            else:
+                ready.add(index)
+        if self.errors:
+            index = min(self.errors)
+            raise RuntimeError(f"Worker {index} failed to start:\n{self.errors[index]}")
+
+    def collect(self, messages, start: Callable[[], None], stop: Callable[[], None]) -> float:
+        """Wait until every worker is ready, release them together and merge their
+        deltas until all are done; returns seconds since the start signal"""
+        pending = set(range(self.workers))
+        try:
+            self._wait_ready(messages)
+            start()
+            started = last_print = time.perf_counter()
+            while pending:
+                try:
+                    kind, index, payload = messages.get(timeout=self.args.interval)
+                except queue.Empty:
+                    kind = None
+                except KeyboardInterrupt:
+                    print("\n⏹️  Stopping workers; users already started will finish")
+                    stop()
+                    continue
+                if kind == "metrics":
+                    self._merge(index, payload)
+                elif kind == "done":
+                    self._merge(index, payload["metrics"])
+                    self.governor_reports.append(payload["governor"])
+                    self.cpu[index] = payload["cpu_s"]
+                    pending.discard(index)
+                elif kind == "error":
+                    self.errors[index] = payload
+                    pending.discard(index)
+                now = time.perf_counter()
+                if now - last_print >= self.args.interval:
+                    self._print_interval(now - started, now - last_print, len(pending))
+                    last_print = now
+            return time.perf_counter() - started
+        finally:
+            if pending:
+                stop()
+
+    def run(self) -> Dict[str, Any]:
+        """Run every worker process to completion (or until interrupted) and return the merged report"""
+        messages = multiprocessing.Queue()
+        start, stop = multiprocessing.Event(), multiprocessing.Event()
+        processes = [multiprocessing.Process(target=worker_process, name=f"tribe-load-{index}",
+                                             args=(index, self.workers, self.args, start, stop, messages))
+                     for index in range(self.workers)]
+        for process in processes:
+            process.start()
+        try:
+            elapsed = self.collect(messages, start.set, stop.set)
+        finally:
+            start.set()
+            # Keep draining so no worker blocks on a full pipe while we wait for it
+            while any(process.is_alive() for process in processes):
+                try:
+                    messages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            for process in processes:
+                process.join()
+        return self.metrics.report(elapsed)
+
+def print_workers(coordinator: LoadCoordinator, elapsed: float, names: Optional[List[str]] = None):
+    """Per-worker request counts and CPU use; a worker near 100% CPU is the bottleneck"""
+    names = names or [f"worker {index}" for index in range(coordinator.workers)]
+    print(f"\n⚙️  Workers ({os.cpu_count()} local cores)")
+    print(f"{'':<24} {'requests':>9} {'req/s':>9} {'cpu':>7}")
+    for index, name in enumerate(names):
+        if index in coordinator.errors:
+            print(f"{name:<24} failed: {coordinator.errors[index].strip().splitlines()[-1]}")
+            continue
+        requests_sent = coordinator.requests.get(index, 0)
+        cpu = coordinator.cpu.get(index, 0.0) / elapsed * 100 if elapsed else 0.0
+        print(f"{name:<24} {requests_sent:>9} {requests_sent / elapsed if elapsed else 0.0:>9.1f} {cpu:>6.0f}%")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Multi-process open-loop load generation for the Tribe AI API")
+    add_load_args(parser)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes; --rate, --max-vus, --user-pool and rate limits are split across them")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between metric deltas and live lines")
+    return parser.parse_args(argv)
+
+def main():
+    """Run a multi-process load test from the command line"""
+    args = parse_args()
+    coordinator = LoadCoordinator(args, args.workers)
+    print(f"🚀 Load test: {args.rate}/s across {args.workers} workers for "
+          f"{args.ramp_up + args.steady + args.ramp_down:.0f}s, {describe_workload(args)}")
+    report = coordinator.run()
+    print_report(report)
+    print_workers(coordinator, report["elapsed_s"])
+    if coordinator.governor_reports:
+        print_governor_report(merge_governor_reports(coordinator.governor_reports))
+    exit(1 if coordinator.errors else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Streaming multipart/form-data bodies for the Tribe AI test harness
+Sends files from disk or a generator in fixed-size chunks with an exact Content-Length, never building the body in memory
+"""
+
+import os
+import random
+import time
+import uuid
+from typing import Dict, Any, Optional, Iterator, Iterable, Callable, Union
+
+CHUNK_SIZE = 65536
+MIB = 1 << 20
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+# A file part's source: a path, a binary file object, bytes, a callable returning an
+# iterable of byte chunks (called again for every attempt) or a one-shot iterable
+Source = Union[str, bytes, Any, Callable[[], Iterable[bytes]], Iterable[bytes]]
+
+class FilePart:
+    """One file field of a streamed multipart body.
+
+    Paths, file objects and bytes know their size; generators must declare it, since
+    the Content-Length goes out before the first byte. ``size`` on a path or file object
+    sends only that many bytes from its start.
+    """
+
+    def __init__(self, source: Source, filename: Optional[str] = None,
+                 content_type: str = DEFAULT_CONTENT_TYPE, size: Optional[int] = None):
+        self.source = source
+        self.content_type = content_type
+        self._used = False
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            available = len(source)
+        elif isinstance(source, str):
+            available = os.path.getsize(source)
+            filename = filename or os.path.basename(source)
+        elif hasattr(source, "read"):
+            self._offset = source.tell()
+            available = source.seek(0, os.SEEK_END) - self._offset
+            source.seek(self._offset)
+            filename = filename or os.path.basename(getattr(source, "name", "") or "") or None
+        elif size is None:
+            raise ValueError("A generator file part needs a declared size")
+        else:
+            available = size
+        if size is not None and size > available:
+            raise ValueError(f"size {size} is larger than the {available} bytes available")
+        self.size = available if size is None else size
+        self.filename = filename or "upload.bin"
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """The part's bytes, at most ``chunk_size`` at a time"""
+        source = self.source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source)[:self.size]
+            for offset in range(0, self.size, chunk_size):
+                yield view[offset:offset + chunk_size]
+            return
+        if isinstance(source, str) or hasattr(source, "read"):
+            f = open(source, "rb") if isinstance(source, str) else source
+            try:
+                if f is source:
+                    f.seek(self._offset)
+                remaining = self.size
+                while remaining:
+                    chunk = f.read(min(chunk_size, remaining))
+                    if not chunk:
+                        raise ValueError(f"{self.filename} ended {remaining} bytes short of its declared size")
+                    remaining -= len(chunk)
+                    yield chunk
+            finally:
+                if f is not source:
+                    f.close()
+            return
+        if callable(source):
+            source = source()
+        elif self._used:
+            raise ValueError(f"{self.filename} is a one-shot generator and was already sent; pass a callable to resend")
+        self._used = True
+        sent = 0
+        for chunk in source:
+            sent += len(chunk)
+            if sent > self.size:
+                raise ValueError(f"{self.filename} produced more than its declared {self.size} bytes")
+            # Re-slice oversized chunks so nothing larger than chunk_size is held for the socket
+            for offset in range(0, len(chunk), chunk_size):
+                yield chunk[offset:offset + chunk_size]
+        if sent != self.size:
+            raise ValueError(f"{self.filename} produced {sent} bytes, {self.size} were declared")
+
+def as_file_part(value: Any) -> FilePart:
+    """A FilePart from what requests accepts in ``files``: a source or a (filename, source[, content_type]) tuple"""
+    if isinstance(value, FilePart):
+        return value
+    if isinstance(value, tuple):
+        return FilePart(value[1], value[0], *value[2:3])
+    return FilePart(value)
+
+class MultipartEncoder:
+    """A multipart/form-data body that requests sends chunk by chunk.
+
+    Pass it as ``data=`` with ``content_type`` as the Content-Type header; its length
+    becomes the Content-Length, so the upload is not chunk-encoded. Every iteration is a
+    fresh pass over the parts, which lets retries resend it, and restarts the upload
+    timing: ``started``/``finished`` bracket the last pass, from its first chunk handed
+    to the socket to the end of the body.
+    """
+
+    def __init__(self, fields: Optional[Dict[str, Any]] = None, files: Optional[Dict[str, Any]] = None,
+                 boundary: Optional[str] = None, chunk_size: int = CHUNK_SIZE):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._parts = []
+        for name, value in (fields or {}).items():
+            if isinstance(value, (bytes, bytearray)):
+                value = bytes(value)
+            else:
+                value = str(value).encode("utf-8")
+            self._parts.append((self._head(name), value))
+        for name, value in (files or {}).items():
+            part = as_file_part(value)
+            self._parts.append((self._head(name, part.filename, part.content_type), part))
+        self._tail = f"--{self.boundary}--\r\n".encode("ascii")
+        self.length = sum(len(head) + (len(body) if isinstance(body, bytes) else body.size) + 2
+                          for head, body in self._parts) + len(self._tail)
+        self.bytes_sent = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def _head(self, name: str, filename: Optional[str] = None, content_type: Optional[str] = None) -> bytes:
+        quote = lambda value: value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
+        disposition = f'form-data; name="{quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{quote(filename)}"'
+        head = f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n"
+        if content_type:
+            head += f"Content-Type: {content_type}\r\n"
+        return (head + "\r\n").encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def file_bytes(self) -> int:
+        return sum(body.size for _, body in self._parts if isinstance(body, FilePart))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.bytes_sent = 0
+        self.started = self.finished = None
+        for chunk in self._chunks():
+            if self.started is None:
+                self.started = time.perf_counter()
+            self.bytes_sent += len(chunk)
+            yield chunk
+        self.finished = time.perf_counter()
+
+    def _chunks(self) -> Iterator[bytes]:
+        for head, body in self._parts:
+            if isinstance(body, bytes):
+                yield head + body + b"\r\n"
+                continue
+            yield head
+            yield from body.chunks(self.chunk_size)
+            yield b"\r\n"
+        yield self._tail
+
+    @property
+    def upload_seconds(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def throughput_mib_s(self) -> Optional[float]:
+        """Body MiB per second over the last completed pass"""
+        seconds = self.upload_seconds
+        if not seconds:
+            return None
+        return self.bytes_sent / seconds / MIB
+
+def generated_source(size: int, chunk_size: int = CHUNK_SIZE, seed: int = 0) -> Callable[[], Iterator[bytes]]:
+    """A repeatable generator of ``size`` pseudo-random bytes, for uploads that need no file on disk.
+
+    One random block is reused for every chunk, so producing gigabytes costs no memory
+    and almost no CPU; the data is incompressible at any scale a proxy would look at.
+    """
+    block = random.Random(seed).randbytes(chunk_size)
+
+    def chunks() -> Iterator[bytes]:
+        view = memoryview(block)
+        for offset in range(0, size, chunk_size):
+            yield view[:min(chunk_size, size - offset)]
+
+    return chunks
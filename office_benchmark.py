@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for Tribe Office document generation
+Sweeps Word paragraphs, Excel cells and PowerPoint slides and fits latency against input size
+"""
+
+import argparse
+import json
+import math
+import os
+import tempfile
+import time
+from typing import Dict, Any, Optional, List, Callable
+
+from auth_session import get_auth_session
+from backend_test import BASE_URL, TEST_USER_EMAIL, TEST_USER_NAME, TEST_USER_PASSWORD, TribeAITester
+from scaling import describe_fit, fit_marginal_power_law, median
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+EXCEL_COLUMNS = 10
+
+def word_payload(paragraphs: int) -> Dict[str, Any]:
+    return {
+        "title": f"Benchmark Document {paragraphs}",
+        "heading": "Introduction",
+        "paragraphs": [f"Paragraph {i + 1}: This is benchmark content for scaling the Word generator "
+                       f"with realistic sentence length and punctuation." for i in range(paragraphs)],
+    }
+
+def excel_payload(cells: int) -> Dict[str, Any]:
+    rows = max(1, math.ceil(cells / EXCEL_COLUMNS))
+    return {
+        "filename": f"benchmark_{cells}",
+        "sheet_name": "Benchmark",
+        "headers": [f"Column {c + 1}" for c in range(EXCEL_COLUMNS)],
+        "data": [[f"R{r}" if c == 0 else r * EXCEL_COLUMNS + c for c in range(EXCEL_COLUMNS)] for r in range(rows)],
+    }
+
+def powerpoint_payload(slides: int) -> Dict[str, Any]:
+    return {
+        "title": f"Benchmark Presentation {slides}",
+        "slides": [{"type": "title" if i == 0 else "bullet", "title": f"Slide {i + 1}",
+                    "content": ["First important point", "Second key insight", "Third valuable information"]}
+                   for i in range(slides)],
+    }
+
+# name -> endpoint, expected content type, input unit, sizes swept, payload builder and
+# the units a payload actually holds (Excel rounds up to whole rows)
+DOCUMENTS: Dict[str, Dict[str, Any]] = {
+    "word": {"endpoint": "/office/word/create", "content_type": "officedocument.wordprocessingml.document",
+             "unit": "paragraphs", "sizes": [3, 100, 1000, 10000], "payload": word_payload,
+             "count": lambda payload: len(payload["paragraphs"])},
+    "excel": {"endpoint": "/office/excel/create", "content_type": "spreadsheetml.sheet",
+              "unit": "cells", "sizes": [12, 1000, 100000, 1000000], "payload": excel_payload,
+              "count": lambda payload: len(payload["data"]) * len(payload["headers"])},
+    "powerpoint": {"endpoint": "/office/powerpoint/create", "content_type": "presentationml.presentation",
+                   "unit": "slides", "sizes": [3, 50, 200, 500], "payload": powerpoint_payload,
+                   "count": lambda payload: len(payload["slides"])},
+}
+
+def download_to_disk(response, path: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Dict[str, float]:
+    """Write a streamed body to ``path`` chunk by chunk; returns bytes and first-chunk time"""
+    written = 0
+    first_chunk = None
+    try:
+        with open(path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter()
+                f.write(chunk)
+                written += len(chunk)
+    finally:
+        response.close()
+    return {"bytes": written, "first_chunk": first_chunk}
+
+class OfficeBenchmark:
+    """Runs the size sweep for each document type and fits latency against size"""
+
+    def __init__(self, tester: TribeAITester, directory: str, repeat: int = 3):
+        self.tester = tester
+        self.directory = directory
+        self.repeat = repeat
+
+    def run_point(self, name: str, size: int) -> Dict[str, Any]:
+        """Generate one document of ``size`` units ``repeat`` times and keep medians.
+
+        The point's ``size`` is the units actually sent; ``requested_size`` is ``size``.
+        """
+        document = DOCUMENTS[name]
+        payload = document["payload"](size)
+        requested, size = size, document["count"](payload)
+        request_bytes = len(json.dumps(payload))
+        samples = []
+        for attempt in range(self.repeat):
+            started = time.perf_counter()
+            response = self.tester.make_request("POST", document["endpoint"], payload, stream=True)
+            headers_at = time.perf_counter()
+            content_type = response.headers.get("content-type", "")
+            if response.status_code != 200 or document["content_type"] not in content_type:
+                response.close()
+                return {"document": name, "size": size, "requested_size": requested, "success": False,
+                        "status_code": response.status_code, "content_type": content_type}
+            path = os.path.join(self.directory, f"{name}_{size}_{attempt}.bin")
+            download = download_to_disk(response, path)
+            finished = time.perf_counter()
+            os.remove(path)
+            samples.append({"ttfb_s": headers_at - started, "total_s": finished - started,
+                            "transfer_s": finished - (download["first_chunk"] or finished),
+                            "bytes": download["bytes"]})
+        total = median([s["total_s"] for s in samples])
+        response_bytes = int(median([s["bytes"] for s in samples]))
+        return {
+            "document": name, "size": size, "requested_size": requested, "unit": document["unit"], "success": True,
+            "request_bytes": request_bytes, "response_bytes": response_bytes,
+            "ttfb_s": median([s["ttfb_s"] for s in samples]), "total_s": total,
+            "transfer_s": median([s["transfer_s"] for s in samples]),
+            "items_per_s": size / total if total else 0.0,
+            "bytes_per_s": response_bytes / total if total else 0.0,
+        }
+
+    def run(self, names: List[str], sizes: Optional[Dict[str, List[int]]] = None,
+            on_point: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Sweep every document type and fit latency and output size against input size.
+
+        ``sizes`` overrides a type's default sweep; types it leaves no sizes for are skipped.
+        """
+        report = {}
+        for name in names:
+            swept = DOCUMENTS[name]["sizes"] if sizes is None or name not in sizes else sizes[name]
+            if not swept:
+                continue
+            points = []
+            for size in swept:
+                point = self.run_point(name, size)
+                points.append(point)
+                if on_point:
+                    on_point(point)
+                if not point["success"]:
+                    break
+            ok = [p for p in points if p["success"]]
+            report[name] = {
+                "points": points,
+                "latency_fit": fit_marginal_power_law([p["size"] for p in ok], [p["total_s"] for p in ok]),
+                "bytes_fit": fit_marginal_power_law([p["size"] for p in ok], [p["response_bytes"] for p in ok]),
+            }
+        return report
+
+def print_point(point: Dict[str, Any]):
+    if not point["success"]:
+        print(f"❌ {point['document']} {point['size']}: HTTP {point['status_code']} ({point['content_type']})")
+        return
+    print(f"✅ {point['document']:<10} {point['size']:>8} {point['unit']:<10} "
+          f"req {point['request_bytes'] / 1024:>9.1f} KiB  resp {point['response_bytes'] / 1024:>9.1f} KiB  "
+          f"ttfb {point['ttfb_s'] * 1000:>8.1f}ms  total {point['total_s'] * 1000:>8.1f}ms  "
+          f"{point['items_per_s']:>10.1f} {point['unit']}/s  {point['bytes_per_s'] / 1024:>8.1f} KiB/s")
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print("📊 OFFICE SCALING SUMMARY")
+    print("=" * 80)
+    for name, result in report.items():
+        print(describe_fit(f"{name} latency", result["latency_fit"]))
+        print(describe_fit(f"{name} output bytes", result["bytes_fit"]))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Tribe Office document generation scaling benchmark")
+    parser.add_argument("--document", action="append", choices=sorted(DOCUMENTS),
+                        help="Document type to sweep (repeatable); defaults to all")
+    parser.add_argument("--max-size", type=int, help="Skip sizes above this many units")
+    parser.add_argument("--repeat", type=int, default=3, help="Requests per size; medians are reported")
+    parser.add_argument("--output-dir", help="Directory for streamed downloads (defaults to a temp dir)")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Run the sweep and print per-size results and growth fits"""
+    args = parse_args()
+    base_url = args.base_url or BASE_URL
+    auth = get_auth_session(base_url, TEST_USER_EMAIL, TEST_USER_PASSWORD, name=TEST_USER_NAME)
+    tester = TribeAITester(verbose=False, base_url=base_url, auth=auth)
+    names = args.document or list(DOCUMENTS)
+    sizes = None
+    if args.max_size:
+        sizes = {name: [s for s in DOCUMENTS[name]["sizes"] if s <= args.max_size] for name in names}
+        for name in names:
+            if not sizes[name]:
+                print(f"⚠️  Skipping {name}: no sizes up to {args.max_size} {DOCUMENTS[name]['unit']} "
+                      f"(smallest is {min(DOCUMENTS[name]['sizes'])})")
+    with tempfile.TemporaryDirectory(dir=args.output_dir) as directory:
+        report = OfficeBenchmark(tester, directory, repeat=args.repeat).run(names, sizes, on_point=print_point)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Client-side rate governor for the Tribe AI test harness
+Per-endpoint token buckets, Retry-After aware jittered backoff and adaptive concurrency limits
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+RETRY_STATUSES = (429, 502, 503, 504)
+# A request turned away with these was not processed, so it is retried whatever its method;
+# other retry statuses and errors may follow partial work, so only idempotent methods retry them
+REJECTED_STATUSES = (429, 503)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Statuses that mean "slow down" to the adaptive limit, in addition to RETRY_STATUSES
+OVERLOAD_STATUSES = (429, 503)
+DEFAULT_INITIAL_LIMIT = 16
+DEFAULT_MAX_LIMIT = 256
+# Latency above this multiple of the best recent latency counts as queueing
+DEFAULT_LATENCY_TOLERANCE = 2.0
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    return max(0.0, when.timestamp() - now)
+
+class TokenBucket:
+    """Blocking token bucket; ``hold`` pauses every caller until a Retry-After passes"""
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.held_until = 0.0
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is free and return 0, otherwise the seconds until one may be"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self.held_until - now
+            if delay <= 0 and self.rate:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return 0.0
+                delay = (1 - self.tokens) / self.rate
+            return max(0.0, delay)
+
+    def acquire(self) -> float:
+        """Take one token, sleeping as needed; returns seconds waited"""
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def aacquire(self) -> float:
+        """acquire() for coroutines: waits without blocking the event loop"""
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def hold(self, seconds: float):
+        """Stop handing out tokens for ``seconds``"""
+        with self._lock:
+            self.held_until = max(self.held_until, time.monotonic() + seconds)
+
+class AdaptiveLimit:
+    """AIMD concurrency limit: grows by one per ``limit`` good responses and shrinks
+    multiplicatively on overload statuses or when smoothed latency rises far above the best seen"""
+
+    def __init__(self, initial: int = DEFAULT_INITIAL_LIMIT, minimum: int = 1, maximum: int = DEFAULT_MAX_LIMIT,
+                 backoff: float = 0.7, tolerance: float = DEFAULT_LATENCY_TOLERANCE, cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.cooldown = cooldown
+        self.inflight = 0
+        self.best: Optional[float] = None
+        self.smoothed: Optional[float] = None
+        self.last_decrease = 0.0
+        self.decreases = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a free slot; returns seconds waited"""
+        started = time.monotonic()
+        with self._condition:
+            while self.inflight >= int(self.limit):
+                self._condition.wait()
+            self.inflight += 1
+        return time.monotonic() - started
+
+    async def aacquire(self, poll: float = 0.005) -> float:
+        """acquire() for coroutines; polls for a free slot instead of blocking the event loop"""
+        started = time.monotonic()
+        while True:
+            with self._condition:
+                if self.inflight < int(self.limit):
+                    self.inflight += 1
+                    return time.monotonic() - started
+            await asyncio.sleep(poll)
+
+    def release(self, latency: Optional[float], overloaded: bool):
+        with self._condition:
+            self.inflight -= 1
+            if latency is not None and not overloaded:
+                # Let the best latency creep up so a permanently slower backend becomes the new normal
+                self.best = latency if self.best is None else min(latency, self.best * 1.01)
+                self.smoothed = latency if self.smoothed is None else 0.8 * self.smoothed + 0.2 * latency
+                overloaded = self.smoothed > self.tolerance * self.best
+            now = time.monotonic()
+            if overloaded:
+                if now - self.last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self.last_decrease = now
+                    self.decreases += 1
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+class RateGovernor:
+    """Wraps each HTTP attempt with rate limiting, retries and adaptive concurrency.
+
+    ``execute`` returns the final attempt only, with its own service time, so latency
+    histograms never include backoff sleeps or throttled attempts. Retried attempts,
+    throttles and time spent waiting are counted per endpoint in ``report()``.
+    Keys are "METHOD /endpoint"; a POST is only retried on 429/503 unless ``retry_unsafe``,
+    since a 502/504 or dropped connection may come after the server started the work.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                 endpoint_rates: Optional[Dict[str, float]] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_backoff: float = DEFAULT_BASE_BACKOFF, max_backoff: float = DEFAULT_MAX_BACKOFF,
+                 retry_statuses: Tuple[int, ...] = RETRY_STATUSES, retry_errors: Tuple[type, ...] = (),
+                 retry_unsafe: bool = False, adaptive: bool = False, initial_limit: int = DEFAULT_INITIAL_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT, seed: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst
+        # Per-endpoint overrides keyed "METHOD /endpoint"
+        self.endpoint_rates = endpoint_rates or {}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.retry_errors = retry_errors
+        self.retry_unsafe = retry_unsafe
+        self.adaptive = adaptive
+        self.initial_limit = initial_limit
+        self.max_limit = max_limit
+        self.rng = random.Random(seed)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.limits: Dict[str, AdaptiveLimit] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, key: str) -> Tuple[TokenBucket, Optional[AdaptiveLimit], Dict[str, float]]:
+        with self._lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(self.endpoint_rates.get(key, self.rate), self.burst)
+                if self.adaptive:
+                    self.limits[key] = AdaptiveLimit(self.initial_limit, maximum=self.max_limit)
+                self.stats[key] = {"calls": 0, "attempts": 0, "retries": 0, "throttled": 0, "errors_retried": 0,
+                                   "gave_up": 0, "backoff_s": 0.0, "queued_s": 0.0}
+            return self.buckets[key], self.limits.get(key), self.stats[key]
+
+    def backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Retry-After when the server gave one, otherwise full-jitter exponential backoff"""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        with self._lock:
+            return self.rng.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def retryable(self, key: str, status: Optional[int], error: Optional[BaseException]) -> bool:
+        """Whether an attempt that ended with ``status`` or ``error`` may be sent again"""
+        if status in self.retry_statuses and status in REJECTED_STATUSES:
+            return True
+        if status not in self.retry_statuses and not (error is not None and isinstance(error, self.retry_errors)):
+            return False
+        return self.retry_unsafe or key.split(" ", 1)[0].upper() in IDEMPOTENT_METHODS
+
+    @staticmethod
+    def _can_wait(remaining: Optional[Callable[[], Optional[float]]], delay: float) -> bool:
+        """Whether the caller has time left for a backoff of ``delay`` and another attempt"""
+        if remaining is None:
+            return True
+        try:
+            left = remaining()
+        except Exception:
+            return False
+        return left is None or delay < left
+
+    def execute(self, key: str, send: Callable[[], Any],
+                remaining: Optional[Callable[[], Optional[float]]] = None) -> Tuple[Any, Optional[BaseException], float]:
+        """Run ``send`` until it succeeds or retries run out; returns (response, error, elapsed)
+        of the final attempt. ``remaining()`` gives the caller's seconds left (None for no
+        limit) and may raise once it has stopped; it is asked before every backoff, and
+        retries end when the backoff would not leave time for another attempt."""
+        bucket, limit, stats = self._endpoint(key)
+        attempt = 0
+        while True:
+            queued = bucket.acquire() + (limit.acquire() if limit is not None else 0.0)
+            started = time.perf_counter()
+            response, error = None, None
+            try:
+                response = send()
+            except Exception as e:
+                error = e
+            finally:
+                # Hand the slot back even when send() is interrupted (KeyboardInterrupt, cancellation)
+                elapsed = time.perf_counter() - started
+                self._release(limit, response, error, elapsed)
+            delay = self._settle(key, bucket, stats, attempt, queued, response, error, elapsed, remaining)
+            if delay is None:
+                return response, error, elapsed
+            time.sleep(delay)
+            attempt += 1
+
+    async def aexecute(self, key: str, send: Callable[[], Awaitable[Any]],
+                       remaining: Optional[Callable[[], Optional[float]]] = None
+                       ) -> Tuple[Any, Optional[BaseException], float]:
+        """execute() for coroutines: ``send`` is awaited and every wait yields to the event loop"""
+        bucket, limit, stats = self._endpoint(key)
+        attempt = 0
+        while True:
+            queued = await bucket.aacquire() + (await limit.aacquire() if limit is not None else 0.0)
+            started = time.perf_counter()
+            response, error = None, None
+            try:
+                response = await send()
+            except Exception as e:
+                error = e
+            finally:
+                # Hand the slot back even when send() is interrupted (KeyboardInterrupt, cancellation)
+                elapsed = time.perf_counter() - started
+                self._release(limit, response, error, elapsed)
+            delay = self._settle(key, bucket, stats, attempt, queued, response, error, elapsed, remaining)
+            if delay is None:
+                return response, error, elapsed
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _release(limit: Optional[AdaptiveLimit], response: Any, error: Optional[BaseException], elapsed: float):
+        """Return an attempt's concurrency slot, with its latency and whether it signalled overload"""
+        if limit is None:
+            return
+        status = response.status_code if response is not None else None
+        limit.release(elapsed if status is not None and status < 500 else None,
+                      error is not None or status in OVERLOAD_STATUSES)
+
+    def _settle(self, key: str, bucket: TokenBucket, stats: Dict[str, float], attempt: int, queued: float,
+                response: Any, error: Optional[BaseException], elapsed: float,
+                remaining: Optional[Callable[[], Optional[float]]]) -> Optional[float]:
+        """Account for one attempt; returns the backoff before the next one, or None when done"""
+        status = response.status_code if response is not None else None
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        retryable = self.retryable(key, status, error)
+        delay = self.backoff(attempt, retry_after) if retryable and attempt < self.max_retries else 0.0
+        stop = attempt >= self.max_retries or (retryable and not self._can_wait(remaining, delay))
+        with self._lock:
+            stats["attempts"] += 1
+            stats["queued_s"] += queued
+            if status in OVERLOAD_STATUSES:
+                stats["throttled"] += 1
+            if not retryable or stop:
+                stats["calls"] += 1
+                if retryable:
+                    stats["gave_up"] += 1
+                return None
+            stats["retries"] += 1
+            if error is not None:
+                stats["errors_retried"] += 1
+            stats["backoff_s"] += delay
+        if retry_after is not None:
+            bucket.hold(min(retry_after, self.max_backoff))
+        # httpx responses from the async engine are read, and closed, already
+        if response is not None and not getattr(response, "is_closed", False):
+            response.close()
+        return delay
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint retry and throttle counts, waits, and current concurrency limits"""
+        with self._lock:
+            report = {key: dict(stats) for key, stats in sorted(self.stats.items())}
+        for key, limit in self.limits.items():
+            report[key]["limit"] = limit.limit
+            report[key]["limit_decreases"] = limit.decreases
+        return report
+
+def print_governor_report(report: Dict[str, Dict[str, float]]):
+    """Retry table; silent when nothing was retried or throttled"""
+    if not any(stats["retries"] or stats["throttled"] or stats["queued_s"] > 0.001 for stats in report.values()):
+        return
+    print("\n🚦 RETRIES AND THROTTLING (not included in latency)")
+    print(f"{'':<40} {'calls':>7} {'retries':>8} {'429/503':>8} {'gave up':>8} {'backoff':>9} {'queued':>9} {'limit':>6}")
+    for key, stats in report.items():
+        limit = f"{stats['limit']:>6.1f}" if "limit" in stats else f"{'-':>6}"
+        print(f"{key:<40} {stats['calls']:>7} {stats['retries']:>8} {stats['throttled']:>8} {stats['gave_up']:>8} "
+              f"{stats['backoff_s']:>8.2f}s {stats['queued_s']:>8.2f}s {limit}")
+
+def add_governor_args(parser: argparse.ArgumentParser):
+    """Rate governor options shared by the harness CLIs"""
+    parser.add_argument("--rate-limit", type=float, help="Requests/second allowed per endpoint (default: unlimited)")
+    parser.add_argument("--burst", type=float, help="Token bucket burst size (default: one second of --rate-limit)")
+    parser.add_argument("--endpoint-rate", action="append", default=[], metavar="'METHOD /path=RATE'",
+                        help="Per-endpoint rate override (repeatable)")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES,
+                        help="Retries for 429/503, and for 502/504 and connection errors on idempotent "
+                             "requests (0 disables)")
+    parser.add_argument("--retry-unsafe", action="store_true",
+                        help="Also retry POSTs on 502/504 and connection errors (may run the work twice)")
+    parser.add_argument("--max-backoff", type=float, default=DEFAULT_MAX_BACKOFF,
+                        help="Cap for backoff sleeps and Retry-After waits in seconds")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Adapt per-endpoint concurrency to errors and latency (AIMD)")
+
+def governor_from_args(args: argparse.Namespace, retry_errors: Tuple[type, ...] = ()) -> Optional[RateGovernor]:
+    """Build a governor from add_governor_args options, or None when it would do nothing"""
+    endpoint_rates = {}
+    for spec in args.endpoint_rate:
+        key, _, rate = spec.rpartition("=")
+        endpoint_rates[key.strip()] = float(rate)
+    if not (args.rate_limit or endpoint_rates or args.max_retries or args.adaptive):
+        return None
+    return RateGovernor(rate=args.rate_limit, burst=args.burst, endpoint_rates=endpoint_rates,
+                        max_retries=args.max_retries, max_backoff=args.max_backoff, retry_errors=retry_errors,
+                        retry_unsafe=args.retry_unsafe, adaptive=args.adaptive)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Per-phase request timing for the Tribe AI test harness
+Splits each request into DNS, connect, TLS, send, time to first byte and transfer, and notes connection reuse
+"""
+
+import socket
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from latency_histogram import LatencyRecorder
+
+PHASES = ("dns", "connect", "tls", "send", "ttfb", "transfer")
+
+# httpcore trace events (httpx) mapped to PhaseTrace marks; HTTP/1.1 and HTTP/2 share them
+HTTPCORE_MARKS = {
+    "connection.connect_tcp.started": "tcp_start",
+    "connection.connect_tcp.complete": "tcp_end",
+    "connection.start_tls.started": "tls_start",
+    "connection.start_tls.complete": "tls_end",
+    "send_request_headers.started": "send_start",
+    "send_request_body.complete": "send_end",
+    "receive_response_headers.complete": "headers",
+    "receive_response_body.complete": "body",
+}
+
+_local = threading.local()
+
+class PhaseTrace:
+    """Timestamps of one request attempt, filled in by the HTTP client as it goes"""
+
+    def __init__(self):
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        self.marks[name] = time.perf_counter()
+
+    async def httpcore_event(self, name: str, info: Dict[str, Any]):
+        """httpx ``trace`` extension callback"""
+        for suffix, mark in HTTPCORE_MARKS.items():
+            if name.endswith(suffix):
+                self.mark(mark)
+                return
+
+    @property
+    def reused(self) -> bool:
+        """No new TCP connection was opened for this request"""
+        return "tcp_start" not in self.marks
+
+    def phases(self) -> Dict[str, float]:
+        """Seconds per phase; phases that did not happen (or were not observed) are left out"""
+        marks = self.marks
+        phases = {}
+        for phase, start, end in (("dns", "dns_start", "dns_end"), ("connect", "tcp_start", "tcp_end"),
+                                  ("tls", "tls_start", "tls_end")):
+            if start in marks and end in marks:
+                phases[phase] = marks[end] - marks[start]
+        if "send_end" in marks:
+            # Plain HTTP connects lazily from inside the send; don't count that twice
+            ready = max(marks.get(name, 0.0) for name in ("send_start", "tcp_end", "tls_end"))
+            phases["send"] = max(0.0, marks["send_end"] - ready)
+            if "headers" in marks:
+                phases["ttfb"] = marks["headers"] - marks["send_end"]
+        if "headers" in marks and "body" in marks:
+            phases["transfer"] = marks["body"] - marks["headers"]
+        return phases
+
+def start_trace() -> PhaseTrace:
+    """Start tracing requests sent from this thread (the requests/urllib3 client)"""
+    trace = _local.trace = PhaseTrace()
+    return trace
+
+def stop_trace():
+    _local.trace = None
+
+def current_trace() -> Optional[PhaseTrace]:
+    return getattr(_local, "trace", None)
+
+# ============= requests / urllib3 instrumentation =============
+
+class TracedHTTPConnection(HTTPConnection):
+    """urllib3 connection that reports DNS, connect, send and first-byte times to the thread's trace"""
+
+    def _new_conn(self) -> socket.socket:
+        trace = current_trace()
+        if trace is None:
+            return super()._new_conn()
+        trace.mark("dns_start")
+        dns_host = self._dns_host
+        try:
+            # Resolve here, as create_connection would, so its own lookups are of literal addresses
+            addresses = [info[4][0] for info in socket.getaddrinfo(dns_host.strip("[]"), self.port,
+                                                                    allowed_gai_family(), socket.SOCK_STREAM)]
+        except (OSError, UnicodeError):
+            # Let urllib3 resolve again and raise its usual error
+            addresses = [dns_host]
+        trace.mark("dns_end")
+        trace.mark("tcp_start")
+        try:
+            # Fall back across the resolved addresses in order, as create_connection does
+            for address in addresses[:-1]:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    pass
+            self._dns_host = addresses[-1]
+            return super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+            trace.mark("tcp_end")
+
+    def request(self, *args, **kwargs):
+        trace = current_trace()
+        if trace is not None:
+            trace.mark("send_start")
+        super().request(*args, **kwargs)
+        if trace is not None:
+            trace.mark("send_end")
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        trace = current_trace()
+        if trace is not None:
+            trace.mark("headers")
+        return response
+
+class TracedHTTPSConnection(TracedHTTPConnection, HTTPSConnection):
+    """Adds the TLS handshake, timed from the end of the TCP connect"""
+
+    def connect(self):
+        super().connect()
+        trace = current_trace()
+        if trace is not None and "tcp_end" in trace.marks:
+            trace.marks["tls_start"] = trace.marks["tcp_end"]
+            trace.mark("tls_end")
+
+class TracedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TracedHTTPConnection
+
+class TracedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TracedHTTPSConnection
+
+class PhaseTimingAdapter(HTTPAdapter):
+    """Drop-in HTTPAdapter whose connections feed the thread's PhaseTrace; untraced
+    requests pay only a thread-local lookup"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TracedHTTPConnectionPool,
+                                                   "https": TracedHTTPSConnectionPool}
+
+# ============= Recording =============
+
+class PhaseRecorder:
+    """Per-endpoint phase histograms plus new vs. reused connection counts"""
+
+    def __init__(self):
+        self.histograms = {phase: LatencyRecorder() for phase in PHASES}
+        self.connections: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, trace: PhaseTrace):
+        for phase, seconds in trace.phases().items():
+            self.histograms[phase].record(key, seconds)
+        with self._lock:
+            counts = self.connections.setdefault(key, {"new": 0, "reused": 0})
+            counts["reused" if trace.reused else "new"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per endpoint: phase summaries in milliseconds and connection counts"""
+        with self._lock:
+            connections = {key: dict(counts) for key, counts in self.connections.items()}
+        summaries = {phase: recorder.summary() for phase, recorder in self.histograms.items()}
+        return {key: {"connections": counts,
+                      "phases": {phase: summaries[phase][key] for phase in PHASES if key in summaries[phase]}}
+                for key, counts in sorted(connections.items())}
+
+def print_phase_report(summary: Dict[str, Dict[str, Any]]):
+    """p50/p99 per phase and endpoint; DNS, connect and TLS only cover requests that opened a connection"""
+    if not summary:
+        return
+    print("\n🔬 REQUEST PHASES (p50/p99 ms)")
+    print(f"{'':<40} {'reused':>7} " + " ".join(f"{phase:^13}" for phase in PHASES))
+    for key, entry in summary.items():
+        counts = entry["connections"]
+        total = counts["new"] + counts["reused"]
+        cells = []
+        for phase in PHASES:
+            stats = entry["phases"].get(phase)
+            cells.append(f"{stats['p50_ms']:.1f}/{stats['p99_ms']:.1f}" if stats else "-")
+        print(f"{key:<40} {counts['reused'] / total * 100 if total else 0.0:>6.0f}% "
+              + " ".join(f"{cell:^13}" for cell in cells))
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Machine-readable run results for the Tribe AI test harness
+Saves runs as JSON/JSONL and compares a run against a baseline as a performance gate
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List
+
+from latency_histogram import HdrHistogram
+
+SCHEMA_VERSION = 1
+# Default gate: a p50/p99 must be this much slower, by at least this many ms, and
+# (with enough samples on both sides) significantly slower by a one-sided Mann-Whitney U test
+DEFAULT_RELATIVE = 0.10
+DEFAULT_ABSOLUTE_MS = 5.0
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_SAMPLES = 5
+# Below min_samples there is no significance test, so only much larger changes count
+FEW_SAMPLES_RELATIVE = 0.50
+FEW_SAMPLES_ABSOLUTE_MS = 20.0
+# Throughput is one number per run, so its gate compares the runs on each side: a drop
+# this large in the median rate that the per-run rates also show significantly (exact
+# one-sided Mann-Whitney). With too few runs for that test to reach alpha at all, only
+# a much larger drop counts
+DEFAULT_THROUGHPUT_DROP = 0.10
+FEW_RUNS_THROUGHPUT_DROP = 0.30
+# Above this many ways to split the pooled runs, the rank test uses the normal approximation
+EXACT_SPLITS = 20000
+
+def git_revision(directory: Optional[str] = None) -> Dict[str, Any]:
+    """Commit, branch and dirty flag of the checkout, or Nones outside git"""
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], cwd=directory, capture_output=True, text=True,
+                                  timeout=10, check=True).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"revision": git("rev-parse", "HEAD"), "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+            "dirty": bool(status) if status is not None else None}
+
+def environment(**extra) -> Dict[str, Any]:
+    """Where the run happened; ``extra`` adds harness settings such as engine and workers"""
+    return {"hostname": socket.gethostname(), "platform": platform.platform(),
+            "python": platform.python_version(), "argv": sys.argv, **extra}
+
+def build_run_record(tester, started_at: datetime, **settings) -> Dict[str, Any]:
+    """Structured record of a finished TribeAITester run"""
+    summaries = tester.latency.summary()
+    histograms = tester.latency.snapshot()
+    endpoints = {}
+    for key, summary in summaries.items():
+        endpoints[key] = {**summary, **tester.traffic.get(key, {}), "histogram": histograms[key]}
+    elapsed = tester.wall_clock or 0.0
+    requests_total = sum(traffic["requests"] for traffic in tester.traffic.values())
+    tests = {}
+    for name, result in tester.test_results.items():
+        tests[name] = {"success": result["success"], "message": result["message"],
+                       "status": result.get("status", "passed" if result["success"] else "failed"),
+                       "duration_s": result.get("duration_s"), "endpoints": sorted(result.get("latency") or {})}
+    passed = sum(1 for result in tests.values() if result["success"])
+    statuses = [result["status"] for result in tests.values()]
+    return {
+        "schema": SCHEMA_VERSION,
+        "run_id": str(uuid.uuid4()),
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": tester.base_url,
+        "environment": environment(**settings),
+        "git": git_revision(),
+        "summary": {"passed": passed, "failed": len(tests) - passed, "timed_out": statuses.count("timeout"),
+                    "cancelled": statuses.count("cancelled"), "skipped": statuses.count("skipped"),
+                    "elapsed_s": elapsed, "requests": requests_total, "throughput_rps": requests_total / elapsed if elapsed else 0.0},
+        "tests": tests,
+        "endpoints": endpoints,
+        "retries": tester.governor.report() if getattr(tester, "governor", None) is not None else {},
+        "phases": tester.phases.summary() if getattr(tester, "phases", None) is not None else {},
+    }
+
+def save_run(record: Dict[str, Any], path: str):
+    """Append to ``*.jsonl`` (one run per line) or overwrite a ``*.json`` file"""
+    if path.endswith(".jsonl"):
+        with open(path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    else:
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2)
+
+def load_runs(path: str) -> List[Dict[str, Any]]:
+    """Every run stored in a JSON or JSONL results file"""
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return [json.load(f)]
+
+def combine_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pool several runs into one: endpoint histograms merged, throughput as the median"""
+    histograms: Dict[str, HdrHistogram] = {}
+    for run in runs:
+        for key, endpoint in run["endpoints"].items():
+            incoming = HdrHistogram.from_dict(endpoint["histogram"])
+            if key in histograms:
+                histograms[key].merge(incoming)
+            else:
+                histograms[key] = incoming
+    rates = sorted(run["summary"]["throughput_rps"] for run in runs)
+    middle = len(rates) // 2
+    throughput = rates[middle] if len(rates) % 2 else (rates[middle - 1] + rates[middle]) / 2
+    return {"runs": len(runs), "histograms": histograms, "throughput_rps": throughput,
+            "throughput_runs": rates, "tests": runs[-1]["tests"], "git": runs[-1].get("git")}
+
+def mann_whitney_p(baseline: HdrHistogram, current: HdrHistogram) -> float:
+    """One-sided p-value that ``current`` tends to be slower than ``baseline``.
+
+    Ranks are computed over histogram buckets (values in one bucket are ties), with
+    the tie-corrected normal approximation.
+    """
+    n_a, n_b = baseline.total_count, current.total_count
+    n = n_a + n_b
+    if not n_a or not n_b or n < 3:
+        return 1.0
+    rank_sum_b = 0.0
+    ties = 0.0
+    seen = 0
+    for index in sorted(set(baseline.counts) | set(current.counts)):
+        a, b = baseline.counts.get(index, 0), current.counts.get(index, 0)
+        t = a + b
+        rank_sum_b += b * (seen + (t + 1) / 2.0)
+        ties += t ** 3 - t
+        seen += t
+    u_b = rank_sum_b - n_b * (n_b + 1) / 2.0
+    variance = n_a * n_b / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_b - n_a * n_b / 2.0 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def rank_sum_p(baseline: List[float], current: List[float]) -> float:
+    """One-sided Mann-Whitney p-value that ``current`` values tend to be lower than ``baseline``'s.
+
+    Exact (over every split of the pooled values, ties at mid-rank) for the handful of
+    runs a gate compares; the normal approximation beyond ``EXACT_SPLITS`` splits.
+    """
+    pooled = sorted(baseline + current)
+    first = {}
+    for index, value in enumerate(pooled):
+        first.setdefault(value, index)
+    # Mid-rank of each value: its tied run spans first[value] .. first[value] + count - 1
+    rank = {value: first[value] + (pooled.count(value) + 1) / 2.0 for value in first}
+    ranks = [rank[value] for value in baseline + current]
+    observed = sum(rank[value] for value in current)
+    n, n_b = len(ranks), len(current)
+    if not baseline or not current:
+        return 1.0
+    if math.comb(n, n_b) <= EXACT_SPLITS:
+        splits = [sum(split) for split in itertools.combinations(ranks, n_b)]
+        return sum(1 for total in splits if total <= observed + 1e-9) / len(splits)
+    mean = n_b * (n + 1) / 2.0
+    z = (observed - mean + 0.5) / math.sqrt((n - n_b) * n_b * (n + 1) / 12.0)
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+def compare_runs(baseline: Dict[str, Any], current: Dict[str, Any], relative: float = DEFAULT_RELATIVE,
+                 absolute_ms: float = DEFAULT_ABSOLUTE_MS, alpha: float = DEFAULT_ALPHA,
+                 min_samples: int = DEFAULT_MIN_SAMPLES, throughput_drop: float = DEFAULT_THROUGHPUT_DROP) -> Dict[str, Any]:
+    """Diff a combined current run against a combined baseline (see combine_runs).
+
+    Returns per-endpoint deltas plus the list of regressions that should fail the gate.
+    """
+    endpoints = {}
+    regressions = []
+    for key in sorted(set(baseline["histograms"]) | set(current["histograms"])):
+        before, after = baseline["histograms"].get(key), current["histograms"].get(key)
+        if before is None or after is None:
+            endpoints[key] = {"status": "new" if before is None else "missing"}
+            continue
+        enough = min(before.total_count, after.total_count) >= min_samples
+        p_value = mann_whitney_p(before, after) if enough else None
+        rel_limit, abs_limit = (relative, absolute_ms) if enough else (FEW_SAMPLES_RELATIVE, FEW_SAMPLES_ABSOLUTE_MS)
+        deltas = {}
+        regressed = []
+        for name, percentile in (("p50", 50.0), ("p99", 99.0)):
+            old = before.value_at_percentile(percentile) / 1000.0
+            new = after.value_at_percentile(percentile) / 1000.0
+            change = (new - old) / old if old else 0.0
+            deltas[name] = {"baseline_ms": old, "current_ms": new, "change": change}
+            if change > rel_limit and new - old > abs_limit and (p_value is None or p_value < alpha):
+                regressed.append(name)
+        endpoints[key] = {"status": "regressed" if regressed else "ok", "p_value": p_value,
+                          "samples": [before.total_count, after.total_count], **deltas}
+        if regressed:
+            changes = ", ".join("{} {baseline_ms:.1f}ms -> {current_ms:.1f}ms ({change:+.0%})".format(name, **deltas[name])
+                                for name in regressed)
+            evidence = f"p={p_value:.4f}" if p_value is not None else "few samples"
+            regressions.append(f"{key}: {changes} ({evidence})")
+
+    old_rate, new_rate = baseline["throughput_rps"], current["throughput_rps"]
+    old_runs, new_runs = baseline["throughput_runs"], current["throughput_runs"]
+    rate_change = (new_rate - old_rate) / old_rate if old_rate else 0.0
+    # The smallest p-value the exact test can give is one split in all of them
+    testable = 1.0 / math.comb(len(old_runs) + len(new_runs), len(new_runs)) < alpha
+    rate_p = rank_sum_p(old_runs, new_runs) if testable else None
+    drop_limit = throughput_drop if testable else FEW_RUNS_THROUGHPUT_DROP
+    if rate_change < -drop_limit and (rate_p is None or rate_p < alpha):
+        evidence = f"p={rate_p:.4f}" if rate_p is not None else f"{len(old_runs)} vs {len(new_runs)} runs"
+        regressions.append(f"throughput: {old_rate:.1f} -> {new_rate:.1f} req/s ({rate_change:+.0%}, {evidence})")
+
+    newly_failing = [name for name, test in current["tests"].items()
+                     if not test["success"] and baseline["tests"].get(name, {}).get("success")]
+    regressions.extend(f"{name}: passed in the baseline, fails now" for name in newly_failing)
+    return {"endpoints": endpoints, "throughput": {"baseline_rps": old_rate, "current_rps": new_rate,
+                                                   "change": rate_change, "p_value": rate_p,
+                                                   "runs": [len(old_runs), len(new_runs)]},
+            "newly_failing": newly_failing, "regressions": regressions}
+
+def print_comparison(comparison: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print("📊 BASELINE COMPARISON")
+    print("=" * 80)
+    print(f"{'':<40} {'base p50':>9} {'p50':>9} {'base p99':>9} {'p99':>9} {'p-value':>9}")
+    for key, result in comparison["endpoints"].items():
+        if result["status"] in ("new", "missing"):
+            print(f"➖ {key:<38} {result['status']}")
+            continue
+        marker = "⚠️ " if result["status"] == "regressed" else "✅"
+        p_value = f"{result['p_value']:.4f}" if result["p_value"] is not None else "n/a"
+        print(f"{marker} {key:<38} {result['p50']['baseline_ms']:>9.1f} {result['p50']['current_ms']:>9.1f} "
+              f"{result['p99']['baseline_ms']:>9.1f} {result['p99']['current_ms']:>9.1f} {p_value:>9}")
+    throughput = comparison["throughput"]
+    p_value = f"p={throughput['p_value']:.4f}" if throughput["p_value"] is not None else "too few runs to test"
+    print(f"\n🚀 Throughput: {throughput['baseline_rps']:.1f} -> {throughput['current_rps']:.1f} req/s "
+          f"({throughput['change']:+.0%}, median of {throughput['runs'][0]} vs {throughput['runs'][1]} runs, "
+          f"{p_value})")
+    if comparison["regressions"]:
+        print("\n🔍 PERFORMANCE REGRESSIONS:")
+        for regression in comparison["regressions"]:
+            print(f"   ⚠️  {regression}")
+    else:
+        print("\n✅ No significant performance regressions")
+
+def gate(baseline_path: str, current_runs: List[Dict[str, Any]], **thresholds) -> bool:
+    """Compare runs against the baseline file and print the result; True when the gate passes"""
+    comparison = compare_runs(combine_runs(load_runs(baseline_path)), combine_runs(current_runs), **thresholds)
+    print_comparison(comparison)
+    return not comparison["regressions"]
+
+def add_threshold_args(parser: argparse.ArgumentParser):
+    """Gate threshold options shared by this CLI and backend_test.py"""
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_RELATIVE,
+                        help="Relative p50/p99 slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_ABSOLUTE_MS,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help="Significance level for the Mann-Whitney test")
+    parser.add_argument("--min-samples", type=int, default=DEFAULT_MIN_SAMPLES,
+                        help="Samples per side needed before applying the significance test")
+    parser.add_argument("--max-throughput-drop", type=float, default=DEFAULT_THROUGHPUT_DROP,
+                        help="Relative drop in median throughput that counts as a regression, when the "
+                             "per-run rates also show it significantly")
+
+def thresholds_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    return {"relative": args.max_regression, "absolute_ms": args.min_delta_ms, "alpha": args.alpha,
+            "min_samples": args.min_samples, "throughput_drop": args.max_throughput_drop}
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Compare a saved run against a baseline")
+    parser.add_argument("baseline", help="Baseline results (.json, or .jsonl pooling every run in it)")
+    parser.add_argument("current", help="Current results (.json, or .jsonl; --last picks the newest runs)")
+    parser.add_argument("--last", type=int, help="Only use the last N runs of the current file")
+    parser.add_argument("--json", help="Write the comparison to this file")
+    add_threshold_args(parser)
+    return parser.parse_args(argv)
+
+def main():
+    """Exit 1 when the current run regressed against the baseline"""
+    args = parse_args()
+    current = load_runs(args.current)
+    if args.last:
+        current = current[-args.last:]
+    comparison = compare_runs(combine_runs(load_runs(args.baseline)), combine_runs(current),
+                              **thresholds_from_args(args))
+    print_comparison(comparison)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(comparison, f, indent=2)
+    exit(1 if comparison["regressions"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Scaling fits for Tribe AI benchmarks
+Fits cost = coefficient * size ** exponent to tell linear from superlinear growth
+"""
+
+import math
+from typing import Dict, List, Sequence
+
+# Exponents above this are reported as superlinear
+SUPERLINEAR_EXPONENT = 1.15
+SUBLINEAR_EXPONENT = 0.85
+
+def fit_power_law(sizes: Sequence[float], values: Sequence[float]) -> Dict[str, float]:
+    """Least-squares fit of log(value) = log(coefficient) + exponent * log(size)"""
+    points = [(math.log(x), math.log(y)) for x, y in zip(sizes, values) if x > 0 and y > 0]
+    if len(points) < 2:
+        return {"exponent": 0.0, "coefficient": 0.0, "r2": 0.0, "points": len(points)}
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    if sxx == 0:
+        return {"exponent": 0.0, "coefficient": math.exp(mean_y), "r2": 0.0, "points": n}
+    exponent = sxy / sxx
+    intercept = mean_y - exponent * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for _, y in points)
+    ss_res = sum((y - intercept - exponent * x) ** 2 for x, y in points)
+    return {"exponent": exponent, "coefficient": math.exp(intercept),
+            "r2": 1.0 - ss_res / ss_tot if ss_tot else 1.0, "points": n}
+
+def fit_marginal_power_law(sizes: Sequence[float], values: Sequence[float]) -> Dict[str, float]:
+    """Power-law fit of the cost above the smallest size's, so fixed per-request
+    overhead does not flatten the exponent"""
+    if not sizes:
+        return fit_power_law([], [])
+    smallest = min(range(len(sizes)), key=lambda i: sizes[i])
+    baseline = values[smallest]
+    pairs = [(x, y - baseline) for i, (x, y) in enumerate(zip(sizes, values)) if i != smallest]
+    fit = fit_power_law([x for x, _ in pairs], [y for _, y in pairs])
+    fit["baseline"] = baseline
+    return fit
+
+def fit_linear(sizes: Sequence[float], values: Sequence[float]) -> Dict[str, float]:
+    """Least-squares fit of value = intercept + slope * size"""
+    n = len(sizes)
+    if n < 2:
+        return {"slope": 0.0, "intercept": values[0] if values else 0.0, "r2": 0.0}
+    mean_x = sum(sizes) / n
+    mean_y = sum(values) / n
+    sxx = sum((x - mean_x) ** 2 for x in sizes)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(sizes, values)) / sxx if sxx else 0.0
+    intercept = mean_y - slope * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for y in values)
+    ss_res = sum((y - intercept - slope * x) ** 2 for x, y in zip(sizes, values))
+    return {"slope": slope, "intercept": intercept, "r2": 1.0 - ss_res / ss_tot if ss_tot else 1.0}
+
+def classify_growth(exponent: float) -> str:
+    if exponent > SUPERLINEAR_EXPONENT:
+        return "superlinear"
+    if exponent < SUBLINEAR_EXPONENT:
+        return "sublinear"
+    return "linear"
+
+def median(values: List[float]) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+def describe_fit(label: str, fit: Dict[str, float]) -> str:
+    """One report line for a power-law fit"""
+    if fit["points"] < 2:
+        return f"➖ {label}: not enough points above the baseline to fit"
+    growth = classify_growth(fit["exponent"])
+    marker = "⚠️ " if growth == "superlinear" else "✅"
+    return f"{marker} {label}: cost ~ size^{fit['exponent']:.2f} ({growth}, r²={fit['r2']:.2f})"
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Declarative workload scenarios for the Tribe AI load tools
+Weighted virtual-user flows, think times and request data generators loaded from a JSON file
+"""
+
+import json
+import random
+import re
+import threading
+from typing import Dict, Any, Optional, List, Union, Callable, Set, Awaitable
+
+from backend_test import TribeAITester, run_blocking
+from stub_server import sample_latency
+
+# A scenario file is one JSON object:
+#   {"generators": {name: generator, ...},          drawn again at every reference
+#    "think": latency spec,                          default pause before each step
+#    "flows": {name: {"weight": w,                   relative arrival share
+#                     "scenario": "law",             a built-in scenario, or
+#                     "steps": [step, ...],          its own session flow
+#                     "vars": {name: generator},     drawn once per virtual user
+#                     "think": latency spec}}}
+# Steps are {"test": "test_chat_gpt5"} (a TribeAITester flow), {"request": "POST /chat",
+# "json": {...}, "form": false, "expect": 200} or {"one_of": [step, ...], "weights": [...]};
+# any step may add "think" and "repeat" (a count or [min, max]). Think times and
+# generators use stub_server latency specs ({"distribution": "lognormal", "median_ms": ...}).
+# Strings in request bodies may reference "{{name}}": a string that is only a reference
+# takes the generated value as-is (numbers and lists included), otherwise it is formatted in.
+# Built-in names: session_id, user_id.
+WORDS = ("contract court policy tenant landlord payment notice claim agreement report schedule budget "
+         "customer design market product quarter revenue summary review team update analysis strategy "
+         "meeting project deadline proposal invoice client service support growth plan risk data").split()
+REFERENCE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+GENERATOR_TYPES = {"choice", "int", "latency", "text", "list"}
+
+def draw_range(value: Union[int, List[int]], rng: random.Random) -> int:
+    """A count given as a number or an inclusive [min, max] range"""
+    if isinstance(value, list):
+        return rng.randint(value[0], value[1])
+    return int(value)
+
+def generate(spec: Any, rng: random.Random, generators: Dict[str, Any]) -> Any:
+    """One value from a generator spec; lists and other objects are generated element by element"""
+    if isinstance(spec, str):
+        return render(spec, rng, generators, {})
+    if isinstance(spec, list):
+        return [generate(item, rng, generators) for item in spec]
+    if not isinstance(spec, dict):
+        return spec
+    if spec.get("type") not in GENERATOR_TYPES:
+        return {key: generate(value, rng, generators) for key, value in spec.items()}
+    kind = spec["type"]
+    if kind == "choice":
+        return generate(rng.choices(spec["values"], weights=spec.get("weights"))[0], rng, generators)
+    if kind == "int":
+        return rng.randint(spec["min"], spec["max"])
+    if kind == "latency":
+        return round(sample_latency(spec, rng))
+    if kind == "text":
+        return " ".join(rng.choice(WORDS) for _ in range(max(1, draw_range(spec.get("words", [5, 20]), rng))))
+    return [generate(spec["item"], rng, generators) for _ in range(draw_range(spec["count"], rng))]
+
+def render(template: Any, rng: random.Random, generators: Dict[str, Any], values: Dict[str, Any]) -> Any:
+    """Copy of a request body with every "{{name}}" reference filled in"""
+    if isinstance(template, dict):
+        return {key: render(value, rng, generators, values) for key, value in template.items()}
+    if isinstance(template, list):
+        return [render(value, rng, generators, values) for value in template]
+    if not isinstance(template, str):
+        return template
+
+    def lookup(name: str) -> Any:
+        if name in values:
+            return values[name]
+        return generate(generators[name], rng, generators)
+
+    whole = REFERENCE.fullmatch(template)
+    if whole:
+        return lookup(whole.group(1))
+    return REFERENCE.sub(lambda match: str(lookup(match.group(1))), template)
+
+class ScenarioFlow:
+    """One virtual user's session: steps run in order with think time before each,
+    stopping at the first failure"""
+
+    def __init__(self, name: str, weight: float, steps: List[Dict[str, Any]],
+                 variables: Optional[Dict[str, Any]] = None, think: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.weight = weight
+        self.steps = steps
+        self.variables = variables or {}
+        self.think = think
+
+    def run(self, tester: TribeAITester, rng: random.Random, generators: Dict[str, Any],
+            skip: Set[str] = frozenset(), wait: Callable[[float], bool] = threading.Event().wait) -> bool:
+        """Run the session; ``skip`` names test steps to leave out (e.g. logins for pooled users)
+        and ``wait(seconds)`` returning True ends the session early, between steps"""
+        async def await_wait(seconds: float) -> bool:
+            return wait(seconds)
+
+        return run_blocking(self.arun(tester, rng, generators, skip, await_wait))
+
+    async def arun(self, tester: TribeAITester, rng: random.Random, generators: Dict[str, Any],
+                   skip: Set[str], wait: Callable[[float], Awaitable[bool]]) -> bool:
+        """run() as a coroutine, for virtual users on the async engine's event loop"""
+        values = {"session_id": tester.session_id}
+        values.update({name: generate(spec, rng, generators) for name, spec in self.variables.items()})
+        for step in self.steps:
+            for _ in range(draw_range(step.get("repeat", 1), rng)):
+                think = step.get("think", self.think)
+                if think and await wait(sample_latency(think, rng) / 1000.0):
+                    return True
+                if not await self.run_step(step, tester, rng, generators, values, skip):
+                    return False
+        return True
+
+    async def run_step(self, step: Dict[str, Any], tester: TribeAITester, rng: random.Random,
+                       generators: Dict[str, Any], values: Dict[str, Any], skip: Set[str]) -> bool:
+        if "one_of" in step:
+            chosen = rng.choices(step["one_of"], weights=step.get("weights"))[0]
+            return await self.run_step(chosen, tester, rng, generators, values, skip)
+        if "test" in step:
+            return step["test"] in skip or bool(await getattr(TribeAITester, step["test"]).flow(tester))
+        values["user_id"] = tester.user_id
+        method, endpoint = step["request"].split(None, 1)
+        endpoint = render(endpoint, rng, generators, values)
+        body = render(step.get("json"), rng, generators, values)
+        response = await tester.amake_request(method.upper(), endpoint, body, form=step.get("form", False))
+        expected = step.get("expect")
+        return response.status_code == expected if expected else response.status_code < 400
+
+class ScenarioFile:
+    """Weighted flows and shared generators from a scenario file"""
+
+    def __init__(self, flows: Dict[str, ScenarioFlow], generators: Optional[Dict[str, Any]] = None,
+                 source: str = "<scenario>"):
+        self.flows = flows
+        self.generators = generators or {}
+        self.source = source
+
+    @property
+    def weights(self) -> List[float]:
+        return [flow.weight for flow in self.flows.values()]
+
+    def run(self, name: str, tester: TribeAITester, rng: random.Random, skip: Set[str] = frozenset(),
+            wait: Callable[[float], bool] = threading.Event().wait) -> bool:
+        return self.flows[name].run(tester, rng, self.generators, skip, wait)
+
+    async def arun(self, name: str, tester: TribeAITester, rng: random.Random, skip: Set[str],
+                   wait: Callable[[float], Awaitable[bool]]) -> bool:
+        return await self.flows[name].arun(tester, rng, self.generators, skip, wait)
+
+def check_step(step: Dict[str, Any], where: str, generators: Dict[str, Any], variables: Dict[str, Any]):
+    """Reject unknown step kinds, test methods and data references before the run starts"""
+    if "one_of" in step:
+        if step.get("weights") is not None and len(step["weights"]) != len(step["one_of"]):
+            raise ValueError(f"{where}: one weight per one_of step")
+        for index, option in enumerate(step["one_of"]):
+            check_step(option, f"{where}.one_of[{index}]", generators, variables)
+    elif "test" in step:
+        if not step["test"].startswith("test_") or not hasattr(getattr(TribeAITester, step["test"], None), "flow"):
+            raise ValueError(f"{where}: unknown test {step['test']!r}")
+    elif "request" in step:
+        if len(step["request"].split(None, 1)) != 2:
+            raise ValueError(f"{where}: request must be \"METHOD /endpoint\", got {step['request']!r}")
+        known = set(generators) | set(variables) | {"session_id", "user_id"}
+        missing = sorted(set(REFERENCE.findall(step["request"] + json.dumps(step.get("json")))) - known)
+        if missing:
+            raise ValueError(f"{where}: undefined references {missing}")
+    else:
+        raise ValueError(f"{where}: a step needs \"test\", \"request\" or \"one_of\"")
+
+def check_generators(generators: Dict[str, Any]):
+    """Reject generators that reference undefined generators or (through others) themselves.
+
+    Generators and vars are drawn without a user's values, so they may only reference
+    generators, never vars or the built-in names.
+    """
+    uses = {name: set(REFERENCE.findall(json.dumps(spec))) for name, spec in generators.items()}
+    for name, used in uses.items():
+        missing = sorted(used - set(generators))
+        if missing:
+            raise ValueError(f"generators.{name}: undefined references {missing}")
+    done = set()
+
+    def visit(name: str, path: List[str]):
+        if name in path:
+            cycle = " -> ".join(path[path.index(name):] + [name])
+            raise ValueError(f"generators.{name}: references itself via {cycle}")
+        if name not in done:
+            for used in sorted(uses[name]):
+                visit(used, path + [name])
+            done.add(name)
+
+    for name in generators:
+        visit(name, [])
+
+def load_scenario_file(source: Union[str, Dict[str, Any]], builtin: Dict[str, List[str]]) -> ScenarioFile:
+    """Parse and validate a scenario file (a path or its already-loaded JSON); ``builtin``
+    maps scenario names a flow may reuse to their test steps"""
+    if isinstance(source, str):
+        with open(source) as f:
+            data, label = json.load(f), source
+    else:
+        data, label = source, source.get("name", "<scenario>")
+    generators = data.get("generators", {})
+    check_generators(generators)
+    flows = {}
+    for name, spec in data.get("flows", {}).items():
+        for var, var_spec in spec.get("vars", {}).items():
+            missing = sorted(set(REFERENCE.findall(json.dumps(var_spec))) - set(generators))
+            if missing:
+                raise ValueError(f"flows.{name}.vars.{var}: undefined references {missing} "
+                                 "(vars may only reference generators)")
+        if "scenario" in spec:
+            if spec["scenario"] not in builtin:
+                raise ValueError(f"flows.{name}: unknown scenario {spec['scenario']!r}")
+            steps = [{"test": test} for test in builtin[spec["scenario"]]]
+        else:
+            steps = spec.get("steps") or []
+        if not steps:
+            raise ValueError(f"flows.{name}: needs \"steps\" or \"scenario\"")
+        for index, step in enumerate(steps):
+            check_step(step, f"flows.{name}.steps[{index}]", generators, spec.get("vars", {}))
+        flows[name] = ScenarioFlow(name, float(spec.get("weight", 1)), steps, spec.get("vars"),
+                                   spec.get("think", data.get("think")))
+    if not flows or min(flow.weight for flow in flows.values()) < 0 or not sum(f.weight for f in flows.values()):
+        raise ValueError(f"{label}: needs at least one flow and non-negative weights, not all zero")
+    return ScenarioFile(flows, generators, label)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Soak testing for the Tribe AI Platform
+Runs the regression workload at a fixed rate for hours and flags latency and error drift per window
+"""
+
+import argparse
+import json
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Tuple, TextIO, Deque
+
+from async_engine import AsyncClientEngine
+from auth_session import AuthPool
+from backend_test import BASE_URL, TEST_USER_PASSWORD
+from latency_histogram import HdrHistogram
+from load_generator import (DEFAULT_MAX_VUS, FULL_WORKLOAD, SCENARIOS, LoadGenerator, LoadMetrics, LoadProfile,
+                            print_report)
+from rate_governor import add_governor_args, governor_from_args, print_governor_report
+from run_results import mann_whitney_p
+
+DEFAULT_WINDOW = 60.0
+# Windows ignored while caches and pools warm up, then pooled as the reference
+DEFAULT_WARMUP_WINDOWS = 1
+DEFAULT_REFERENCE_WINDOWS = 3
+# A window drifts when it is significantly worse than the reference by a meaningful
+# amount for this many windows in a row
+DEFAULT_ALPHA = 0.001
+DEFAULT_MIN_SHIFT = 0.20
+DEFAULT_MIN_DELTA_MS = 5.0
+DEFAULT_MIN_ERROR_INCREASE = 0.01
+DEFAULT_CONSECUTIVE = 2
+# Post-reference windows needed before testing the p50 series for a trend, and the
+# trailing windows kept for it (the test compares every pair, so cost grows as n^2)
+TREND_MIN_WINDOWS = 8
+TREND_MAX_WINDOWS = 120
+
+def parse_duration(text: str) -> float:
+    """Seconds from ``90``, ``90s``, ``15m`` or ``6h``"""
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+def parse_mix(specs: List[str]) -> Tuple[List[str], List[float]]:
+    """Scenario names and weights from ``NAME`` or ``NAME=WEIGHT`` entries"""
+    names, weights = [], []
+    for spec in specs:
+        name, _, weight = spec.partition("=")
+        if name not in SCENARIOS and name != FULL_WORKLOAD:
+            raise ValueError(f"Unknown scenario in mix: {name}")
+        names.append(name)
+        weights.append(float(weight) if weight else 1.0)
+    return names, weights
+
+def mann_kendall(series: List[float]) -> Tuple[float, float]:
+    """One-sided p-value for an increasing trend, and the Theil-Sen slope per step"""
+    n = len(series)
+    if n < 3:
+        return 1.0, 0.0
+    s = 0
+    slopes = []
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            diff = series[j] - series[i]
+            s += (diff > 0) - (diff < 0)
+            slopes.append(diff / (j - i))
+    variance = n * (n - 1) * (2 * n + 5) / 18.0
+    z = (s - 1) / math.sqrt(variance) if s > 0 else 0.0
+    slopes.sort()
+    middle = len(slopes) // 2
+    slope = slopes[middle] if len(slopes) % 2 else (slopes[middle - 1] + slopes[middle]) / 2
+    return 0.5 * math.erfc(z / math.sqrt(2)), slope
+
+def error_increase_p(errors_a: int, total_a: int, errors_b: int, total_b: int) -> float:
+    """One-sided two-proportion z-test p-value that rate b exceeds rate a"""
+    if not total_a or not total_b:
+        return 1.0
+    pooled = (errors_a + errors_b) / (total_a + total_b)
+    variance = pooled * (1 - pooled) * (1 / total_a + 1 / total_b)
+    if variance <= 0:
+        return 1.0
+    z = (errors_b / total_b - errors_a / total_a) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+class WindowedMetrics:
+    """LoadMetrics-compatible collector that starts a fresh window on rotate().
+
+    Closed windows are handed to the caller and folded into running totals, so memory
+    stays bounded by the histograms of one window plus the totals.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = LoadMetrics()
+        self.total = LoadMetrics()
+
+    def observe_request(self, method: str, endpoint: str, status_code: Optional[int], elapsed: float):
+        with self._lock:
+            self.current.observe_request(method, endpoint, status_code, elapsed)
+
+    def observe_scenario(self, name: str, success: bool, latency: float, lag: float):
+        with self._lock:
+            self.current.observe_scenario(name, success, latency, lag)
+
+    def rotate(self) -> LoadMetrics:
+        """Close the current window and return it"""
+        with self._lock:
+            closed, self.current = self.current, LoadMetrics()
+        self.total.merge(closed)
+        return closed
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        return self.total.report(elapsed)
+
+class DriftDetector:
+    """Compares each window against a reference pooled from the first steady windows.
+
+    Per endpoint, latency drifts when a one-sided Mann-Whitney test says the window is
+    slower (and its p50 moved by a meaningful amount); errors drift on a two-proportion
+    test. Either must hold for ``consecutive`` windows before it is flagged. The overall
+    p50 of every window is also tested for a monotonic upward trend (Mann-Kendall),
+    which catches slow leaks before any single window stands out.
+    """
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA, min_shift: float = DEFAULT_MIN_SHIFT,
+                 min_delta_ms: float = DEFAULT_MIN_DELTA_MS, min_error_increase: float = DEFAULT_MIN_ERROR_INCREASE,
+                 warmup: int = DEFAULT_WARMUP_WINDOWS, reference: int = DEFAULT_REFERENCE_WINDOWS,
+                 consecutive: int = DEFAULT_CONSECUTIVE):
+        self.alpha = alpha
+        self.min_shift = min_shift
+        self.min_delta_ms = min_delta_ms
+        self.min_error_increase = min_error_increase
+        self.warmup = warmup
+        self.reference_windows = reference
+        self.consecutive = consecutive
+        self.reference: Dict[str, HdrHistogram] = {}
+        self.reference_counts: Dict[str, List[int]] = {}
+        self.streaks: Dict[Tuple[str, str], int] = {}
+        self.p50_series: Deque[float] = deque(maxlen=TREND_MAX_WINDOWS)
+        self.windows = 0
+
+    def observe(self, histograms: Dict[str, HdrHistogram], counts: Dict[str, List[int]]) -> List[Dict[str, Any]]:
+        """Feed one closed window (histograms and [requests, errors] per endpoint); returns drift flags"""
+        index = self.windows
+        self.windows += 1
+        if index < self.warmup:
+            return []
+        if index < self.warmup + self.reference_windows:
+            for key, histogram in histograms.items():
+                if key in self.reference:
+                    self.reference[key].merge(histogram)
+                else:
+                    self.reference[key] = histogram.copy()
+                totals = self.reference_counts.setdefault(key, [0, 0])
+                totals[0] += counts[key][0]
+                totals[1] += counts[key][1]
+            return []
+
+        flags = []
+        for key, histogram in histograms.items():
+            reference = self.reference.get(key)
+            if reference is None:
+                continue
+            before = reference.value_at_percentile(50) / 1000.0
+            after = histogram.value_at_percentile(50) / 1000.0
+            change = (after - before) / before if before else 0.0
+            p_value = mann_whitney_p(reference, histogram)
+            slower = p_value < self.alpha and change > self.min_shift and after - before > self.min_delta_ms
+            if self._streak((key, "latency"), slower):
+                flags.append({"endpoint": key, "kind": "latency", "p_value": p_value, "reference_p50_ms": before,
+                              "window_p50_ms": after, "change": change})
+
+            base_requests, base_errors = self.reference_counts[key]
+            requests, errors = counts[key]
+            base_rate = base_errors / base_requests if base_requests else 0.0
+            rate = errors / requests if requests else 0.0
+            p_value = error_increase_p(base_errors, base_requests, errors, requests)
+            worse = p_value < self.alpha and rate - base_rate > self.min_error_increase
+            if self._streak((key, "errors"), worse):
+                flags.append({"endpoint": key, "kind": "errors", "p_value": p_value,
+                              "reference_error_rate": base_rate, "window_error_rate": rate})
+
+        overall = HdrHistogram()
+        for histogram in histograms.values():
+            overall.merge(histogram)
+        if overall.total_count:
+            self.p50_series.append(overall.value_at_percentile(50) / 1000.0)
+        if len(self.p50_series) >= TREND_MIN_WINDOWS:
+            p_value, slope = mann_kendall(list(self.p50_series))
+            if p_value < self.alpha and slope > 0:
+                flags.append({"endpoint": "all", "kind": "trend", "p_value": p_value, "slope_ms_per_window": slope,
+                              "windows": len(self.p50_series)})
+        return flags
+
+    def _streak(self, key: Tuple[str, str], hit: bool) -> bool:
+        self.streaks[key] = self.streaks.get(key, 0) + 1 if hit else 0
+        return self.streaks[key] >= self.consecutive
+
+class SoakTest:
+    """Drives a LoadGenerator for the whole soak and closes a metrics window every ``window`` seconds.
+
+    Each closed window is summarized, checked for drift and appended to ``output`` as
+    one JSON line straight away, so nothing but the current window and running totals
+    stays in memory.
+    """
+
+    def __init__(self, generator: LoadGenerator, output: TextIO, window: float = DEFAULT_WINDOW,
+                 detector: Optional[DriftDetector] = None):
+        self.generator = generator
+        self.metrics = WindowedMetrics()
+        generator.metrics = self.metrics
+        self.output = output
+        self.window = window
+        self.detector = detector or DriftDetector()
+        self.drift_counts: Dict[str, int] = {}
+        self.windows = 0
+
+    def close_window(self, started: float, opened: float, now: float):
+        """Summarize, check and write the window that ran from ``opened`` to ``now``"""
+        closed = self.metrics.rotate()
+        elapsed = now - opened
+        report = closed.report(elapsed)
+        snapshot = closed.endpoints.snapshot()
+        histograms = {key: HdrHistogram.from_dict(data) for key, data in snapshot.items()}
+        counts = {key: [stats["count"], stats["errors"]] for key, stats in report["endpoints"].items()}
+        flags = self.detector.observe(histograms, counts)
+        for flag in flags:
+            self.drift_counts[f"{flag['endpoint']} {flag['kind']}"] = \
+                self.drift_counts.get(f"{flag['endpoint']} {flag['kind']}", 0) + 1
+
+        requests = sum(count for count, _ in counts.values())
+        errors = sum(error for _, error in counts.values())
+        overall = HdrHistogram()
+        for histogram in histograms.values():
+            overall.merge(histogram)
+        record = {
+            "type": "window", "index": self.windows, "offset_s": opened - started, "elapsed_s": elapsed,
+            "closed_at": datetime.now(timezone.utc).isoformat(), "requests": requests, "errors": errors,
+            "error_rate": errors / requests if requests else 0.0,
+            "throughput_rps": requests / elapsed if elapsed else 0.0, "overall": overall.summary_ms(),
+            "endpoints": {key: {**stats, "histogram": snapshot[key]} for key, stats in report["endpoints"].items()},
+            "scenarios": report["scenarios"], "schedule_lag": report["schedule_lag"], "drift": flags,
+        }
+        self.output.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.output.flush()
+        self.windows += 1
+        print_window(record)
+
+    def run(self, duration: float) -> Dict[str, Any]:
+        """Soak until the profile ends (or Ctrl-C), then write and return the totals"""
+        started = time.perf_counter()
+        runner = threading.Thread(target=self.generator.run, name="tribe-soak", daemon=True)
+        runner.start()
+        opened = started
+        while runner.is_alive():
+            try:
+                runner.join(timeout=max(0.0, opened + self.window - time.perf_counter()))
+            except KeyboardInterrupt:
+                print("\n🛑 Stopping: no new arrivals, waiting for active users")
+                self.generator.stopped.set()
+                continue
+            now = time.perf_counter()
+            if now >= opened + self.window:
+                self.close_window(started, opened, now)
+                opened = now
+        now = time.perf_counter()
+        if now > opened:
+            self.close_window(started, opened, now)
+
+        total = self.metrics.report(now - started)
+        summary = {"type": "summary", "planned_s": duration, "elapsed_s": now - started, "windows": self.windows,
+                   "drift": self.drift_counts, "endpoints": total["endpoints"], "scenarios": total["scenarios"],
+                   "schedule_lag": total["schedule_lag"]}
+        self.output.write(json.dumps(summary, separators=(",", ":")) + "\n")
+        self.output.flush()
+        return total
+
+def print_window(record: Dict[str, Any]):
+    overall = record["overall"]
+    print(f"🪟 window {record['index']:>4} +{record['offset_s'] / 60:>6.1f}min  {record['requests']:>6} req  "
+          f"{record['throughput_rps']:>7.2f} rps  {record['error_rate']:>6.2%} errors  "
+          f"p50 {overall['p50_ms']:>8.1f}ms  p99 {overall['p99_ms']:>8.1f}ms")
+    for flag in record["drift"]:
+        if flag["kind"] == "latency":
+            print(f"   ⚠️  latency drift {flag['endpoint']}: p50 {flag['reference_p50_ms']:.1f}ms -> "
+                  f"{flag['window_p50_ms']:.1f}ms ({flag['change']:+.0%}, p={flag['p_value']:.1e})")
+        elif flag["kind"] == "errors":
+            print(f"   ⚠️  error drift {flag['endpoint']}: {flag['reference_error_rate']:.2%} -> "
+                  f"{flag['window_error_rate']:.2%} (p={flag['p_value']:.1e})")
+        else:
+            print(f"   ⚠️  upward p50 trend over {flag['windows']} windows: "
+                  f"{flag['slope_ms_per_window']:+.2f}ms per window (p={flag['p_value']:.1e})")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Soak test the Tribe AI API with drift detection")
+    parser.add_argument("--mix", action="append",
+                        help=f"Scenario as NAME or NAME=WEIGHT (repeatable); defaults to '{FULL_WORKLOAD}', "
+                             f"the whole run_all_tests plan. Names: {', '.join(sorted(SCENARIOS))}")
+    parser.add_argument("--rate", type=float, required=True, help="Virtual-user arrivals per second")
+    parser.add_argument("--duration", type=parse_duration, default=3600.0, help="Soak length, e.g. 90m or 6h")
+    parser.add_argument("--window", type=parse_duration, default=DEFAULT_WINDOW, help="Rolling window length")
+    parser.add_argument("--warmup-windows", type=int, default=DEFAULT_WARMUP_WINDOWS,
+                        help="Windows ignored before the reference is taken")
+    parser.add_argument("--reference-windows", type=int, default=DEFAULT_REFERENCE_WINDOWS,
+                        help="Windows pooled as the drift reference")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level for drift tests")
+    parser.add_argument("--min-shift", type=float, default=DEFAULT_MIN_SHIFT,
+                        help="Relative p50 increase needed to flag latency drift")
+    parser.add_argument("--consecutive", type=int, default=DEFAULT_CONSECUTIVE,
+                        help="Windows in a row a drift must persist before it is flagged")
+    parser.add_argument("--output", help="JSONL file for window records (defaults to soak-<timestamp>.jsonl)")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant", help="Arrival process")
+    parser.add_argument("--max-vus", type=int, default=DEFAULT_MAX_VUS,
+                        help="Maximum concurrently active virtual users")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync", help="HTTP client")
+    parser.add_argument("--seed", type=int, help="Random seed for scenario choice and arrivals")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    parser.add_argument("--user-pool", type=int, default=0,
+                        help="Pre-authenticate this many users and share them across virtual users")
+    add_governor_args(parser)
+    parser.set_defaults(max_retries=0)
+    return parser.parse_args(argv)
+
+def main():
+    """Run a soak test from the command line; exits 1 if any drift was flagged"""
+    args = parse_args()
+    names, weights = parse_mix(args.mix or [FULL_WORKLOAD])
+    output_path = args.output or f"soak-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+    engine = AsyncClientEngine().start() if args.engine == "async" else None
+    auth_pool = None
+    if args.user_pool:
+        auth_pool = AuthPool(args.base_url or BASE_URL, args.user_pool, TEST_USER_PASSWORD).prepare()
+        print(f"🔑 {args.user_pool} users authenticated")
+    try:
+        generator = LoadGenerator(names, LoadProfile(args.rate, steady=args.duration, arrival=args.arrival),
+                                  max_vus=args.max_vus, engine=engine, seed=args.seed, base_url=args.base_url,
+                                  auth_pool=auth_pool, weights=weights, governor=governor_from_args(args))
+        detector = DriftDetector(alpha=args.alpha, min_shift=args.min_shift, warmup=args.warmup_windows,
+                                 reference=args.reference_windows, consecutive=args.consecutive)
+        print(f"🚀 Soak test: {args.rate}/s for {args.duration / 60:.0f}min, mix "
+              f"{dict(zip(names, weights))}, {args.window:.0f}s windows -> {output_path}")
+        with open(output_path, "a") as output:
+            soak = SoakTest(generator, output, window=args.window, detector=detector)
+            print_report(soak.run(args.duration))
+        if generator.governor is not None:
+            print_governor_report(generator.governor.report())
+        drift_counts = soak.drift_counts
+    finally:
+        if engine is not None:
+            engine.close()
+        if auth_pool is not None:
+            auth_pool.close()
+    if drift_counts:
+        print("\n🔍 DRIFT DETECTED:")
+        for name, windows in sorted(drift_counts.items()):
+            print(f"   ⚠️  {name}: flagged in {windows} windows")
+        exit(1)
+    print("\n✅ No significant drift")
+
+if __name__ == "__main__":
+    main()
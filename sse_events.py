@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Server-sent event parsing for the Tribe AI test harness
+Splits a chunked text/event-stream body into events as bytes arrive, for LF, CRLF and bare CR line endings
+"""
+
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+def iter_sse_events(chunks: Iterable[bytes]) -> Iterator[Tuple[Optional[str], str]]:
+    """(event name, data payload) per complete event that carries data; only the partial event is buffered"""
+    buffer = b""
+    held = b""
+    for chunk in chunks:
+        chunk = held + chunk
+        # A CR that ends the chunk may be the first half of a CRLF split across reads
+        held = b"\r" if chunk.endswith(b"\r") else b""
+        if held:
+            chunk = chunk[:-1]
+        buffer += chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        while b"\n\n" in buffer:
+            event, buffer = buffer.split(b"\n\n", 1)
+            name, data = None, []
+            for line in event.decode("utf-8").split("\n"):
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "data":
+                    data.append(value)
+                elif field == "event":
+                    name = value
+            if data:
+                yield name, "\n".join(data)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+/user/stats aggregation benchmark for the Tribe AI Platform
+Fits stats latency against a user's activity history and measures it under concurrent users
+"""
+
+import argparse
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List
+
+from auth_session import AuthPool
+from backend_test import BASE_URL, TEST_USER_PASSWORD, TribeAITester
+from latency_histogram import LatencyRecorder, format_summary_header, format_summary_row
+from scaling import describe_fit, fit_linear, fit_marginal_power_law
+
+ACTIVITY_SIZES = [0, 10, 100, 1000, 10000]
+CONCURRENCY_LEVELS = [1, 8, 32, 64]
+# Share of seeded activity per counter; sessions get one per SESSION_EVERY messages
+ACTIVITY_MIX = {"messages": 0.8, "code_requests": 0.15, "images": 0.05}
+SESSION_EVERY = 20
+# Largest-size p50 within this factor of the smallest reads as incremental counters
+FLAT_TOLERANCE = 1.25
+STATS_FIELDS = ["total_messages", "total_images", "total_code_requests", "total_sessions", "last_activity"]
+
+def activity_counts(size: int) -> Dict[str, int]:
+    """Split ``size`` activities across the stats counters"""
+    code_requests = int(size * ACTIVITY_MIX["code_requests"])
+    images = int(size * ACTIVITY_MIX["images"])
+    messages = size - code_requests - images
+    return {"messages": messages, "code_requests": code_requests, "images": images,
+            "sessions": max(1, messages // SESSION_EVERY) if messages else 0}
+
+def check_stats(result: Dict[str, Any]) -> Optional[str]:
+    """Same shape checks as test_user_statistics; returns a problem or None"""
+    stats = result.get("stats") if result.get("success") else None
+    if not stats:
+        return "no stats in response"
+    missing = [field for field in STATS_FIELDS if field not in stats]
+    if missing:
+        return f"missing fields: {missing}"
+    if not all(isinstance(stats[field], int) for field in STATS_FIELDS[:4]):
+        return "counters are not ints"
+    return None
+
+class StatsBenchmark:
+    """Provisions users with growing activity and times /user/stats for each.
+
+    Activity is seeded through the real endpoints (``api``) or the stand-in's
+    ``/__fixtures/activity`` route (``fixture``), which is the only practical way
+    to reach the larger sizes.
+    """
+
+    def __init__(self, base_url: str, seed_mode: str = "api", concurrency: int = 16, samples: int = 20):
+        if seed_mode not in ("api", "fixture"):
+            raise ValueError(f"Unsupported seed mode: {seed_mode}")
+        self.base_url = base_url
+        self.seed_mode = seed_mode
+        self.concurrency = concurrency
+        self.samples = samples
+        self.run_id = uuid.uuid4().hex[:8]
+        self.pools: List[AuthPool] = []
+
+    def provision(self, count: int, label: str) -> List[TribeAITester]:
+        """Register ``count`` fresh users for this run and return a tester per user"""
+        pool = AuthPool(self.base_url, count, TEST_USER_PASSWORD,
+                        email_template=f"stats.{label}.{self.run_id}.{{index}}@tribeai.com",
+                        name_template=f"Stats {label.title()} {{index}}").prepare(self.concurrency)
+        self.pools.append(pool)
+        return [TribeAITester(verbose=False, base_url=self.base_url, auth=user) for user in pool.users]
+
+    def seed(self, tester: TribeAITester, size: int) -> int:
+        """Record ``size`` activities for the tester's user; returns failed calls"""
+        counts = activity_counts(size)
+        if not size:
+            return 0
+        if self.seed_mode == "fixture":
+            response = tester.make_request("POST", "/__fixtures/activity", counts)
+            return 0 if response.status_code == 200 else size
+
+        sessions = [str(uuid.uuid4()) for _ in range(counts["sessions"])]
+        calls = [("/chat", {"message": f"Stats seed {i}", "model": "gpt-5", "session_id": sessions[i % len(sessions)]})
+                 for i in range(counts["messages"])]
+        calls += [("/code/assist", {"prompt": f"Print the number {i}", "language": "python"})
+                  for i in range(counts["code_requests"])]
+        calls += [("/image/generate", {"prompt": f"Stats seed image {i}", "number_of_images": 1})
+                  for i in range(counts["images"])]
+
+        def send(call) -> bool:
+            try:
+                return tester.make_request("POST", call[0], call[1]).status_code == 200
+            except Exception:
+                return False
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return sum(1 for ok in pool.map(send, calls) if not ok)
+
+    def fetch(self, tester: TribeAITester) -> Dict[str, Any]:
+        """One timed /user/stats call"""
+        started = time.perf_counter()
+        response = tester.make_request("GET", "/user/stats")
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            return {"ok": False, "elapsed": elapsed, "problem": f"HTTP {response.status_code}"}
+        result = response.json()
+        problem = check_stats(result)
+        return {"ok": problem is None, "elapsed": elapsed, "problem": problem, "stats": result.get("stats")}
+
+    def sweep(self, sizes: List[int], on_point=None) -> Dict[str, Any]:
+        """Time /user/stats for one user per activity size and fit latency against size"""
+        latency = LatencyRecorder()
+        points = []
+        for size, tester in zip(sizes, self.provision(len(sizes), "sweep")):
+            failures = self.seed(tester, size)
+            self.fetch(tester)  # warm the connection
+            problems = []
+            stats = None
+            for _ in range(self.samples):
+                result = self.fetch(tester)
+                if result["ok"]:
+                    latency.record(str(size), result["elapsed"])
+                    stats = result["stats"]
+                else:
+                    problems.append(result["problem"])
+            expected = activity_counts(size)
+            recorded = stats and stats["total_messages"] + stats["total_images"] + stats["total_code_requests"]
+            point = {"activity": size, "seed_failures": failures, "errors": len(problems),
+                     "problems": sorted(set(problems)), "counted": recorded,
+                     "expected": expected["messages"] + expected["images"] + expected["code_requests"],
+                     "latency": latency.summary().get(str(size))}
+            points.append(point)
+            if on_point:
+                on_point(point)
+
+        ok = [p for p in points if p["latency"]]
+        activity = [p["activity"] for p in ok]
+        p50 = [p["latency"]["p50_ms"] for p in ok]
+        growth = p50[-1] / p50[0] if len(p50) > 1 and p50[0] else 1.0
+        return {
+            "points": points,
+            "latency_fit": fit_marginal_power_law(activity, p50),
+            "latency_linear": fit_linear(activity, p50),
+            "growth": growth,
+            "verdict": "incremental" if growth <= FLAT_TOLERANCE else "recomputed",
+        }
+
+    def concurrent(self, users: int, activity: int, levels: List[int], requests: int, on_level=None) -> Dict[str, Any]:
+        """Hit /user/stats from many seeded users at each concurrency level"""
+        testers = self.provision(users, "crowd")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(lambda tester: self.seed(tester, activity), testers))
+        latency = LatencyRecorder()
+        levels_report = {}
+        for level in levels:
+            def worker(i: int) -> bool:
+                result = self.fetch(testers[i % len(testers)])
+                if result["ok"]:
+                    latency.record(f"c={level}", result["elapsed"])
+                return result["ok"]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                errors = sum(1 for ok in pool.map(worker, range(requests)) if not ok)
+            elapsed = time.perf_counter() - started
+            levels_report[level] = {"errors": errors, "throughput": requests / elapsed if elapsed else 0.0,
+                                    "latency": latency.summary().get(f"c={level}")}
+            if on_level:
+                on_level(level, levels_report[level])
+        return {"users": users, "activity": activity, "requests": requests, "levels": levels_report}
+
+    def close(self):
+        for pool in self.pools:
+            pool.close()
+
+def print_point(point: Dict[str, Any]):
+    if not point["latency"]:
+        print(f"❌ {point['activity']:>7} activities: {', '.join(point['problems'])}")
+        return
+    summary = point["latency"]
+    mismatch = "" if point["counted"] == point["expected"] else f"  (counted {point['counted']}, seeded {point['expected']})"
+    print(f"✅ {point['activity']:>7} activities  p50 {summary['p50_ms']:>8.2f}ms  p99 {summary['p99_ms']:>8.2f}ms"
+          f"{'  ' + str(point['errors']) + ' errors' if point['errors'] else ''}{mismatch}")
+
+def print_level(level: int, result: Dict[str, Any]):
+    summary = result["latency"] or {}
+    print(f"👥 {level:>4} concurrent  {result['throughput']:>8.1f} req/s  p50 {summary.get('p50_ms', 0):>8.2f}ms  "
+          f"p99 {summary.get('p99_ms', 0):>8.2f}ms  {result['errors']} errors")
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print("📊 USER STATS SUMMARY")
+    print("=" * 80)
+    sweep = report.get("sweep")
+    if sweep:
+        print(describe_fit("stats latency vs activity", sweep["latency_fit"]))
+        print(f"   ≈ {sweep['latency_linear']['slope'] * 1000:.2f}µs per recorded activity, "
+              f"{sweep['growth']:.2f}x from smallest to largest history")
+        if sweep["verdict"] == "incremental":
+            print("✅ Latency is flat in history size: consistent with incremental counters")
+        else:
+            print("⚠️  Latency grows with history size: stats look recomputed on every request")
+    crowd = report.get("concurrent")
+    if crowd:
+        print(f"\n👥 {crowd['users']} users with {crowd['activity']} activities each, {crowd['requests']} requests per level")
+        print(format_summary_header())
+        for level, result in crowd["levels"].items():
+            if result["latency"]:
+                print(format_summary_row(f"{level} concurrent", result["latency"]))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="/user/stats aggregation benchmark")
+    parser.add_argument("--size", type=int, action="append",
+                        help="Activity history size to measure (repeatable); defaults to 0 .. 10k")
+    parser.add_argument("--seed-mode", choices=["api", "fixture"], default="api",
+                        help="Seed through the real endpoints or the stand-in's fixture route")
+    parser.add_argument("--samples", type=int, default=20, help="Stats calls per history size")
+    parser.add_argument("--users", type=int, default=16, help="Users in the concurrent phase (0 to skip)")
+    parser.add_argument("--user-activity", type=int, default=100, help="Activities seeded per concurrent user")
+    parser.add_argument("--level", type=int, action="append", help="Concurrency level (repeatable)")
+    parser.add_argument("--requests", type=int, default=200, help="Stats calls per concurrency level")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent calls while seeding")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Run the history sweep, then the concurrent-users phase"""
+    args = parse_args()
+    benchmark = StatsBenchmark(args.base_url or BASE_URL, seed_mode=args.seed_mode,
+                               concurrency=args.concurrency, samples=args.samples)
+    report = {"seed_mode": args.seed_mode}
+    try:
+        report["sweep"] = benchmark.sweep(sorted(args.size or ACTIVITY_SIZES), on_point=print_point)
+        if args.users:
+            report["concurrent"] = benchmark.concurrent(args.users, args.user_activity,
+                                                        args.level or CONCURRENCY_LEVELS, args.requests,
+                                                        on_level=print_level)
+    finally:
+        benchmark.close()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,827 @@
+#!/usr/bin/env python3
+"""
+Local stand-in server for the Tribe AI /api surface
+Serves every route the test harness exercises with configurable latency, payload sizes and error rates
+"""
+
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Callable
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api"
+
+# Per-route models: latency distribution, response payload size and injected error rate.
+# Latencies are in milliseconds and are multiplied by the server's latency_scale.
+# Routes whose work grows with the request add a "per_item" cost: ms * items ** exponent
+# of extra latency and bytes * items of extra payload. A "rate_limit" of {"rps": r, "burst": b}
+# answers 429 with Retry-After once the route's token bucket is empty. Video jobs queue for
+# "job_workers" simulated renderers and take "processing" ms each, scaled per service.
+# A "cache_size" keeps an LRU of exact request bodies; repeats take "cache_hit_latency" instead.
+# Chat "model_factors" (at least 1.0) stretch the latency and token pacing of the named models.
+# Multipart uploads are read in chunks and their file bytes counted, not kept; "upload_ms_per_mb"
+# adds that much latency per uploaded megabyte, as ingest work before the response.
+DEFAULT_MODEL = {
+    "latency": {"distribution": "lognormal", "median_ms": 20, "sigma": 0.3},
+    "payload_bytes": 256,
+    "error_rate": 0.0,
+    "error_status": 503,
+    "upload_ms_per_mb": 0.0,
+    # Line ending for server-sent events: "lf", "crlf" or "cr"
+    "sse_line_ending": "lf",
+}
+DEFAULT_ROUTE_MODELS = {
+    "/health": {"latency": {"distribution": "fixed", "ms": 1}},
+    "/auth/register": {"latency": {"distribution": "lognormal", "median_ms": 40, "sigma": 0.3}},
+    "/auth/login": {"latency": {"distribution": "lognormal", "median_ms": 40, "sigma": 0.3}},
+    "/chat": {"latency": {"distribution": "lognormal", "median_ms": 400, "sigma": 0.5}, "payload_bytes": 1500,
+              "token_interval": {"distribution": "lognormal", "median_ms": 20, "sigma": 0.4},
+              "model_factors": {"gpt-5": 1.0, "claude-4-sonnet-20250514": 1.2, "gemini-2.5-pro": 1.4}},
+    "/chat/export": {"latency": {"distribution": "lognormal", "median_ms": 60, "sigma": 0.4}, "payload_bytes": 4096,
+                     "per_item": {"ms": 0.05, "bytes": 0, "exponent": 1.0}},
+    "/image/generate": {"latency": {"distribution": "lognormal", "median_ms": 900, "sigma": 0.4},
+                        "payload_bytes": 196608},
+    "/code/assist": {"latency": {"distribution": "lognormal", "median_ms": 500, "sigma": 0.5}, "payload_bytes": 2000},
+    "/law/search": {"latency": {"distribution": "lognormal", "median_ms": 300, "sigma": 0.5}, "payload_bytes": 1200,
+                    "cache_size": 0, "cache_hit_latency": {"distribution": "lognormal", "median_ms": 6, "sigma": 0.3}},
+    "/law/assist": {"latency": {"distribution": "lognormal", "median_ms": 350, "sigma": 0.5}, "payload_bytes": 600},
+    "/law/download": {"latency": {"distribution": "lognormal", "median_ms": 80, "sigma": 0.3}, "payload_bytes": 20000},
+    "/office/word/create": {"latency": {"distribution": "lognormal", "median_ms": 60, "sigma": 0.3},
+                            "payload_bytes": 36000, "per_item": {"ms": 0.05, "bytes": 90, "exponent": 1.0}},
+    "/office/excel/create": {"latency": {"distribution": "lognormal", "median_ms": 60, "sigma": 0.3},
+                             "payload_bytes": 5000, "per_item": {"ms": 0.002, "bytes": 12, "exponent": 1.0}},
+    "/office/powerpoint/create": {"latency": {"distribution": "lognormal", "median_ms": 90, "sigma": 0.3},
+                                  "payload_bytes": 30000, "per_item": {"ms": 2.0, "bytes": 4000, "exponent": 1.0}},
+    "/studio/generate-video": {"latency": {"distribution": "lognormal", "median_ms": 150, "sigma": 0.4},
+                               "job_workers": 4, "upload_ms_per_mb": 2.0,
+                               "processing": {"distribution": "lognormal", "median_ms": 8000, "sigma": 0.4},
+                               "service_factors": {"modelscope": 1.0, "runway": 1.6, "pika": 1.3}},
+    "/studio/jobs/{id}": {"latency": {"distribution": "lognormal", "median_ms": 8, "sigma": 0.3}},
+    "/studio/jobs/{id}/events": {"latency": {"distribution": "fixed", "ms": 2}},
+    # Items are the user's recorded activities; drop per_item to model incremental counters
+    "/user/stats": {"latency": {"distribution": "lognormal", "median_ms": 25, "sigma": 0.3},
+                    "per_item": {"ms": 0.002, "bytes": 0, "exponent": 1.0}},
+}
+
+SSE_LINE_ENDINGS = {"lf": "\n", "crlf": "\r\n", "cr": "\r"}
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "txt": "text/plain; charset=utf-8",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+# Multipart bodies are read this much at a time; form fields (not files) are kept up to the limit
+UPLOAD_CHUNK_SIZE = 262144
+MAX_FORM_FIELD_BYTES = 1048576
+DISPOSITION_PARAM = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+LOREM = ("Tribe AI stand-in response. The quick brown fox jumps over the lazy dog while the "
+         "assistant explains renewable energy, tenant rights and quantum computing. ")
+
+def sample_latency(spec: Dict[str, Any], rng: random.Random) -> float:
+    """Draw one latency in milliseconds from a distribution spec"""
+    distribution = spec.get("distribution", "fixed")
+    if distribution == "fixed":
+        return float(spec.get("ms", 0))
+    if distribution == "uniform":
+        return rng.uniform(spec["min_ms"], spec["max_ms"])
+    if distribution == "normal":
+        return max(0.0, rng.gauss(spec["mean_ms"], spec["stddev_ms"]))
+    if distribution == "lognormal":
+        return spec["median_ms"] * rng.lognormvariate(0.0, spec.get("sigma", 0.5))
+    if distribution == "exponential":
+        return rng.expovariate(1.0 / spec["mean_ms"]) if spec["mean_ms"] > 0 else 0.0
+    raise ValueError(f"Unsupported latency distribution: {distribution}")
+
+def filler_text(size: int) -> str:
+    """Deterministic text of exactly ``size`` characters"""
+    repeats = size // len(LOREM) + 1
+    return (LOREM * repeats)[:size]
+
+def make_png(width: int, height: int, seed: int = 0) -> bytes:
+    """Valid RGB PNG with noisy pixels, so its size tracks its dimensions"""
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+def make_document(kind: str, size: int) -> bytes:
+    """Opaque document body of ``size`` bytes with the right magic number"""
+    magic = b"%PDF-1.4\n" if kind == "pdf" else b"PK\x03\x04"
+    return magic + b"\x00" * max(0, size - len(magic))
+
+def read_multipart(stream, length: int, boundary: bytes,
+                   chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]]]:
+    """Form fields and file summaries (filename, content type, bytes) from a multipart body.
+
+    Reads exactly ``length`` bytes in chunks and keeps only the field values, so memory
+    stays flat however large the files are; raises ValueError on a malformed body.
+    """
+    delimiter = b"\r\n--" + boundary
+    # The opening boundary has no CRLF in front of it; pretend it does
+    buffer, remaining = b"\r\n", length
+    fields, files = {}, {}
+    part, state = None, "body"
+
+    def fill() -> bool:
+        nonlocal buffer, remaining
+        if not remaining:
+            return False
+        data = stream.read(min(chunk_size, remaining))
+        if not data:
+            raise ValueError("Body ended before its Content-Length")
+        remaining -= len(data)
+        buffer += data
+        return True
+
+    def feed(data: bytes):
+        if part is None:
+            return
+        if "bytes" in part:
+            part["bytes"] += len(data)
+        elif len(part["value"]) + len(data) > MAX_FORM_FIELD_BYTES:
+            raise ValueError(f"Form field {part['name']!r} is too large")
+        else:
+            part["value"] += data
+
+    while True:
+        if state == "body":
+            index = buffer.find(delimiter)
+            if index < 0:
+                # Keep a tail that may hold the start of a delimiter split across reads
+                keep = len(delimiter) - 1
+                if len(buffer) > keep:
+                    feed(buffer[:-keep])
+                    buffer = buffer[-keep:]
+                if not fill():
+                    raise ValueError("Missing closing boundary")
+                continue
+            feed(buffer[:index])
+            if part is not None:
+                if "bytes" in part:
+                    files[part.pop("name")] = part
+                else:
+                    fields[part["name"]] = part["value"].decode("utf-8", "replace")
+            part, buffer, state = None, buffer[index + len(delimiter):], "boundary"
+        elif state == "boundary":
+            if len(buffer) < 2 and fill():
+                continue
+            if buffer.startswith(b"--"):
+                break
+            if not buffer.startswith(b"\r\n"):
+                raise ValueError("Malformed boundary line")
+            buffer, state = buffer[2:], "headers"
+        else:
+            end = buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(buffer) > 16384 or not fill():
+                    raise ValueError("Malformed part headers")
+                continue
+            headers = {}
+            for line in buffer[:end].decode("utf-8", "replace").split("\r\n"):
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            params = {key: value.replace('\\"', '"') for key, value in
+                      DISPOSITION_PARAM.findall(headers.get("content-disposition", ""))}
+            if "name" not in params:
+                raise ValueError("Part without a field name")
+            if "filename" in params:
+                part = {"name": params["name"], "filename": params["filename"],
+                        "content_type": headers.get("content-type", "application/octet-stream"), "bytes": 0}
+            else:
+                part = {"name": params["name"], "value": b""}
+            buffer, state = buffer[end + 4:], "body"
+    # Epilogue after the closing boundary
+    while remaining:
+        data = stream.read(min(chunk_size, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+    return fields, files
+
+class StubApp:
+    """Route handlers and in-memory state shared by all request threads"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, latency_scale: float = 1.0,
+                 seed: Optional[int] = None):
+        config = config or {}
+        self.default_model = {**DEFAULT_MODEL, **config.get("default", {})}
+        self.route_models = {}
+        for route, model in {**DEFAULT_ROUTE_MODELS, **config.get("routes", {})}.items():
+            self.route_models[route] = {**self.default_model, **DEFAULT_ROUTE_MODELS.get(route, {}), **model}
+        self.latency_scale = latency_scale
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._png_cache: Dict[int, str] = {}
+        self._buckets: Dict[str, List[float]] = {}
+        self._caches: Dict[str, OrderedDict] = {}
+
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.users_by_id: Dict[str, Dict[str, Any]] = {}
+        self.sessions: Dict[str, str] = {}
+        self.histories: Dict[str, list] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        # Monotonic time at which each simulated video renderer frees up
+        self._renderers: List[float] = []
+
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/auth/register"): self.auth_register,
+            ("POST", "/auth/login"): self.auth_login,
+            ("GET", "/auth/session"): self.auth_session,
+            ("POST", "/chat"): self.chat,
+            ("POST", "/chat/export"): self.chat_export,
+            ("POST", "/image/generate"): self.image_generate,
+            ("POST", "/code/assist"): self.code_assist,
+            ("POST", "/law/search"): self.law_search,
+            ("POST", "/law/assist"): self.law_assist,
+            ("POST", "/law/download"): self.law_download,
+            ("POST", "/office/word/create"): self.office_word,
+            ("POST", "/office/excel/create"): self.office_excel,
+            ("POST", "/office/powerpoint/create"): self.office_powerpoint,
+            ("GET", "/office/integrations/status"): self.office_integrations,
+            ("POST", "/studio/generate-video"): self.studio_generate_video,
+            ("GET", "/studio/jobs/{id}"): self.studio_job,
+            ("GET", "/studio/jobs/{id}/events"): self.studio_job_events,
+            ("GET", "/user/stats"): self.user_stats,
+            # Stand-in only: bulk fixtures for benchmarks
+            ("POST", "/__fixtures/chat-history"): self.fixture_chat_history,
+            ("POST", "/__fixtures/activity"): self.fixture_activity,
+        }
+
+    def model(self, route: str) -> Dict[str, Any]:
+        return self.route_models.get(route, self.default_model)
+
+    def resolve(self, method: str, path: str) -> Tuple[Optional[Callable], str, Dict[str, str]]:
+        """Handler, route template and path parameters for a request path"""
+        handler = self.routes.get((method, path))
+        if handler is not None:
+            return handler, path, {}
+        segments = path.split("/")
+        for (route_method, route), candidate in self.routes.items():
+            parts = route.split("/")
+            if route_method != method or "{" not in route or len(parts) != len(segments):
+                continue
+            params = {}
+            for part, segment in zip(parts, segments):
+                if part.startswith("{") and part.endswith("}"):
+                    params[part[1:-1]] = segment
+                elif part != segment:
+                    break
+            else:
+                return candidate, route, params
+        return None, path, {}
+
+    def cache_hit(self, route: str, raw: bytes) -> bool:
+        """Look the exact request body up in the route's LRU response cache, adding it on a miss"""
+        size = self.model(route).get("cache_size", 0)
+        if not size:
+            return False
+        with self._lock:
+            cache = self._caches.setdefault(route, OrderedDict())
+            if raw in cache:
+                cache.move_to_end(raw)
+                return True
+            cache[raw] = True
+            if len(cache) > size:
+                cache.popitem(last=False)
+        return False
+
+    def delay_and_fault(self, route: str, cached: bool = False, upload_bytes: int = 0) -> Tuple[float, bool]:
+        """Sample this request's delay (seconds) and whether to inject an error"""
+        model = self.model(route)
+        with self._lock:
+            spec = model["cache_hit_latency"] if cached else model["latency"]
+            delay = sample_latency(spec, self.rng) + model["upload_ms_per_mb"] * upload_bytes / 1e6
+            delay *= self.latency_scale / 1000.0
+            fail = self.rng.random() < model["error_rate"]
+        return delay, fail
+
+    def throttle(self, route: str) -> Optional[float]:
+        """Seconds until the route's rate limit admits another request, or None to admit this one"""
+        limit = self.model(route).get("rate_limit")
+        if not limit:
+            return None
+        rate, burst = limit["rps"], limit.get("burst", limit["rps"])
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(route, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[route] = [tokens - 1, now]
+                return None
+            self._buckets[route] = [tokens, now]
+        return (1 - tokens) / rate
+
+    def item_cost(self, route: str, items: int) -> int:
+        """Sleep for the route's per-item work and return the extra payload bytes"""
+        per_item = self.model(route).get("per_item")
+        if not per_item or items <= 0:
+            return 0
+        delay = per_item.get("ms", 0) * items ** per_item.get("exponent", 1.0) * self.latency_scale / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+        return int(per_item.get("bytes", 0) * items)
+
+    # ============= Helpers =============
+
+    def user_for(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        token = request["token"]
+        if not token:
+            return None
+        with self._lock:
+            return self.users_by_id.get(self.sessions.get(token))
+
+    def bump(self, request: Dict[str, Any], field: str, session_id: Optional[str] = None):
+        user = self.user_for(request)
+        if user is None:
+            return
+        with self._lock:
+            stats = self.stats.setdefault(user["id"], {"total_messages": 0, "total_images": 0,
+                                                       "total_code_requests": 0, "sessions": set(),
+                                                       "last_activity": None})
+            stats[field] += 1
+            if session_id:
+                stats["sessions"].add(session_id)
+            stats["last_activity"] = datetime.now(timezone.utc).isoformat()
+
+    def login_response(self, user: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self.sessions[token] = user["id"]
+        public = {key: user[key] for key in ("id", "email", "name")}
+        return 200, {"success": True, "user": public}, {"Set-Cookie": f"session_token={token}; Path=/; HttpOnly"}
+
+    # ============= Routes =============
+
+    def health(self, request):
+        return 200, {"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+    def auth_register(self, request):
+        body = request["json"] or {}
+        email = body.get("email")
+        if not email or not body.get("password"):
+            return 422, {"detail": "email and password are required"}
+        with self._lock:
+            if email in self.users:
+                return 400, {"detail": "Email already registered"}
+            user = self.users[email] = {"id": str(uuid.uuid4()), "email": email,
+                                        "name": body.get("name", ""), "password": body["password"]}
+            self.users_by_id[user["id"]] = user
+        return self.login_response(user)
+
+    def auth_login(self, request):
+        body = request["json"] or {}
+        with self._lock:
+            user = self.users.get(body.get("email"))
+        if user is None or user["password"] != body.get("password"):
+            return 401, {"detail": "Invalid credentials"}
+        return self.login_response(user)
+
+    def auth_session(self, request):
+        user = self.user_for(request)
+        if user is None:
+            return 401, {"authenticated": False}
+        return 200, {"authenticated": True, "user": {key: user[key] for key in ("id", "email", "name")}}
+
+    def chat(self, request):
+        body = request["json"] or {}
+        session_id = body.get("session_id") or str(uuid.uuid4())
+        factor = self.model("/chat").get("model_factors", {}).get(body.get("model"), 1.0)
+        if factor > 1.0:
+            # The route delay already covered one base latency; add the model's share on top
+            with self._lock:
+                extra = sample_latency(self.model("/chat")["latency"], self.rng) * (factor - 1.0)
+            time.sleep(extra * self.latency_scale / 1000.0)
+        reply = filler_text(self.model("/chat")["payload_bytes"])
+        with self._lock:
+            history = self.histories.setdefault(session_id, [])
+            history.append({"role": "user", "content": body.get("message", "")})
+            history.append({"role": "assistant", "content": reply})
+        self.bump(request, "total_messages", session_id)
+        if body.get("stream"):
+            return 200, self.chat_events(reply, body.get("model"), session_id, factor), {
+                "Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+        result = {"success": True, "response": reply, "model": body.get("model"), "session_id": session_id}
+        if body.get("language"):
+            result["language"] = body["language"]
+        return 200, result
+
+    def chat_events(self, reply: str, model: Optional[str], session_id: str,
+                    factor: float = 1.0) -> Iterator[bytes]:
+        """Server-sent events, one word per event, paced by the route's token_interval"""
+        interval = self.model("/chat").get("token_interval", {"distribution": "fixed", "ms": 0})
+        for word in reply.split(" "):
+            with self._lock:
+                delay = sample_latency(interval, self.rng) * factor * self.latency_scale / 1000.0
+            if delay > 0:
+                time.sleep(delay)
+            yield self.sse_event("/chat", json.dumps({"token": word + " "}))
+        yield self.sse_event("/chat", json.dumps({"done": True, "model": model, "session_id": session_id}))
+        yield self.sse_event("/chat", "[DONE]")
+
+    def chat_export(self, request):
+        body = request["json"] or {}
+        export_format = body.get("format", "txt")
+        if export_format not in ("pdf", "txt"):
+            return 400, {"detail": f"Unsupported format: {export_format}"}
+        with self._lock:
+            history = list(self.histories.get(body.get("session_id"), []))
+        if not history:
+            return 404, {"detail": "No conversation found for session"}
+        self.item_cost("/chat/export", len(history))
+        transcript = "\n\n".join(f"{m['role']}: {m['content']}" for m in history).encode("utf-8")
+        if export_format == "pdf":
+            content = make_document("pdf", max(self.model("/chat/export")["payload_bytes"], len(transcript)))
+        else:
+            content = transcript
+        filename = f"chat_history_{body['session_id'][:8]}.{export_format}"
+        return 200, content, {"Content-Type": CONTENT_TYPES[export_format],
+                              "Content-Disposition": f"attachment; filename={filename}"}
+
+    def fixture_chat_history(self, request):
+        """Append ``messages`` user/assistant exchanges to a session without going through /chat"""
+        body = request["json"] or {}
+        session_id = body.get("session_id")
+        if not session_id:
+            return 422, {"detail": "session_id is required"}
+        count = int(body.get("messages", 0))
+        reply = filler_text(int(body.get("reply_bytes", self.model("/chat")["payload_bytes"])))
+        with self._lock:
+            history = self.histories.setdefault(session_id, [])
+            for i in range(count):
+                history.append({"role": "user", "content": f"Fixture message {len(history) // 2 + 1}"})
+                history.append({"role": "assistant", "content": reply})
+            total = len(history)
+        return 200, {"success": True, "session_id": session_id, "history_length": total}
+
+    def fixture_activity(self, request):
+        """Add bulk messages, images, code requests and sessions to the caller's stats"""
+        user = self.user_for(request)
+        if user is None:
+            return 401, {"detail": "Not authenticated"}
+        body = request["json"] or {}
+        with self._lock:
+            stats = self.stats.setdefault(user["id"], {"total_messages": 0, "total_images": 0,
+                                                       "total_code_requests": 0, "sessions": set(),
+                                                       "last_activity": None})
+            stats["total_messages"] += int(body.get("messages", 0))
+            stats["total_images"] += int(body.get("images", 0))
+            stats["total_code_requests"] += int(body.get("code_requests", 0))
+            for _ in range(int(body.get("sessions", 0))):
+                stats["sessions"].add(str(uuid.uuid4()))
+            stats["last_activity"] = datetime.now(timezone.utc).isoformat()
+            result = {key: stats[key] for key in ("total_messages", "total_images", "total_code_requests")}
+            result["total_sessions"] = len(stats["sessions"])
+        return 200, {"success": True, "stats": result}
+
+    def image_generate(self, request):
+        body = request["json"] or {}
+        count = max(1, int(body.get("number_of_images", 1)))
+        size = self.model("/image/generate")["payload_bytes"]
+        with self._lock:
+            encoded = self._png_cache.get(size)
+        if encoded is None:
+            side = max(1, int((size / 3) ** 0.5))
+            encoded = base64.b64encode(make_png(side, side)).decode("ascii")
+            with self._lock:
+                self._png_cache[size] = encoded
+        for _ in range(count):
+            self.bump(request, "total_images")
+        if body.get("response_format") == "binary":
+            return 200, base64.b64decode(encoded), {"Content-Type": "image/png"}
+        return 200, {"success": True, "images": [encoded] * count}
+
+    def code_assist(self, request):
+        body = request["json"] or {}
+        self.bump(request, "total_code_requests")
+        return 200, {"success": True, "language": body.get("language"),
+                     "response": filler_text(self.model("/code/assist")["payload_bytes"])}
+
+    def law_search(self, request):
+        body = request["json"] or {}
+        return 200, {"query": body.get("query"), "category": body.get("category"),
+                     "information": filler_text(self.model("/law/search")["payload_bytes"]),
+                     "resources": [{"title": f"Resource {i + 1}", "url": f"https://example.org/law/{i + 1}"}
+                                   for i in range(3)]}
+
+    def law_assist(self, request):
+        body = request["json"] or {}
+        return 200, {"message": filler_text(self.model("/law/assist")["payload_bytes"]),
+                     "form_type": body.get("form_type"), "updated_data": body.get("current_data", {})}
+
+    def law_download(self, request):
+        body = request["json"] or {}
+        content = make_document("pdf", self.model("/law/download")["payload_bytes"])
+        return 200, content, {"Content-Type": CONTENT_TYPES["pdf"],
+                              "Content-Disposition": f"attachment; filename={body.get('form_type', 'form')}.pdf"}
+
+    def office_document(self, route: str, kind: str, name: str, items: int):
+        extra = self.item_cost(route, items)
+        content = make_document(kind, self.model(route)["payload_bytes"] + extra)
+        return 200, content, {"Content-Type": CONTENT_TYPES[kind],
+                              "Content-Disposition": f"attachment; filename={name}.{kind}"}
+
+    def office_word(self, request):
+        body = request["json"] or {}
+        return self.office_document("/office/word/create", "docx", body.get("title", "document"),
+                                    len(body.get("paragraphs", [])))
+
+    def office_excel(self, request):
+        body = request["json"] or {}
+        cells = sum(len(row) for row in body.get("data", []))
+        return self.office_document("/office/excel/create", "xlsx", body.get("filename", "sheet"), cells)
+
+    def office_powerpoint(self, request):
+        body = request["json"] or {}
+        return self.office_document("/office/powerpoint/create", "pptx", body.get("title", "presentation"),
+                                    len(body.get("slides", [])))
+
+    def office_integrations(self, request):
+        return 200, {"microsoft": {"connected": False, "available": True},
+                     "google": {"connected": False, "available": True}}
+
+    def studio_generate_video(self, request):
+        form = request["form"]
+        service = form.get("service", "modelscope")
+        model = self.model("/studio/generate-video")
+        job_id = str(uuid.uuid4())
+        now = time.monotonic()
+        with self._lock:
+            processing = (sample_latency(model["processing"], self.rng) * model["service_factors"].get(service, 1.0)
+                          * self.latency_scale / 1000.0)
+            if not self._renderers:
+                self._renderers = [now] * model["job_workers"]
+            # FIFO: the job starts on whichever renderer frees up first
+            renderer = min(range(len(self._renderers)), key=self._renderers.__getitem__)
+            started = max(now, self._renderers[renderer])
+            self._renderers[renderer] = started + processing
+            self.jobs[job_id] = {"service": service, "style": form.get("style", "realistic"),
+                                 "submitted": now, "started": started, "completed": started + processing,
+                                 "wall_offset": time.time() - now}
+        body = {"status": "queued", "service": service, "style": form.get("style", "realistic"), "job_id": job_id,
+                "message": f"Video generation with {service} queued for prompt: {form.get('prompt', '')[:60]}"}
+        if request.get("files"):
+            # Reference media: echo what arrived, so uploads can be checked byte for byte
+            body["uploads"] = request["files"]
+        return 200, body
+
+    def job_status(self, job: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+        """Job state derived from its simulated schedule, with timestamps of the transitions so far"""
+        now = time.monotonic()
+        status = "queued" if now < job["started"] else "processing" if now < job["completed"] else "completed"
+        stamp = lambda t: datetime.fromtimestamp(t + job["wall_offset"], timezone.utc).isoformat()
+        result = {"job_id": job_id, "status": status, "service": job["service"], "style": job["style"],
+                  "submitted_at": stamp(job["submitted"])}
+        if status != "queued":
+            result["started_at"] = stamp(job["started"])
+        if status == "completed":
+            result["completed_at"] = stamp(job["completed"])
+            result["video_url"] = f"/studio/videos/{job_id}.mp4"
+        return result
+
+    def studio_job(self, request):
+        job = self.jobs.get(request["params"]["id"])
+        if job is None:
+            return 404, {"detail": "Job not found"}
+        return 200, self.job_status(job, request["params"]["id"])
+
+    def studio_job_events(self, request):
+        job_id = request["params"]["id"]
+        job = self.jobs.get(job_id)
+        if job is None:
+            return 404, {"detail": "Job not found"}
+        return 200, self.job_events(job, job_id), {"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+
+    def sse_event(self, route: str, data: str, event: Optional[str] = None) -> bytes:
+        """One server-sent event, terminated with the route's configured line ending"""
+        eol = SSE_LINE_ENDINGS[self.model(route).get("sse_line_ending", "lf")]
+        lines = ([f"event: {event}"] if event else []) + [f"data: {data}", ""]
+        return (eol.join(lines) + eol).encode("utf-8")
+
+    def job_events(self, job: Dict[str, Any], job_id: str) -> Iterator[bytes]:
+        """Server-sent event for the current state and for every later transition"""
+        last = None
+        while True:
+            status = self.job_status(job, job_id)
+            if status["status"] != last:
+                last = status["status"]
+                yield self.sse_event("/studio/jobs/{id}/events", json.dumps(status), last)
+            if last == "completed":
+                return
+            time.sleep(max(0.0, job["started" if last == "queued" else "completed"] - time.monotonic()))
+
+    def user_stats(self, request):
+        user = self.user_for(request)
+        if user is None:
+            return 401, {"detail": "Not authenticated"}
+        with self._lock:
+            stats = self.stats.get(user["id"], {"total_messages": 0, "total_images": 0,
+                                                "total_code_requests": 0, "sessions": set(),
+                                                "last_activity": None})
+            result = {key: stats[key] for key in ("total_messages", "total_images",
+                                                  "total_code_requests", "last_activity")}
+            result["total_sessions"] = len(stats["sessions"])
+        self.item_cost("/user/stats", result["total_messages"] + result["total_images"] + result["total_code_requests"])
+        return 200, {"success": True, "stats": result}
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Parses requests, applies the route's latency/error model and writes the response"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TribeStub/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY small responses
+    # stall on delayed ACKs and every keep-alive request picks up ~40ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _handle(self):
+        app: StubApp = self.server.app
+        parsed = urlparse(self.path)
+        path = parsed.path[len(API_PREFIX):] if parsed.path.startswith(API_PREFIX) else parsed.path
+        length = int(self.headers.get("Content-Length") or 0)
+        content_type = self.headers.get("Content-Type", "")
+        raw, form, files = b"", {}, {}
+        if content_type.startswith("multipart/form-data") and length:
+            boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+            try:
+                if boundary is None:
+                    raise ValueError("Multipart body without a boundary")
+                form, files = read_multipart(self.rfile, length, boundary.group(1).encode("latin-1"))
+            except ValueError as e:
+                # Part of the body may still be unread, so the connection can't be reused
+                self.close_connection = True
+                self._send(422, {"detail": f"Malformed request body: {e}"})
+                return
+        elif length:
+            raw = self.rfile.read(length)
+
+        handler, route, params = app.resolve(self.command, path)
+        if handler is None:
+            self._send(404, {"detail": "Not Found"})
+            return
+
+        retry_after = app.throttle(route)
+        if retry_after is not None:
+            self._send(429, {"detail": "Rate limit exceeded"}, {"Retry-After": str(max(1, math.ceil(retry_after)))})
+            return
+
+        upload_bytes = sum(upload["bytes"] for upload in files.values())
+        delay, fail = app.delay_and_fault(route, app.cache_hit(route, raw), upload_bytes)
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            model = app.model(route)
+            self._send(model["error_status"], {"detail": "Injected error"}, {"Retry-After": "1"})
+            return
+
+        request = {"path": path, "params": params, "query": parse_qs(parsed.query), "raw": raw, "json": None,
+                   "form": form, "files": files, "token": self._token()}
+        try:
+            if "application/json" in content_type and raw:
+                request["json"] = json.loads(raw)
+            elif "application/x-www-form-urlencoded" in content_type:
+                request["form"] = {k: v[0] for k, v in parse_qs(raw.decode("utf-8")).items()}
+        except ValueError:
+            self._send(422, {"detail": "Malformed request body"})
+            return
+
+        result = handler(request)
+        status, body = result[0], result[1]
+        headers = result[2] if len(result) > 2 else {}
+        self._send(status, body, headers)
+
+    def _token(self) -> Optional[str]:
+        authorization = self.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            return authorization[len("Bearer "):]
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "session_token":
+                return value
+        return None
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+        headers = dict(headers or {})
+        if isinstance(body, Iterator):
+            self._send_chunked(status, body, headers)
+            return
+        if isinstance(body, bytes):
+            payload = body
+        else:
+            payload = json.dumps(body).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_chunked(self, status: int, chunks: Iterator[bytes], headers: Dict[str, str]):
+        """Stream a body with chunked transfer encoding, flushing every chunk"""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            if chunk:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+class StubServer:
+    """Runs the stand-in on a background thread; use as a context manager in benchmarks"""
+
+    def __init__(self, app: Optional[StubApp] = None, host: str = "127.0.0.1", port: int = 0,
+                 verbose: bool = False, handler: type = StubRequestHandler):
+        self.app = app or StubApp()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = self.app
+        self.httpd.verbose = verbose
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="tribe-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def load_config(path: Optional[str]) -> Dict[str, Any]:
+    """Read a JSON route model file: {"default": {...}, "routes": {"/chat": {...}}}"""
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Local stand-in server for the Tribe AI API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--config", help="JSON file with per-route latency, payload and error models")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiplier applied to every sampled latency (0 disables delays)")
+    parser.add_argument("--seed", type=int, help="Random seed for latency and error sampling")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+def main():
+    """Serve until interrupted"""
+    args = parse_args()
+    app = StubApp(load_config(args.config), latency_scale=args.latency_scale, seed=args.seed)
+    server = StubServer(app, args.host, args.port, verbose=args.verbose)
+    print(f"🧪 Tribe AI stand-in listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
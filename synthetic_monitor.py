@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Synthetic monitoring for the Tribe AI Platform
+Probes /health and other cheap critical endpoints on a fixed cadence and alerts on SLO error-budget burn rates
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Tuple, TextIO
+
+from backend_test import BASE_URL, TribeAITester
+from latency_histogram import HdrHistogram
+from soak_test import parse_duration
+
+# Unauthenticated GETs that stay cheap enough to call every few seconds
+DEFAULT_PROBES = ["GET /health", "GET /office/integrations/status"]
+DEFAULT_INTERVAL = 15.0
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_AVAILABILITY_TARGET = 0.999
+DEFAULT_LATENCY_TARGET = 0.99
+DEFAULT_LATENCY_THRESHOLD_MS = 500.0
+# Aggregation granularity of the windows; memory is one bucket per probe per bucket length
+DEFAULT_BUCKET = 60.0
+# Consecutive failed /health probes before alerting, ahead of the platform's own health check
+DEFAULT_FAIL_STREAK = 3
+# A rule also needs this many bad probes in its short window, so one blip among a
+# handful of probes does not page on its own
+MIN_BAD_PROBES = 2
+# Multi-window burn-rate rules (severity, long window s, short window s, burn rate): an alert
+# fires only while both windows burn faster than the rate, so it starts quickly on a sharp
+# outage and clears soon after recovery. 14.4x for 1h spends 2% of a 30-day budget.
+BURN_RULES = [
+    ("page", 3600.0, 300.0, 14.4),
+    ("page", 21600.0, 1800.0, 6.0),
+    ("ticket", 86400.0, 7200.0, 3.0),
+]
+
+def format_duration(seconds: float) -> str:
+    """Shortest of ``90s``, ``15m`` or ``6h`` that is exact"""
+    for unit, size in (("h", 3600), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds / size:g}{unit}"
+    return f"{seconds:g}s"
+
+class BurnWindow:
+    """Good/bad probe counts and latencies in fixed buckets, covering the longest rule window.
+
+    Old buckets fall off the deque, so memory stays at horizon / bucket entries no
+    matter how long the monitor runs.
+    """
+
+    def __init__(self, horizon: float, bucket: float = DEFAULT_BUCKET):
+        self.bucket = bucket
+        self.buckets: deque = deque(maxlen=int(horizon // bucket) + 1)
+
+    def _current(self, now: float) -> Dict[str, Any]:
+        start = now - now % self.bucket
+        if not self.buckets or self.buckets[-1]["start"] != start:
+            self.buckets.append({"start": start, "total": 0, "unavailable": 0, "slow": 0,
+                                 "latency": HdrHistogram()})
+        return self.buckets[-1]
+
+    def record(self, now: float, available: bool, slow: bool, latency: Optional[float]):
+        bucket = self._current(now)
+        bucket["total"] += 1
+        bucket["unavailable"] += not available
+        bucket["slow"] += slow
+        if latency is not None:
+            bucket["latency"].record(int(latency * 1_000_000))
+
+    def window(self, now: float, seconds: float) -> Tuple[int, int, int]:
+        """(total, unavailable, slow) over the last ``seconds``"""
+        total = unavailable = slow = 0
+        for bucket in reversed(self.buckets):
+            if bucket["start"] <= now - seconds:
+                break
+            total += bucket["total"]
+            unavailable += bucket["unavailable"]
+            slow += bucket["slow"]
+        return total, unavailable, slow
+
+    def latency(self, now: float, seconds: float) -> HdrHistogram:
+        merged = HdrHistogram()
+        for bucket in reversed(self.buckets):
+            if bucket["start"] <= now - seconds:
+                break
+            merged.merge(bucket["latency"])
+        return merged
+
+class SyntheticMonitor:
+    """Calls every probe once per ``interval`` and tracks two SLOs per probe.
+
+    Availability: the probe answered 2xx (and /health said ``healthy``). Latency: an
+    available probe answered within ``latency_threshold_ms``. Burn rate is the bad
+    fraction over a window divided by the SLO's error budget (1 - target).
+    """
+
+    def __init__(self, tester: TribeAITester, probes: List[str], sink: TextIO,
+                 interval: float = DEFAULT_INTERVAL, availability_target: float = DEFAULT_AVAILABILITY_TARGET,
+                 latency_target: float = DEFAULT_LATENCY_TARGET,
+                 latency_threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS, bucket: float = DEFAULT_BUCKET,
+                 fail_streak: int = DEFAULT_FAIL_STREAK, rules: Optional[List[Tuple[str, float, float, float]]] = None):
+        self.tester = tester
+        self.probes = [tuple(probe.split(None, 1)) for probe in probes]
+        self.sink = sink
+        self.interval = interval
+        self.targets = {"availability": availability_target, "latency": latency_target}
+        self.latency_threshold = latency_threshold_ms / 1000.0
+        self.fail_streak = fail_streak
+        self.rules = rules or BURN_RULES
+        horizon = max(long for _, long, _, _ in self.rules)
+        self.windows = {probe: BurnWindow(horizon, bucket) for probe in self.probes}
+        self.streaks = {probe: 0 for probe in self.probes}
+        # Alert keys currently firing, so each transition is emitted once
+        self.firing: Dict[str, Dict[str, Any]] = {}
+        self.alerts = 0
+        self.ticks = 0
+
+    def probe(self, probe: Tuple[str, str]) -> Dict[str, Any]:
+        """Call one endpoint and classify the answer"""
+        method, endpoint = probe
+        started = time.perf_counter()
+        try:
+            response = self.tester.make_request(method, endpoint)
+        except Exception as e:
+            return {"available": False, "latency": None, "status": None, "detail": str(e)}
+        latency = time.perf_counter() - started
+        available = 200 <= response.status_code < 300
+        detail = f"HTTP {response.status_code}"
+        if available and endpoint == "/health":
+            try:
+                status = response.json().get("status")
+            except ValueError:
+                status = None
+            available = status == "healthy"
+            detail = f"status {status!r}"
+        return {"available": available, "latency": latency, "status": response.status_code, "detail": detail}
+
+    def emit(self, kind: str, key: str, fields: Dict[str, Any]):
+        """Write an alert transition to the sink and the console"""
+        record = {"type": kind, "alert": key, "at": datetime.now(timezone.utc).isoformat(), **fields}
+        self.sink.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.sink.flush()
+        if kind == "firing":
+            self.alerts += 1
+            print(f"🚨 {fields['severity'].upper()} {key}: {fields['summary']}")
+        else:
+            print(f"✅ RESOLVED {key}")
+
+    def set_alert(self, key: str, active: bool, fields: Dict[str, Any]):
+        if active and key not in self.firing:
+            self.firing[key] = fields
+            self.emit("firing", key, fields)
+        elif not active and key in self.firing:
+            self.emit("resolved", key, self.firing.pop(key))
+
+    def evaluate(self, now: float):
+        """Check every burn-rate rule and the /health failure streak"""
+        for probe, window in self.windows.items():
+            name = " ".join(probe)
+            for severity, long, short, threshold in self.rules:
+                for slo, target in self.targets.items():
+                    burns = []
+                    for seconds in (long, short):
+                        total, unavailable, slow = window.window(now, seconds)
+                        bad = unavailable if slo == "availability" else slow
+                        burns.append(bad / total / (1 - target) if total else 0.0)
+                    window_names = f"{format_duration(long)}/{format_duration(short)}"
+                    key = f"{name} {slo} burn {window_names}"
+                    self.set_alert(key, min(burns) >= threshold and bad >= MIN_BAD_PROBES, {
+                        "severity": severity, "probe": name, "slo": slo, "target": target,
+                        "burn_rate_long": burns[0], "burn_rate_short": burns[1], "threshold": threshold,
+                        "summary": f"{slo} budget burning {burns[0]:.1f}x over {format_duration(long)} "
+                                   f"and {burns[1]:.1f}x over {format_duration(short)} (alert at {threshold:g}x)"})
+            if probe[1] == "/health":
+                streak = self.streaks[probe]
+                self.set_alert(f"{name} failing", streak >= self.fail_streak, {
+                    "severity": "page", "probe": name, "consecutive_failures": streak,
+                    "summary": f"{streak} consecutive failed probes; the platform health check is next"})
+
+    def tick(self, pool: ThreadPoolExecutor) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Probe every endpoint once (concurrently), record the results and evaluate alerts"""
+        results = dict(zip(self.probes, pool.map(self.probe, self.probes)))
+        now = time.time()
+        for probe, result in results.items():
+            slow = result["available"] and result["latency"] > self.latency_threshold
+            self.windows[probe].record(now, result["available"], slow, result["latency"])
+            self.streaks[probe] = 0 if result["available"] else self.streaks[probe] + 1
+        self.evaluate(now)
+        self.ticks += 1
+        return results
+
+    def status(self, seconds: float) -> Dict[str, Dict[str, Any]]:
+        """Availability, latency compliance and latency percentiles per probe over the last ``seconds``"""
+        now = time.time()
+        report = {}
+        for probe, window in self.windows.items():
+            total, unavailable, slow = window.window(now, seconds)
+            report[" ".join(probe)] = {
+                "probes": total,
+                "availability": 1 - unavailable / total if total else 1.0,
+                "within_latency": 1 - slow / total if total else 1.0,
+                "latency": window.latency(now, seconds).summary_ms(),
+            }
+        return report
+
+    def run(self, duration: Optional[float] = None, report_every: int = 4):
+        """Probe on a fixed cadence until ``duration`` passes (or Ctrl-C), printing a status
+        line every ``report_every`` ticks"""
+        started = time.monotonic()
+        next_tick = started
+        with ThreadPoolExecutor(max_workers=len(self.probes), thread_name_prefix="tribe-probe") as pool:
+            try:
+                while duration is None or time.monotonic() - started < duration:
+                    results = self.tick(pool)
+                    failed = [f"{' '.join(probe)} ({result['detail']})" for probe, result in results.items()
+                              if not result["available"]]
+                    if failed:
+                        print(f"❌ {', '.join(failed)}")
+                    if self.ticks % report_every == 0:
+                        print_status(self.status(self.rules[0][2]), self.rules[0][2], len(self.firing))
+                    # Fixed cadence: skip missed ticks rather than bunching them up
+                    next_tick += self.interval
+                    now = time.monotonic()
+                    if next_tick < now:
+                        next_tick = now + self.interval - (now - next_tick) % self.interval
+                    time.sleep(next_tick - now)
+            except KeyboardInterrupt:
+                print("\n⏹️  Monitor stopped")
+
+def print_status(status: Dict[str, Dict[str, Any]], seconds: float, firing: int):
+    stamp = datetime.now().strftime("%H:%M:%S")
+    print(f"[{stamp}] last {format_duration(seconds)}, {firing} alerts firing")
+    for name, stats in status.items():
+        latency = stats["latency"]
+        print(f"   {name:<40} {stats['probes']:>4} probes  {stats['availability']:>8.3%} up  "
+              f"{stats['within_latency']:>8.3%} fast  p50 {latency['p50_ms']:>7.1f}ms  p99 {latency['p99_ms']:>7.1f}ms")
+
+def parse_rule(text: str) -> Tuple[str, float, float, float]:
+    """(severity, long s, short s, burn rate) from ``SEVERITY:LONG:SHORT:RATE``, e.g. ``page:1h:5m:14.4``"""
+    severity, long, short, rate = text.split(":")
+    return severity, parse_duration(long), parse_duration(short), float(rate)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Synthetic /health monitor with SLO burn-rate alerts")
+    parser.add_argument("--probe", action="append",
+                        help=f"Endpoint to probe as \"METHOD /path\" (repeatable); defaults to {DEFAULT_PROBES}")
+    parser.add_argument("--interval", type=parse_duration, default=DEFAULT_INTERVAL, help="Seconds between probes")
+    parser.add_argument("--duration", type=parse_duration, help="Stop after this long, e.g. 8h (default: run forever)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-probe timeout in seconds")
+    parser.add_argument("--availability-target", type=float, default=DEFAULT_AVAILABILITY_TARGET,
+                        help="Availability SLO, e.g. 0.999")
+    parser.add_argument("--latency-target", type=float, default=DEFAULT_LATENCY_TARGET,
+                        help="Share of probes that must answer within --latency-threshold")
+    parser.add_argument("--latency-threshold", type=float, default=DEFAULT_LATENCY_THRESHOLD_MS,
+                        help="Latency SLO threshold in milliseconds")
+    parser.add_argument("--rule", action="append", type=parse_rule,
+                        help="Burn-rate rule SEVERITY:LONG:SHORT:RATE (repeatable); defaults to "
+                             "page:1h:5m:14.4, page:6h:30m:6 and ticket:24h:2h:3")
+    parser.add_argument("--bucket", type=parse_duration, default=DEFAULT_BUCKET, help="Window bucket length")
+    parser.add_argument("--fail-streak", type=int, default=DEFAULT_FAIL_STREAK,
+                        help="Consecutive failed /health probes that page")
+    parser.add_argument("--alerts", default="monitor-alerts.jsonl", help="JSONL file alerts are appended to")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Monitor from the command line; exits 1 if any alert fired"""
+    args = parse_args()
+    tester = TribeAITester(verbose=False, base_url=args.base_url or BASE_URL, timeout=args.timeout)
+    probes = args.probe or DEFAULT_PROBES
+    print(f"🩺 Monitoring {len(probes)} endpoints every {args.interval:g}s: availability "
+          f"{args.availability_target:.2%}, {args.latency_target:.0%} within {args.latency_threshold:g}ms "
+          f"-> alerts in {args.alerts}")
+    with open(args.alerts, "a") as sink:
+        monitor = SyntheticMonitor(tester, probes, sink, args.interval, args.availability_target,
+                                   args.latency_target, args.latency_threshold, args.bucket, args.fail_streak,
+                                   args.rule)
+        try:
+            monitor.run(args.duration)
+        finally:
+            tester.session.close()
+    print(f"\n📊 {monitor.ticks} probe rounds, {monitor.alerts} alerts, {len(monitor.firing)} still firing")
+    exit(1 if monitor.alerts else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Large upload benchmark for the Tribe AI Platform
+Streams multipart files of growing size to an upload endpoint and separates upload throughput from server processing time
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import time
+import tracemalloc
+from typing import Dict, Any, Optional, List
+
+import requests
+
+from backend_test import BASE_URL, TribeAITester
+from latency_histogram import LatencyRecorder, format_summary_header, format_summary_row
+from multipart_stream import CHUNK_SIZE, MIB, FilePart, generated_source
+from request_phases import PhaseTimingAdapter
+
+# Sizes use binary units: 1MB is 1 MiB
+DEFAULT_SIZES = "1MB,16MB,256MB,1GB,4GB"
+DEFAULT_ENDPOINT = "/studio/generate-video"
+DEFAULT_FIELDS = {"prompt": "Animate this reference clip as a slow pan across a sunny beach",
+                  "service": "modelscope", "style": "realistic"}
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1 << 10, "KIB": 1 << 10, "MB": 1 << 20, "MIB": 1 << 20,
+              "GB": 1 << 30, "GIB": 1 << 30}
+
+def parse_size(text: str) -> int:
+    """Bytes from a size like 512KB, 1.5GB or 4096"""
+    match = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([A-Za-z]*)\s*", text)
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise ValueError(f"Unrecognized size: {text!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+def format_size(size: int) -> str:
+    for unit, factor in (("GiB", 1 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if size >= factor:
+            return f"{size / factor:.3g}{unit}"
+    return f"{size}B"
+
+class UploadBenchmark:
+    """Uploads one file part per request through ``make_request``'s streaming encoder.
+
+    Upload time runs from the first body chunk handed to the socket to the last, so
+    its throughput is what the link and the server's reads sustain. Server time runs
+    from the end of the body to the response headers: the processing the server does
+    once the upload is in. Peak memory is the harness's own, traced per upload.
+    """
+
+    def __init__(self, tester: TribeAITester, endpoint: str = DEFAULT_ENDPOINT,
+                 fields: Optional[Dict[str, str]] = None, file_field: str = "file",
+                 content_type: str = "video/mp4", chunk_size: int = CHUNK_SIZE, path: Optional[str] = None):
+        self.tester = tester
+        self.endpoint = endpoint
+        self.fields = DEFAULT_FIELDS if fields is None else fields
+        self.file_field = file_field
+        self.content_type = content_type
+        self.chunk_size = chunk_size
+        self.path = path
+        self.latency = LatencyRecorder()
+
+    def upload(self, size: int, seed: int = 0) -> Dict[str, Any]:
+        """One upload of ``size`` bytes, from the start of ``path`` or generated data"""
+        if self.path:
+            part = FilePart(self.path, content_type=self.content_type, size=size)
+        else:
+            part = FilePart(generated_source(size, self.chunk_size, seed), "upload.mp4", self.content_type, size)
+        tracemalloc.start()
+        try:
+            response = self.tester.make_request("POST", self.endpoint, self.fields, files={self.file_field: part},
+                                                stream=True)
+            headers_at = time.perf_counter()
+            encoder = response.request.body
+            body = response.content
+        except requests.RequestException as e:
+            return {"size": size, "status_code": type(e).__name__, "success": False, "error": str(e),
+                    "peak_memory_bytes": tracemalloc.get_traced_memory()[1], "verified": None}
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        result = {"size": size, "status_code": response.status_code, "success": response.ok,
+                  "peak_memory_bytes": peak, "verified": None}
+        if encoder.finished is not None:
+            result.update(upload_s=encoder.upload_seconds, server_s=headers_at - encoder.finished,
+                          throughput_mib_s=encoder.throughput_mib_s())
+        try:
+            uploads = json.loads(body).get("uploads") if response.ok else None
+        except ValueError:
+            uploads = None
+        if isinstance(uploads, dict) and self.file_field in uploads:
+            # Servers that echo what they received (the stand-in does) let us check the byte count
+            result["verified"] = uploads[self.file_field].get("bytes") == size
+        return result
+
+    def sweep(self, sizes: List[int], repeats: int = 3) -> Dict[str, Any]:
+        """Every size ``repeats`` times, smallest first"""
+        rows = []
+        for size in sorted(sizes):
+            label = format_size(size)
+            results = [self.upload(size, seed) for seed in range(repeats)]
+            timed = [r for r in results if r["success"] and "upload_s" in r]
+            for r in timed:
+                self.latency.record(f"{label} upload", r["upload_s"])
+                self.latency.record(f"{label} server", r["server_s"])
+            summary = self.latency.summary()
+            checked = [r["verified"] for r in results if r["verified"] is not None]
+            row = {"size": size, "label": label, "uploads": len(results), "failed": len(results) - len(timed),
+                   "verified": sum(checked) if checked else None, "mismatched": checked.count(False),
+                   "throughput_mib_s": statistics.median(r["throughput_mib_s"] for r in timed) if timed else None,
+                   "peak_memory_bytes": max(r["peak_memory_bytes"] for r in results),
+                   "statuses": sorted({str(r["status_code"]) for r in results})}
+            if timed:
+                row["upload"] = summary[f"{label} upload"]
+                row["server"] = summary[f"{label} server"]
+            rows.append(row)
+            print(f"   {label}: {row['uploads'] - row['failed']}/{row['uploads']} ok"
+                  + (f", {row['throughput_mib_s']:.0f} MiB/s" if timed else ""))
+        measured = [row for row in rows if "server" in row]
+        growth = None
+        if len(measured) >= 2 and measured[-1]["size"] > measured[0]["size"]:
+            # Extra server time per GiB between the smallest and largest upload
+            growth = ((measured[-1]["server"]["p50_ms"] - measured[0]["server"]["p50_ms"])
+                      / ((measured[-1]["size"] - measured[0]["size"]) / (1 << 30)))
+        return {"endpoint": self.endpoint, "file_field": self.file_field, "chunk_size": self.chunk_size,
+                "source": self.path or "generated", "repeats": repeats, "sizes": rows,
+                "server_ms_per_gib": growth}
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print(f"📤 UPLOADS to {report['endpoint']} ({report['source']}, {report['repeats']} per size, "
+          f"{report['chunk_size'] // 1024} KiB chunks)")
+    print("=" * 80)
+    print(f"{'size':>8} {'ok':>6} {'MiB/s':>8} {'upload p50 s':>13} {'server p50 ms':>14} "
+          f"{'server p90 ms':>14} {'peak mem':>10}")
+    for row in report["sizes"]:
+        ok = f"{row['uploads'] - row['failed']}/{row['uploads']}"
+        if "server" not in row:
+            print(f"{row['label']:>8} {ok:>6}   ❌ statuses {row['statuses']}")
+            continue
+        print(f"{row['label']:>8} {ok:>6} {row['throughput_mib_s']:>8.0f} {row['upload']['p50_ms'] / 1000:>13.2f} "
+              f"{row['server']['p50_ms']:>14.1f} {row['server']['p90_ms']:>14.1f} "
+              f"{format_size(row['peak_memory_bytes']):>10}")
+    mismatched = sum(row["mismatched"] for row in report["sizes"])
+    verified = sum(row["verified"] or 0 for row in report["sizes"])
+    if mismatched:
+        print(f"\n⚠️  {mismatched} uploads arrived with a different byte count than was sent")
+    elif verified:
+        print(f"\n✅ {verified} uploads confirmed byte for byte by the server")
+    if report["server_ms_per_gib"] is not None:
+        print(f"📈 Server time grows ~{report['server_ms_per_gib']:.0f}ms per GiB uploaded")
+    for row in report["sizes"]:
+        if "server" in row:
+            print(f"\n{row['label']}")
+            print(format_summary_header(24))
+            print(format_summary_row("upload", row["upload"], 24))
+            print(format_summary_row("server", row["server"], 24))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Streamed multipart upload size sweep")
+    parser.add_argument("--sizes", help=f"Comma-separated upload sizes, e.g. 1MB,1.5GB (default {DEFAULT_SIZES}, "
+                                        "or the whole --file)")
+    parser.add_argument("--repeats", type=int, default=3, help="Uploads per size")
+    parser.add_argument("--file", help="Upload the start of this file instead of generated data")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help="Endpoint that accepts multipart form data")
+    parser.add_argument("--file-field", default="file", help="Form field name of the uploaded file")
+    parser.add_argument("--content-type", default="video/mp4", help="Content-Type of the uploaded file")
+    parser.add_argument("--form", action="append", metavar="KEY=VALUE",
+                        help="Form field sent with the file (repeatable); defaults to a video prompt")
+    parser.add_argument("--chunk-size", type=parse_size, default=CHUNK_SIZE, help="Bytes read and sent per chunk")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Run the sweep and report"""
+    args = parse_args()
+    if args.sizes:
+        sizes = [parse_size(size) for size in args.sizes.split(",")]
+    else:
+        sizes = [os.path.getsize(args.file)] if args.file else [parse_size(s) for s in DEFAULT_SIZES.split(",")]
+    if args.file:
+        available = os.path.getsize(args.file)
+        skipped = [size for size in sizes if size > available]
+        if skipped:
+            print(f"⚠️  Skipping sizes larger than {args.file} ({format_size(available)}): "
+                  f"{', '.join(format_size(size) for size in skipped)}")
+        sizes = [size for size in sizes if size <= available]
+    fields = dict(DEFAULT_FIELDS)
+    for item in args.form or []:
+        key, _, value = item.partition("=")
+        fields[key] = value
+
+    tester = TribeAITester(verbose=False, base_url=args.base_url or BASE_URL)
+    adapter = PhaseTimingAdapter(pool_connections=1, pool_maxsize=1)
+    tester.session.mount("https://", adapter)
+    tester.session.mount("http://", adapter)
+    benchmark = UploadBenchmark(tester, args.endpoint, fields, args.file_field, args.content_type,
+                                args.chunk_size, args.file)
+    print(f"🚀 Uploading {', '.join(format_size(size) for size in sorted(sizes))} "
+          f"({sum(sizes) * args.repeats / MIB:.0f} MiB in total) to {args.endpoint}")
+    try:
+        report = benchmark.sweep(sizes, args.repeats)
+    finally:
+        tester.session.close()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
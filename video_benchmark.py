@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Video job benchmark for the Tribe AI Platform
+Submits concurrent /studio/generate-video jobs and follows them to completion by polling or events
+"""
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+import requests
+
+from auth_session import get_auth_session
+from backend_test import BASE_URL, TEST_USER_EMAIL, TEST_USER_NAME, TEST_USER_PASSWORD, TribeAITester
+from latency_histogram import LatencyRecorder, format_summary_header, format_summary_row
+from rate_governor import parse_retry_after
+from request_phases import PhaseTimingAdapter
+from sse_events import iter_sse_events
+
+SERVICES = ["modelscope"]
+STYLES = ["realistic"]
+PROMPTS = [
+    "A cat playing with a ball of yarn in a sunny room",
+    "Drone shot over a foggy pine forest at sunrise",
+    "Time-lapse of a city street from day to night",
+]
+# Job status endpoints; {job_id} comes from the submit response
+STATUS_PATH = "/studio/jobs/{job_id}"
+EVENTS_PATH = "/studio/jobs/{job_id}/events"
+DEFAULT_POLL_INITIAL = 0.25
+DEFAULT_POLL_MAX = 5.0
+DEFAULT_POLL_FACTOR = 1.5
+DEFAULT_JOB_TIMEOUT = 600.0
+METRICS = ("submit", "queue", "processing", "end-to-end", "detection")
+TERMINAL_STATES = {"completed", "failed", "error", "cancelled"}
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds from an ISO-8601 job timestamp"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+class VideoJobBenchmark:
+    """Submits video jobs concurrently and follows each one until it finishes.
+
+    Submit latency and end-to-end time are measured on the client's monotonic clock.
+    Queue wait and processing time come from the job's own ``submitted_at``/
+    ``started_at``/``completed_at`` timestamps, so they exclude polling delay.
+    ``detection`` is how long after completion the client found out, which is what
+    polling costs. Wall clocks are never compared across machines: completion is
+    placed on the client's clock by adding the server-side submitted-to-completed
+    span to the moment the submit was sent. That makes detection an upper bound,
+    off by at most the submit latency, whatever the clock skew.
+    """
+
+    def __init__(self, tester: TribeAITester, mode: str = "poll", poll_initial: float = DEFAULT_POLL_INITIAL,
+                 poll_max: float = DEFAULT_POLL_MAX, poll_factor: float = DEFAULT_POLL_FACTOR,
+                 timeout: float = DEFAULT_JOB_TIMEOUT):
+        if mode not in ("poll", "events"):
+            raise ValueError(f"Unsupported mode: {mode}")
+        self.tester = tester
+        self.mode = mode
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.timeout = timeout
+        self.latency = LatencyRecorder()
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, group: str, field: str, amount: int = 1):
+        with self._lock:
+            counts = self.counts.setdefault(group, {"jobs": 0, "completed": 0, "failed": 0, "synchronous": 0,
+                                                    "polls": 0})
+            counts[field] += amount
+
+    def poll(self, job_id: str, deadline: float) -> Dict[str, Any]:
+        """Poll the status endpoint with growing intervals, reset on every state change
+        and overridden by Retry-After; returns the last status and the number of polls"""
+        interval, state, polls = self.poll_initial, None, 0
+        while True:
+            response = self.tester.make_request("GET", STATUS_PATH.format(job_id=job_id))
+            polls += 1
+            seen = time.monotonic()
+            if response.status_code == 200:
+                status = response.json()
+            elif response.status_code == 404:
+                status = {"status": "error", "detail": "job not found"}
+            else:
+                # Throttled or failing status checks: keep the last state and back off
+                status = {"status": state}
+            if status.get("status") in TERMINAL_STATES or time.monotonic() >= deadline:
+                return {**status, "seen_at": seen, "polls": polls}
+            if status.get("status") != state:
+                state, interval = status.get("status"), self.poll_initial
+            wait = parse_retry_after(response.headers.get("Retry-After"))
+            time.sleep(min(wait if wait is not None else interval, max(0.0, deadline - time.monotonic())))
+            interval = min(self.poll_max, interval * self.poll_factor)
+
+    def subscribe(self, job_id: str, deadline: float) -> Dict[str, Any]:
+        """Follow the job's server-sent events until a terminal state arrives"""
+        response = self.tester.make_request("GET", EVENTS_PATH.format(job_id=job_id),
+                                            headers={"Accept": "text/event-stream"}, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return {"status": "error", "detail": f"HTTP {response.status_code}", "seen_at": time.monotonic(), "polls": 1}
+        status: Dict[str, Any] = {"status": "error", "detail": "event stream ended early"}
+        try:
+            for _, payload in iter_sse_events(response.iter_content(chunk_size=None)):
+                status = json.loads(payload)
+                if status.get("status") in TERMINAL_STATES:
+                    return {**status, "seen_at": time.monotonic(), "polls": 1}
+                if time.monotonic() >= deadline:
+                    break
+        finally:
+            response.close()
+        return {**status, "seen_at": time.monotonic(), "polls": 1}
+
+    def run_job(self, service: str, style: str, prompt: str) -> Dict[str, Any]:
+        """Submit one job and follow it to the end; a request that raises fails the job"""
+        group = f"{service}/{style}"
+        self._count(group, "jobs")
+        try:
+            return self._run_job(group, service, style, prompt)
+        except (requests.RequestException, ValueError) as e:
+            self._count(group, "failed")
+            return {"group": group, "success": False, "error": f"{type(e).__name__}: {e}"}
+
+    def _run_job(self, group: str, service: str, style: str, prompt: str) -> Dict[str, Any]:
+        submitted = time.monotonic()
+        response = self.tester.make_request("POST", "/studio/generate-video",
+                                            {"prompt": prompt, "style": style, "service": service}, form=True)
+        self.latency.record(f"{group} submit", time.monotonic() - submitted)
+        if response.status_code != 200:
+            self._count(group, "failed")
+            return {"group": group, "success": False, "status_code": response.status_code}
+        accepted = response.json()
+        job_id = accepted.get("job_id") or accepted.get("id")
+        if not job_id:
+            # Nothing to follow: the backend answers synchronously (or only describes the job)
+            self._count(group, "synchronous")
+            return {"group": group, "success": True, "synchronous": True, "status": accepted.get("status")}
+
+        deadline = submitted + self.timeout
+        final = self.poll(job_id, deadline) if self.mode == "poll" else self.subscribe(job_id, deadline)
+        self._count(group, "polls", final["polls"])
+        if final.get("status") != "completed":
+            self._count(group, "failed")
+            return {"group": group, "success": False, "job_id": job_id, "status": final.get("status")}
+        self._count(group, "completed")
+        self.latency.record(f"{group} end-to-end", final["seen_at"] - submitted)
+        queued_at, started_at, completed_at = (parse_time(final.get(field))
+                                               for field in ("submitted_at", "started_at", "completed_at"))
+        if queued_at is not None and started_at is not None:
+            self.latency.record(f"{group} queue", max(0.0, started_at - queued_at))
+        if started_at is not None and completed_at is not None:
+            self.latency.record(f"{group} processing", max(0.0, completed_at - started_at))
+        if queued_at is not None and completed_at is not None:
+            completed = submitted + (completed_at - queued_at)
+            self.latency.record(f"{group} detection", max(0.0, final["seen_at"] - completed))
+        return {"group": group, "success": True, "job_id": job_id, "polls": final["polls"]}
+
+    def run(self, jobs: int, concurrency: int, services: List[str], styles: List[str],
+            seed: Optional[int] = None) -> Dict[str, Any]:
+        """Submit ``jobs`` jobs, ``concurrency`` at a time, cycling through every service/style pair"""
+        rng = random.Random(seed)
+        combos = itertools.cycle(itertools.product(services, styles))
+        plan = [(service, style, rng.choice(PROMPTS)) for (service, style), _ in zip(combos, range(jobs))]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tribe-video") as pool:
+            results = list(pool.map(lambda job: self.run_job(*job), plan))
+        elapsed = time.perf_counter() - started
+        return {"mode": self.mode, "jobs": jobs, "concurrency": concurrency, "elapsed_s": elapsed,
+                "completed_per_minute": sum(1 for r in results if r.get("job_id") and r["success"]) / elapsed * 60,
+                "groups": self.report()}
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per service/style counts and timing summaries"""
+        summary = self.latency.summary()
+        with self._lock:
+            counts = {group: dict(values) for group, values in self.counts.items()}
+        return {group: {**counts[group],
+                        **{metric: summary[f"{group} {metric}"] for metric in METRICS if f"{group} {metric}" in summary}}
+                for group in sorted(counts)}
+
+def print_report(report: Dict[str, Any]):
+    print("\n" + "=" * 80)
+    print(f"📊 VIDEO JOBS ({report['jobs']} jobs, {report['concurrency']} concurrent, {report['mode']})")
+    print("=" * 80)
+    print(f"⏱️  {report['elapsed_s']:.1f}s, {report['completed_per_minute']:.1f} completed jobs/minute")
+    for group, stats in report["groups"].items():
+        polls = stats["polls"] / stats["completed"] if stats["completed"] else 0.0
+        print(f"\n🎬 {group}: {stats['completed']}/{stats['jobs']} completed, {stats['failed']} failed, "
+              f"{polls:.1f} status calls per job")
+        if stats["synchronous"]:
+            print(f"   ⚠️  {stats['synchronous']} submits returned no job_id; only submit latency is measured")
+        print(format_summary_header(24))
+        for metric in METRICS:
+            if metric in stats:
+                print(format_summary_row(metric, stats[metric], 24))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="/studio/generate-video job benchmark")
+    parser.add_argument("--jobs", type=int, default=40, help="Jobs to submit")
+    parser.add_argument("--concurrency", type=int, default=20, help="Jobs submitted and followed at once")
+    parser.add_argument("--mode", choices=["poll", "events"], default="poll",
+                        help="Follow jobs by polling their status or by subscribing to their events")
+    parser.add_argument("--service", action="append", help="Video service (repeatable); defaults to modelscope")
+    parser.add_argument("--style", action="append", help="Video style (repeatable); defaults to realistic")
+    parser.add_argument("--poll-initial", type=float, default=DEFAULT_POLL_INITIAL,
+                        help="First polling interval in seconds, and the interval after each state change")
+    parser.add_argument("--poll-max", type=float, default=DEFAULT_POLL_MAX, help="Longest polling interval")
+    parser.add_argument("--poll-factor", type=float, default=DEFAULT_POLL_FACTOR,
+                        help="Polling interval growth per unchanged status")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_JOB_TIMEOUT,
+                        help="Seconds after submission before a job counts as failed")
+    parser.add_argument("--seed", type=int, help="Random seed for prompt choice")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--base-url", help="API root (defaults to backend_test.BASE_URL)")
+    return parser.parse_args(argv)
+
+def main():
+    """Submit the jobs and report"""
+    args = parse_args()
+    base_url = args.base_url or BASE_URL
+    auth = get_auth_session(base_url, TEST_USER_EMAIL, TEST_USER_PASSWORD, name=TEST_USER_NAME)
+    tester = TribeAITester(verbose=False, base_url=base_url, auth=auth)
+    adapter = PhaseTimingAdapter(pool_connections=args.concurrency, pool_maxsize=args.concurrency)
+    tester.session.mount("https://", adapter)
+    tester.session.mount("http://", adapter)
+    benchmark = VideoJobBenchmark(tester, args.mode, args.poll_initial, args.poll_max, args.poll_factor,
+                                  args.timeout)
+    try:
+        report = benchmark.run(args.jobs, args.concurrency, args.service or SERVICES, args.style or STYLES,
+                               args.seed)
+    finally:
+        auth.close()
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()